@@ -1,8 +1,18 @@
+import sys
+
 from controller.control import Control
+import controller.batch as batch
 
 
 def main():
-    Control().start_menu()
+    """Without argument, run the interactive menus. Otherwise, run a
+    single batch command (see controller.batch) and print its result as
+    JSON : python chess_application.py --help lists the commands."""
+    if len(sys.argv) > 1:
+        sys.exit(batch.main(sys.argv[1:]))
+    control = Control()
+    control.show_pending_journals()
+    control.start_menu()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,306 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import argparse
+import json
+import sys
+from datetime import datetime as dt
+
+import model.tournament as trn
+import model.tournamentdb as trdb
+import model.journal as jrn
+from model.interactDB import registry
+from model.catalog import with_db_extension
+
+
+class Batch:
+    """Non-interactive access to the main operations on the tournaments of
+    a database file, for scripts and automated runs : nothing is asked to
+    the user and every method returns JSON serializable data. Errors are
+    raised as Warning, with the same messages as the interactive menus.
+    Loaded tournaments are kept in memory. With autosave, every change is
+    saved at once ; without it, changes are written by save(), so that
+    many operations can be run with a single write.
+    """
+    TIME_CONTROLS = ("bullet", "blitz", "coup rapide")
+
+    def __init__(self, db_file_name, autosave=True):
+        """Class constructor, takes the database file's name. The .json
+        extension is added to a name without database extension."""
+        self.db_file_name = with_db_extension(db_file_name)
+        self.autosave = autosave
+        self.__tournaments = {}
+
+    def get_tournament(self, name):
+        """Return a tournament of the database file, loaded lazily on first
+        use. Its changes are journaled until it is saved : the changes left
+        by a crash are replayed when it is loaded."""
+        if name not in self.__tournaments:
+            tournament = trn.Tournament.load_tournament_from_db(self.db_file_name, name, lazy=True)
+            tournament.attach_journal(jrn.ResultJournal(name, self.db_file_name), replay=True)
+            self.__tournaments[name] = tournament
+        return self.__tournaments[name]
+
+    def __changed(self, tournament):
+        if self.autosave:
+            self.save(tournament.name)
+
+    @staticmethod
+    def check_date(date, date_format="%d/%m/%Y %H:%M"):
+        try:
+            dt.strptime(date, date_format)
+        except (TypeError, ValueError):
+            raise Warning(f"Format ou date invalide : {date}")
+        return date
+
+    def create(self, name, localization, time_control, beg_date=None, description="",
+               max_players=trn.Tournament.DEFAULT_MAX_PLAYERS, max_rounds=trn.Tournament.DEFAULT_MAX_ROUNDS,
+               rated=False):
+        """Create a tournament and save it into the database file. beg_date
+        defaults to now. Return the tournament's informations."""
+        if time_control.lower() not in self.TIME_CONTROLS:
+            raise Warning(f"Contrôle du temps invalide : {time_control} (Bullet, Blitz ou Coup rapide).")
+        beg_date = self.check_date(beg_date or dt.strftime(dt.today(), "%d/%m/%Y %H:%M"))
+        if max_players <= 0 or max_rounds <= 0:
+            raise Warning("Doit être un entier strictement positif.")
+        if name in self.__tournaments or trdb.TournamentDB(self.db_file_name).tournament_exists(name):
+            raise Warning("Tournoi déjà sauvegardé dans la base de données.")
+        journal = jrn.ResultJournal(name, self.db_file_name)
+        if journal.is_pending:
+            raise Warning(f"Le tournoi '{name}' a des modifications non sauvegardées ({journal.path}).")
+        tournament = trn.Tournament(name, localization, time_control, description, beg_date,
+                                    max_players=max_players, max_rounds=max_rounds, rated=rated)
+        tournament.attach_journal(journal)
+        self.__tournaments[name] = tournament
+        self.__changed(tournament)
+        return tournament.saved_info
+
+    def add_players(self, name, path=None, players=None):
+        """Add the players of a CSV or JSON file, or of a list of dicts
+        having the same keys, to a tournament, all of them or none. Return
+        the number of players added and registered."""
+        tournament = self.get_tournament(name)
+        if path is not None:
+            added = tournament.add_players_from_file(path)
+        else:
+            added = tournament.add_player_rows([(f"Élément {nb}", row if isinstance(row, dict) else {})
+                                                for nb, row in enumerate(players or [], 1)])
+        self.__changed(tournament)
+        return {"added": added, "players": len(tournament.get_player_list)}
+
+    def pair(self, name):
+        """Make the next round of a tournament. Return its pairings."""
+        tournament = self.get_tournament(name)
+        rounds = tournament.get_round_list
+        if len(tournament.get_player_list) < 2:
+            raise Warning("Action impossible : veuillez ajouter suffisamment de joueurs au tournoi")
+        if len(rounds) >= tournament.MAX_ROUND_LIST:
+            raise Warning("Action impossible : nombre de ronde maximum atteint.")
+        if rounds and not rounds[-1].end_date:
+            raise Warning("Action impossible : veuillez terminer la ronde en cours.")
+        tournament.add_round_to_list(f"Round {len(rounds) + 1}")
+        self.__changed(tournament)
+        return self.describe_round(tournament, len(rounds) - 1)
+
+    @staticmethod
+    def describe_round(tournament, round_nb):
+        roundp = tournament.get_round_list[round_nb]
+        return {"round": round_nb + 1,
+                "name": roundp.name,
+                "end_date": roundp.end_date,
+                "games": [{"board": nb + 1,
+                           "player1": game[0][0].id_player,
+                           "player2": game[0][1].id_player,
+                           "score": game[1]}
+                          for nb, game in enumerate(roundp.get_match_list)],
+                "bye": None if roundp.bye is None else roundp.bye.id_player}
+
+    def record(self, name, results=None, path=None, end_date=None, end=True):
+        """Enter the results of the ongoing round of a tournament, given as
+        a {board: result} dict or a CSV or JSON results file, then end the
+        round. Results are J1, J2 or nul (or 1-0, 0-1, 1/2-1/2). Every game
+        must have a result : nothing is entered otherwise. end_date defaults
+        to now. If end is False, only the given results are entered and the
+        round goes on. Return the number of results entered.
+        """
+        tournament = self.get_tournament(name)
+        rounds = tournament.get_round_list
+        if not rounds:
+            raise Warning("Action impossible : aucune ronde n'existe.")
+        end_date = end_date or dt.strftime(dt.today(), "%d/%m/%Y %H:%M")
+        if not end:
+            rows = [(f"Échiquier {board}", board, result) for board, result in (results or {}).items()]
+            entered = tournament.enter_game_results(rounds[-1], rows)
+        elif path is not None:
+            entered = tournament.import_round_results(rounds[-1], path, end_date)
+        else:
+            rows = [(f"Échiquier {board}", board, result) for board, result in (results or {}).items()]
+            entered = tournament.enter_round_results(rounds[-1], rows, end_date)
+        self.__changed(tournament)
+        return {"round": len(rounds), "entered": entered}
+
+    def end(self, name, end_date=None):
+        """Set the end date (JJ/MM/AAAA) of a tournament whose rounds have
+        all been played, today by default. In a rated tournament, the final
+        ratings are written into the database files holding the players.
+        Return the end date and the ids of the players whose rating couldn't
+        be saved."""
+        tournament = self.get_tournament(name)
+        rounds = tournament.get_round_list
+        if tournament.end_date is not None:
+            raise Warning("Action impossible : le tournoi est déjà terminé.")
+        if len(rounds) < tournament.MAX_ROUND_LIST or not rounds[-1].end_date:
+            raise Warning("Action impossible : toutes les rondes n'ont pas encore été jouées.")
+        end_date = self.check_date(end_date or dt.strftime(dt.today(), "%d/%m/%Y"), "%d/%m/%Y")
+        missing_ids = tournament.end_tournament(end_date)
+        self.__changed(tournament)
+        return {"end_date": end_date, "unsaved_ratings": missing_ids}
+
+    def save(self, name):
+        """Save a loaded tournament into the database file."""
+        tournament = self.get_tournament(name)
+        if not tournament.is_hydrated:
+            return {"saved": False}
+        db = trdb.TournamentDB(self.db_file_name)
+        tournament.save_tournament_in_db(self.db_file_name, db.tournament_exists(name))
+        return {"saved": True}
+
+    def save_all(self):
+        """Save every loaded tournament."""
+        return {name: self.save(name)["saved"] for name in self.__tournaments}
+
+    def list_tournaments(self):
+        """Return the informations of the tournaments of the database file,
+        without loading their players and rounds."""
+        return list(trdb.TournamentDB(self.db_file_name).iter_tournament_headers())
+
+    def standings(self, name):
+        """Return the standings of a tournament, with the tie-breaks."""
+        return [dict({"position": nb + 1,
+                      "id_player": player.id_player,
+                      "name": f"{player.first_name} {player.last_name}",
+                      "score": player.get_player_score,
+                      "rating": player.rating}, **tie_breaks)
+                for nb, (player, tie_breaks) in enumerate(self.get_tournament(name).standings_with_tie_breaks())]
+
+    def describe_tournament(self, name):
+        """Return a tournament's informations, rounds and standings."""
+        tournament = self.get_tournament(name)
+        return {"tournament_info": tournament.saved_info,
+                "rounds": [self.describe_round(tournament, nb) for nb in range(len(tournament.get_round_list))],
+                "standings": self.standings(name)}
+
+    def export(self, name, path=None):
+        """Return a tournament's saved data, its rounds and its standings.
+        With a path, they are written into this JSON file instead."""
+        data = dict(self.describe_tournament(name),
+                    tournament=self.get_tournament(name).serialize_tournament_info()["tournament_data"])
+        if path is None:
+            return data
+        with open(path, "w", encoding="utf-8-sig") as export_file:
+            json.dump(data, export_file, ensure_ascii=False, indent=2)
+        return {"exported": path}
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(
+        prog="chess_application.py",
+        description="Gestion de tournois d'échecs. Sans commande, le menu interactif est lancé.")
+    parser.add_argument("--db", default="tournaments.json",
+                        help="fichier de la base de données, dans le dossier data (tournaments.json par défaut)")
+    commands = parser.add_subparsers(dest="command")
+
+    create = commands.add_parser("create", help="créer un tournoi")
+    create.add_argument("name")
+    create.add_argument("--localization", default="")
+    create.add_argument("--time-control", default="Blitz")
+    create.add_argument("--description", default="")
+    create.add_argument("--beg-date", help="JJ/MM/AAAA HH:MM, maintenant par défaut")
+    create.add_argument("--max-players", type=int, default=trn.Tournament.DEFAULT_MAX_PLAYERS)
+    create.add_argument("--max-rounds", type=int, default=trn.Tournament.DEFAULT_MAX_ROUNDS)
+    create.add_argument("--rated", action="store_true")
+
+    add_players = commands.add_parser("add-players", help="ajouter les joueurs d'un fichier CSV ou JSON")
+    add_players.add_argument("name")
+    add_players.add_argument("path")
+
+    pair = commands.add_parser("pair", help="apparier la ronde suivante")
+    pair.add_argument("name")
+
+    record = commands.add_parser("record", help="saisir les résultats de la ronde en cours et la terminer")
+    record.add_argument("name")
+    record.add_argument("results", nargs="*", metavar="ECHIQUIER=RESULTAT", help="par exemple 1=J1 2=nul 3=J2")
+    record.add_argument("--file", help="fichier de résultats CSV ou JSON")
+    record.add_argument("--end-date", help="JJ/MM/AAAA HH:MM, maintenant par défaut")
+    record.add_argument("--no-end", action="store_true", help="saisir les résultats sans terminer la ronde")
+
+    end = commands.add_parser("end", help="terminer un tournoi dont toutes les rondes ont été jouées")
+    end.add_argument("name")
+    end.add_argument("--end-date", help="JJ/MM/AAAA, aujourd'hui par défaut")
+
+    save = commands.add_parser("save", help="sauvegarder un tournoi")
+    save.add_argument("name")
+
+    commands.add_parser("list", help="lister les tournois de la base de données")
+
+    standings = commands.add_parser("standings", help="afficher le classement d'un tournoi")
+    standings.add_argument("name")
+
+    export = commands.add_parser("export", help="exporter un tournoi au format JSON")
+    export.add_argument("name")
+    export.add_argument("--output", help="fichier de sortie, sortie standard par défaut")
+    return parser
+
+
+def run_command(args):
+    """Run the command parsed from the command line. Return its result."""
+    batch = Batch(args.db)
+    if args.command == "create":
+        return batch.create(args.name, args.localization, args.time_control, args.beg_date, args.description,
+                            args.max_players, args.max_rounds, args.rated)
+    if args.command == "add-players":
+        return batch.add_players(args.name, args.path)
+    if args.command == "pair":
+        return batch.pair(args.name)
+    if args.command == "record":
+        results = {}
+        for result in args.results:
+            board, sep, value = result.partition("=")
+            if not sep:
+                raise Warning(f"Résultat invalide : {result}, attendu ECHIQUIER=RESULTAT.")
+            results[board] = value
+        return batch.record(args.name, results, args.file, args.end_date, not args.no_end)
+    if args.command == "end":
+        return batch.end(args.name, args.end_date)
+    if args.command == "save":
+        return batch.save(args.name)
+    if args.command == "list":
+        return batch.list_tournaments()
+    if args.command == "standings":
+        return batch.standings(args.name)
+    if args.command == "export":
+        return batch.export(args.name, args.output)
+
+
+def main(argv=None):
+    """Run one command and print its result as JSON. On error, print
+    {"error": message} and return 1."""
+    parser = make_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        return 2
+    try:
+        result = run_command(args)
+        status = 0
+    except Exception as err:
+        result = {"error": str(err)}
+        status = 1
+    finally:
+        registry.close_all()
+    print(json.dumps(result, ensure_ascii=False))
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
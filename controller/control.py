@@ -1,14 +1,16 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-import os
-from operator import attrgetter
 from datetime import datetime as dt
 
 import model.tournament as trn
 import view.view as view
 import model.playerdb as lpdb
 import model.tournamentdb as trdb
+import model.interactDB as idb
+import model.journal as jrn
+import model.simulation as sim
+from model.catalog import catalog, with_db_extension
 
 
 class Control:
@@ -39,16 +41,19 @@ class Control:
         }
 
     @staticmethod
-    def get_file_list():
-        """Return a list of files inside data directory. List is then
-        displayed by view.
+    def get_file_list(show=True):
+        """Return a list of database files inside data directory, taken
+        from the catalog. List is then displayed by view.
         """
-        file_list = os.listdir("data")
-        view.show_listed_data(file_list)
+        file_list = catalog.refresh()
+        if show:
+            files_info = catalog.get_files_info
+            view.show_listed_data([f"{file_name} ({files_info[file_name]['tournaments']} tournoi(s), "
+                                   f"{files_info[file_name]['players']} joueur(s))" for file_name in file_list])
         return file_list
 
     def get_player_list_from_db(self, file_name):
-        if file_name in self.get_file_list():
+        if file_name in self.get_file_list(show=False):
             load = lpdb.LoadPlayer(file_name)
             players = load.list_player_from_db()
             for player in players:
@@ -56,9 +61,41 @@ class Control:
         else:
             view.show_warning(self.error_messages["MISSING_FILE"])
 
+    @staticmethod
+    def show_pending_journals():
+        """Warn the user about tournaments having changes which have not
+        been saved, for example after a crash. These changes are restored
+        when the tournament is loaded.
+        """
+        for name, file_name in jrn.journal_list_from_dir():
+            if file_name:
+                view.show_message(f"Modifications non sauvegardées du tournoi '{name}' ({file_name}) : "
+                                  "elles seront restaurées au chargement du tournoi.")
+            else:
+                view.show_message(f"Modifications du tournoi '{name}', jamais sauvegardé : elles ne peuvent "
+                                  "pas être restaurées.")
+
     def start_menu(self):
+        """Run the application's menus until the user quits. Each menu is a
+        state : its method shows the menu, runs the chosen action and returns
+        the name of the next menu, or None to quit. Menus are run one after
+        the other in this loop, never by calling each other : the call stack
+        doesn't grow, however long the session.
+        """
+        menus = {"start": self.home_menu,
+                 "tournament": self.tournament_menu,
+                 "rounds": self.rounds_menu,
+                 "save_player": self.save_player_menu,
+                 "load_player": self.load_player_menu,
+                 "load_tournament": self.load_tournament_menu}
+        menu = "start"
+        while menu is not None:
+            menu = menus[menu]()
+        idb.registry.close_all()
+
+    def home_menu(self):
         """Ask the user to choose between the various start menu
-        options displayed by view.
+        options displayed by view. Return the next menu.
         """
         view.show_start_menu(self.today, self.current_time)
 
@@ -69,13 +106,12 @@ class Control:
                 break
             elif resp == "2":
                 if self.tournament_list:
-                    self.tournament_menu()
+                    return "tournament"
                 else:
                     view.show_warning(self.error_messages["NO_TOURNAMENT"])
                     break
             elif resp == "3":
-                self.load_tournament_menu()
-                break
+                return "load_tournament"
             elif resp == "4":
                 if self.tournament_list:
                     view.show_listed_data(self.tournament_list)
@@ -84,9 +120,9 @@ class Control:
                     view.show_warning(self.error_messages["NO_TOURNAMENT"])
                     break
             elif resp == "5":
-                index = int(view.ask_user_input("N° du tournoi à selectionner : "))
                 if self.tournament_list:
                     try:
+                        index = int(view.ask_user_input("N° du tournoi à selectionner : "))
                         self.current_tournament = self.tournament_list[index - 1]
                         view.show_message(f"Tournoi selectionné : {self.tournament_list[index - 1]}")
                         break
@@ -105,22 +141,22 @@ class Control:
                 view.show_warning(self.error_messages["UNKNOWN_COMMAND"])
 
         if resp == "1":
-            self.tournament_menu()
-        elif resp in ("2", "3", "4", "5"):
-            self.start_menu()
+            return "tournament"
         elif resp == "q":
             confirmation = view.ask_user_input("êtes-vous sûr de vouloir quitter l'application ? (O/N)")
-            if confirmation.lower() == "n":
-                self.start_menu()
-            elif confirmation.lower() == "o":
-                quit()
+            if confirmation.lower() == "o":
+                return None
+        return "start"
 
     def create_tournament(self):
         """Ask the user for the informations needed to make an instance
         of a class Tournament.
         """
         view.show_create_tournament()
-        name = view.ask_user_input("Nom du tournoi : ")
+        while True:
+            name = view.ask_user_input("Nom du tournoi : ")
+            if self.check_pending_journal(name):
+                break
         localization = view.ask_user_input("Lieu du tournoi : ")
 
         while True:
@@ -141,11 +177,55 @@ class Control:
             except ValueError:
                 view.show_warning(self.error_messages["INVALID_DATE"])
 
+        max_players = self.ask_limit("Nombre maximum de joueurs", trn.Tournament.DEFAULT_MAX_PLAYERS)
+        max_rounds = self.ask_limit("Nombre de rondes", trn.Tournament.DEFAULT_MAX_ROUNDS)
+        rated = view.ask_user_input("Tournoi classé Elo ? (O/N) : ").lower() == "o"
+
         chess_tournament = trn.Tournament(name, localization, time_control,
-                                          description, beg_date)
+                                          description, beg_date,
+                                          max_players=max_players,
+                                          max_rounds=max_rounds,
+                                          rated=rated)
+        chess_tournament.attach_journal(jrn.ResultJournal(name))
         self.tournament_list.append(chess_tournament)
         self.current_tournament = chess_tournament
 
+    def check_pending_journal(self, name):
+        """Return True if a new tournament can take this name. The name is
+        refused while a saved tournament of this name has unsaved changes :
+        they are restored by loading it. If the tournament was never saved,
+        its changes can't be restored and the user may discard them.
+        """
+        files = [file_name for journal_name, file_name in jrn.journal_list_from_dir() if journal_name == name]
+        saved_files = [file_name for file_name in files if file_name]
+        if saved_files:
+            view.show_warning(f"Le tournoi '{name}' a des modifications non sauvegardées ({saved_files[0]}) : "
+                              "chargez-le pour les restaurer, ou choisissez un autre nom.")
+            return False
+        if files:
+            confirmation = view.ask_user_input(f"Le tournoi '{name}', jamais sauvegardé, a des modifications "
+                                               "non sauvegardées. Les supprimer ? (O/N) ")
+            if confirmation.lower() != "o":
+                return False
+            jrn.ResultJournal(name).clear()
+        return True
+
+    def ask_limit(self, message, default):
+        """Ask the user for a strictly positive integer. An empty answer
+        gives the default value.
+        """
+        while True:
+            resp = view.ask_user_input(f"{message} ({default} par défaut) : ")
+            if not resp:
+                return default
+            try:
+                limit = int(resp)
+                if limit > 0:
+                    return limit
+                view.show_warning(self.error_messages["INVALID_INT"])
+            except ValueError:
+                view.show_warning(self.error_messages["INVALID_INT"])
+
     def add_player_to_tournament(self):
         """Ask the user for the required arguments needed to make a new Player instance
         and add it to the current tournament.
@@ -181,8 +261,12 @@ class Control:
                 except ValueError:
                     view.show_warning(self.error_messages["INVALID_INT"])
 
-            self.current_tournament.add_new_player(l_name, f_name,
-                                                   date_birth, gender, rank)
+            try:
+                self.current_tournament.add_new_player(l_name, f_name,
+                                                       date_birth, gender, rank)
+            except Warning as err:
+                view.show_warning(str(err))
+                return
             view.show_done_action("Création terminée",
                                   len(self.current_tournament.get_player_list),
                                   self.current_tournament.MAX_PLAYER_LIMIT)
@@ -191,7 +275,7 @@ class Control:
 
     def tournament_menu(self):
         """Ask the user to chooses between the various options availables
-        in the tournament_menu, as displayed by view.
+        in the tournament_menu, as displayed by view. Return the next menu.
         """
         view.show_tournament_menu(self.current_tournament.name,
                                   self.current_tournament.localization,
@@ -205,8 +289,7 @@ class Control:
                 self.add_round()
                 break
             elif resp == "3":
-                self.rounds_menu()
-                break
+                return "rounds"
             elif resp == "4":
                 self.set_tournament_end_date()
                 break
@@ -214,27 +297,22 @@ class Control:
                 self.describe_players_menu()
                 break
             elif resp == "6":
-                self.save_player_menu()
-                break
+                return "save_player"
             elif resp == "7":
-                self.load_player_menu()
-                break
+                return "load_player"
             elif resp == "8":
                 self.save_tournament_in_db()
                 break
             elif resp == "q":
-                break
+                return "start"
             else:
                 view.show_warning(self.error_messages["UNKNOWN_COMMAND"])
 
-        if resp in ("1", "2", "3", "4", "5", "6", "7", "8"):
-            self.tournament_menu()
-        elif resp == "q":
-            self.start_menu()
+        return "tournament"
 
     def rounds_menu(self):
         """Ask the user to choose between the various options available
-        in the rounds menu, as displayed by view.
+        in the rounds menu, as displayed by view. Return the next menu.
         """
         view.show_rounds_menu()
 
@@ -243,7 +321,8 @@ class Control:
             print()
             if choice == "1":
                 try:
-                    index = int(view.ask_user_input("Numéro de la ronde à afficher (1, 2, 3 ou 4) : "))
+                    index = int(view.ask_user_input(
+                        f"Numéro de la ronde à afficher (1 à {len(self.current_tournament.get_round_list)}) : "))
                 except ValueError:
                     view.show_warning(self.error_messages["INVALIDE_FORMAT"])
                     break
@@ -259,23 +338,29 @@ class Control:
             elif choice == "3":
                 self.play_round()
                 break
-            elif choice == "q":
+            elif choice == "4":
+                self.simulate_tournament()
+                break
+            elif choice == "5":
+                self.import_round_results()
                 break
+            elif choice == "q":
+                return "tournament"
             else:
                 view.show_warning(self.error_messages["UNKNOWN_COMMAND"])
-        if choice in ("1", "2", "3", "4"):
-            self.rounds_menu()
+        return "rounds"
 
     def add_round(self):
         """Add a round to the current tournament by calling the add_round_to_list
         method of the current tournament instance. Display a warning if :
-        - Not enough players added to the tournament ;
+        - Less than two players added to the tournament, with an odd number of
+        players one of them gets a bye each round ;
         - Last round hasn't been played yet ;
         - MAX_ROUND_LIST has been reached.
         """
         last_round_nb = len(self.current_tournament.get_round_list)
 
-        if len(self.current_tournament.get_player_list) != self.current_tournament.MAX_PLAYER_LIMIT:
+        if len(self.current_tournament.get_player_list) < 2:
             view.show_warning(self.error_messages["ADD_PLAYER"])
 
         elif len(self.current_tournament.get_round_list) < self.current_tournament.MAX_ROUND_LIST:
@@ -309,12 +394,12 @@ class Control:
         if index is None:
             for rd in self.current_tournament.get_round_list:
                 start_date = dt.strftime(rd.start_date, "%d/%m/%Y - %H:%M")
-                view.show_rounds_report(rd.name, rd.match_list, start_date, rd.end_date)
+                view.show_rounds_report(rd.name, rd.match_list, start_date, rd.end_date, rd.bye)
         else:
             try:
                 rd = self.current_tournament.get_round_list[index]
                 start_date = dt.strftime(rd.start_date, "%d/%m/%Y - %H:%M")
-                view.show_rounds_report(rd.name, rd.match_list, start_date, rd.end_date)
+                view.show_rounds_report(rd.name, rd.match_list, start_date, rd.end_date, rd.bye)
             except IndexError:
                 view.show_warning(self.error_messages["MISSING_INDEX"])
             except TypeError:
@@ -337,7 +422,7 @@ class Control:
                         result = view.ask_user_input(
                             f"Résultat match {nb+1} (J1, J2 ou nul) : ")
                         if result.upper() in ("J1", "J2", "NUL"):
-                            self.current_tournament.play_round(rd, game, result)
+                            self.current_tournament.play_round(rd, game, result, nb)
                             break
                         else:
                             view.show_warning(self.error_messages["UNKNOWN_COMMAND"])
@@ -346,10 +431,11 @@ class Control:
                         "Date de fin de la ronde (JJ/MM/AAAA HH:MM) : ")
                     try:
                         dt.strptime(date, "%d/%m/%Y %H:%M")
-                        rd.end_date = date
+                        self.current_tournament.end_round(rd, date)
                         break
                     except ValueError:
                         view.show_warning(self.error_messages["INVALIDE_FORMAT"])
+                self.save_ended_round(rd)
 
             else:
                 view.show_warning(self.error_messages["DONE_ROUND"])
@@ -358,11 +444,62 @@ class Control:
         except Warning:
             view.show_warning(self.error_messages["ONGOING_ROUND"])
 
+    def import_round_results(self):
+        """Enter every result of the round being played from a CSV or JSON
+        file (board number and result on each row), then end the round.
+        Nothing is entered if the file has errors, which are all displayed.
+        """
+        if not self.current_tournament.get_round_list:
+            view.show_warning(self.error_messages["MISSING_ROUND"])
+            return
+        rd = self.current_tournament.get_round_list[-1]
+        if rd.end_date:
+            view.show_warning(self.error_messages["DONE_ROUND"])
+            return
+
+        path = view.ask_user_input("Chemin du fichier de résultats : ")
+        end_date = view.ask_user_input("Date de fin de la ronde (JJ/MM/AAAA HH:MM) : ")
+        try:
+            nb_results = self.current_tournament.import_round_results(rd, path, end_date)
+            view.show_message(f"{nb_results} résultat(s) importé(s), {rd.name} terminée.")
+        except Warning as err:
+            view.show_warning("Import annulé, aucun résultat n'a été saisi :")
+            for error in str(err).splitlines():
+                view.show_message(error)
+            return
+        self.save_ended_round(rd)
+
+    def save_ended_round(self, rd):
+        """Save the current tournament once a round has ended, whether its
+        results were typed in or imported, into the database file it was
+        loaded from or last saved into. The journal is then cleared. A
+        tournament never saved keeps its changes in the journal until the
+        user saves it.
+        """
+        journal = self.current_tournament.journal
+        if journal is None or not journal.db_file_name:
+            return
+        self.current_tournament.save_tournament_in_db(journal.db_file_name, update=True)
+        view.show_message(f"{rd.name} sauvegardée dans le fichier {journal.db_file_name}.")
+
+    def simulate_tournament(self):
+        """Play out the remaining rounds of the current tournament many
+        times, from its current state, and send the players' chances of
+        winning to view.
+        """
+        if len(self.current_tournament.get_player_list) < 2:
+            view.show_warning(self.error_messages["ADD_PLAYER"])
+            return
+        nb_simulations = self.ask_limit("Nombre de simulations", 1000)
+        report = sim.simulate(self.current_tournament, nb_simulations)
+        view.show_simulation_report(report, nb_simulations)
+
     def describe_players_menu(self):
         """Send the information needed by view to display the list of players
         can be displayed by :
         - Alphabetical order ;
         - Rank order ;
+        - Score order (tournament standings) ;
         - A unique player if index argument is given.
         """
         view.show_players_report()
@@ -377,7 +514,8 @@ class Control:
                 break
             elif resp == "3":
                 index = int(
-                    view.ask_user_input("Joueur à afficher (choisir entre 1 et 8) : "))
+                    view.ask_user_input("Joueur à afficher (choisir entre 1 et "
+                                        f"{len(self.current_tournament.get_player_list)}) : "))
                 self.describe_players(index=index)
                 break
             elif resp == "4":
@@ -386,7 +524,8 @@ class Control:
                     new_rank = int(view.ask_user_input("Nouveau rang : "))
                     if new_rank > 0:
                         try:
-                            self.current_tournament.get_player_list[index-1].set_player_rank = new_rank
+                            self.current_tournament.set_player_rank(
+                                self.current_tournament.get_player_list[index-1], new_rank)
                             break
                         except IndexError:
                             view.show_warning(self.error_messages["MISSING_INDEX"])
@@ -395,19 +534,22 @@ class Control:
                     else:
                         view.show_warning(self.error_messages["INVALID_INT"])
                 break
+            elif resp == "5":
+                self.describe_players(by_score=True)
+                break
             else:
                 view.show_warning(self.error_messages["UNKNOWN_COMMAND"])
 
-    def describe_players(self, index=None, by_name=False, by_rank=False):
+    def describe_players(self, index=None, by_name=False, by_rank=False, by_score=False):
         players = self.current_tournament.get_player_list
+        standings = self.current_tournament.standings
         if index is None:
             if by_name:
-                players = sorted(players,
-                                 key=attrgetter("last_name", "first_name"))
-                view.show_listed_data(players)
+                view.show_listed_data(standings.players("name"))
             elif by_rank:
-                players = sorted(players, key=attrgetter("rank"))
-                view.show_listed_data(players)
+                view.show_listed_data(standings.players("rank"))
+            elif by_score:
+                view.show_standings(self.current_tournament.standings_with_tie_breaks())
         else:
             try:
                 print(players[index - 1])
@@ -416,15 +558,29 @@ class Control:
             except TypeError:
                 view.show_warning(self.error_messages["INVALIDE_FORMAT"])
 
-    def add_player_from_db(self, db_file, player_id):
+    def add_player_from_db(self, db_file, players_id):
+        """Add players from a database file. If no file is given, each
+        player is loaded from the file given by the catalog.
+        """
+        if db_file:
+            files = {db_file: players_id}
+        else:
+            files = {}
+            for player_id in players_id:
+                files.setdefault(catalog.find_player(player_id), []).append(player_id)
+        missing_ids = files.pop(None, [])
         try:
-            self.current_tournament.add_player_from_db(db_file, player_id)
+            for file_name, file_players_id in files.items():
+                missing_ids.extend(self.current_tournament.add_players_from_db(file_name, file_players_id))
+            for player_id in missing_ids:
+                view.show_warning(f"Joueur ({player_id}) absent de la base de données")
         except Exception as err:
             print("Opération impossible :", err)
         except Warning as err:
             print("Opération impossible :", err)
 
     def save_player_menu(self):
+        """Return the next menu."""
         view.show_save_player_menu()
 
         while True:
@@ -437,19 +593,28 @@ class Control:
                 self.save_player_into_db(db_file)
                 break
             elif resp == "q":
-                break
+                return "tournament"
 
-        if resp in ("1", "2"):
-            self.save_player_menu()
+        return "save_player"
 
     def save_player_into_db(self, db_file):
-        for player in self.current_tournament.get_player_list:
-            try:
-                self.current_tournament.save_player_into_db(db_file, player)
-            except Warning as err:
-                view.show_message(err)
+        """Save the tournament's players. In a rated tournament, the rating
+        of the players already saved is updated instead."""
+        db_file = with_db_extension(db_file)
+        failed_ids = self.current_tournament.save_players_into_db(
+            db_file, self.current_tournament.get_player_list)
+        if self.current_tournament.rated and failed_ids:
+            failed_ids = set(failed_ids)
+            self.current_tournament.update_ratings_into_db(
+                db_file, [player for player in self.current_tournament.get_player_list
+                          if player.id_player in failed_ids])
+            view.show_message(f"Classement Elo mis à jour pour {len(failed_ids)} joueur(s).")
+            return
+        for player_id in failed_ids:
+            view.show_message(f"Joueur ({player_id}) déjà présent dans la base de données.")
 
     def load_player_menu(self):
+        """Return the next menu."""
         view.show_load_player_menu()
 
         while True:
@@ -462,19 +627,20 @@ class Control:
                 self.get_player_list_from_db(db_file)
                 break
             elif resp == "3":
-                db_file = view.ask_user_input("Nom du fichier : ")
-                player_id = view.ask_user_input("Entrer l'identifiant du joueur à ajouter (1000_ABCDEF) : ")
-                self.add_player_from_db(db_file, player_id)
+                db_file = view.ask_user_input("Nom du fichier (vide pour une recherche automatique) : ")
+                players_id = view.ask_user_input(
+                    "Entrer les identifiants des joueurs à ajouter, séparés par une virgule (1000_ABCDEF) : ")
+                self.add_player_from_db(db_file, [p_id.strip() for p_id in players_id.split(",") if p_id.strip()])
                 break
             elif resp == "q":
-                break
+                return "tournament"
             else:
                 view.show_warning(self.error_messages["UNKNOWN_COMMAND"])
 
-        if resp in ("1", "2", "3", "4"):
-            self.load_player_menu()
+        return "load_player"
 
     def load_tournament_menu(self):
+        """Return the next menu."""
         view.show_load_tournament_menu()
         while True:
             resp = view.ask_user_input("Choix : ")
@@ -485,24 +651,34 @@ class Control:
                 self.list_tournaments_in_db()
                 break
             elif resp == "3":
-                self.load_tournament_from_db()
+                if not self.load_tournament_from_db():
+                    return "start"
                 break
-            elif resp == "q":
+            elif resp == "4":
+                self.search_tournaments_in_db(unfinished=True)
+                break
+            elif resp == "5":
+                self.search_tournaments_in_db()
                 break
+            elif resp == "q":
+                return "start"
             else:
                 view.show_warning(self.error_messages["UNKNOWN_COMMAND"])
 
-        if resp in ("1", "2", "3"):
-            self.load_tournament_menu()
-        elif resp == "q":
-            self.start_menu()
+        return "load_tournament"
 
     def set_tournament_end_date(self):
         while True:
             date = view.ask_user_input("Choisir une date de fin (JJ/MM/AAAA) : ")
             try:
-                self.current_tournament.end_tournament(date)
+                missing_ids = self.current_tournament.end_tournament(date)
                 view.show_message(f"Date de fin du tournoi : {date}")
+                if self.current_tournament.rated:
+                    nb_saved = len(self.current_tournament.get_player_list) - len(missing_ids)
+                    view.show_message(f"Classement Elo mis à jour pour {nb_saved} joueur(s).")
+                for player_id in missing_ids:
+                    view.show_message(f"Joueur ({player_id}) absent des bases de données : "
+                                      "classement Elo non sauvegardé.")
                 break
             except Warning:
                 view.show_warning(self.error_messages["INVALID_DATE"])
@@ -510,80 +686,43 @@ class Control:
                 view.show_warning(self.error_messages["ONGOING_TOURNAMENT"])
                 break
 
-        self.tournament_menu()
-
     def load_tournament_from_db(self):
-        """Load a saved tournament avalable in the database.
+        """Load a saved tournament avalable in the database. Return False if
+        the tournament isn't in the database.
         """
-        view.show_message("Fichiers existants : ")
-        file_list = self.get_file_list()
-        file_name = view.ask_user_input("Nom du fichier de chargement : ")
+        name = view.ask_user_input("Nom du tournoi à charger : ")
+        file_name = catalog.find_tournament(name)
+        if file_name is None:
+            view.show_message("Fichiers existants : ")
+            file_list = self.get_file_list()
+            file_name = view.ask_user_input("Nom du fichier de chargement : ")
+        else:
+            file_list = [file_name]
+            view.show_message(f"Tournoi trouvé dans le fichier {file_name}.")
 
         if file_name in file_list:
-            loader = trdb.TournamentDB(file_name)
-            name = view.ask_user_input("Nom du tournoi à charger : ")
             try:
-                tournament_data = loader.load_tournament_from_db(name)
-                tournament_info = tournament_data[0]
-                players_info = tournament_data[1]
-                rounds_info = tournament_data[2]
-
-                loaded_tournament = trn.Tournament(tournament_info["name"],
-                                                   tournament_info["localization"],
-                                                   tournament_info["time_control"],
-                                                   tournament_info["description"],
-                                                   tournament_info["beg_date"],
-                                                   tournament_info["end_date"])
-
-                if players_info:
-                    for e, players in enumerate(players_info):
-                        player = players[f"player{e}"]
-                        loaded_tournament.add_new_player(player["last_name"],
-                                                         player["first_name"],
-                                                         player["date_birth"],
-                                                         player["gender"],
-                                                         player["rank"])
-
-                # Saved rounds data only contains scores. The rounds are build
-                # through the application internal logic. Scores are added only
-                # if the saved rounds data has an end_date
-                if rounds_info:
-                    for e, rnd in enumerate(rounds_info):
-                        if rnd[f"Round {e+1}"]["end_date"] is None:
-                            pass
-                        else:
-                            loaded_tournament.add_round_to_list(f"Round {e+1}")
-                            currrent_round = loaded_tournament.get_round_list[e]
-                            for nb, game in enumerate(currrent_round.get_match_list):
-                                score1 = rnd[f"Round {e+1}"][f"game {nb + 1}"][0]
-                                score2 = rnd[f"Round {e+1}"][f"game {nb + 1}"][1]
-                                P1 = game[0][0]
-                                P2 = game[0][1]
-                                game[1][0] = score1
-                                game[1][1] = score2
-                                P1.set_player_score = score1
-                                P2.set_player_score = score2
-                                currrent_round.end_date = rnd[f"Round {e+1}"]["end_date"]
+                loaded_tournament = trn.Tournament.load_tournament_from_db(file_name, name, lazy=True)
+
+                replayed = loaded_tournament.attach_journal(jrn.ResultJournal(loaded_tournament.name, file_name),
+                                                            replay=True)
+                if replayed:
+                    view.show_message(f"{replayed} modification(s) non sauvegardée(s) restaurée(s).")
 
                 self.tournament_list.append(loaded_tournament)
                 self.current_tournament = loaded_tournament
 
             except Warning:
                 view.show_warning(self.error_messages["MISSING_TOURNAMENT"])
-                self.start_menu()
+                return False
         else:
             view.show_warning(self.error_messages["MISSING_FILE"])
+        return True
 
     def save_tournament_in_db(self):
-        file_name = view.ask_user_input("Nom du fichier de sauvegarde : ")
-        update = False
+        file_name = with_db_extension(view.ask_user_input("Nom du fichier de sauvegarde : "))
         loader = trdb.TournamentDB(file_name)
-        all_tournaments = loader.list_tournaments_in_db()
-        for tournament in all_tournaments:
-            if self.current_tournament.name in tournament["tournament_data"]["tournament_info"].values():
-                update = True
-            else:
-                pass
+        update = loader.tournament_exists(self.current_tournament.name)
 
         if update:
             self.current_tournament.save_tournament_in_db(file_name, update)
@@ -595,16 +734,41 @@ class Control:
         by view.
         """
         view.show_message("Fichiers disponibles :\n")
-        self.get_file_list()
+        file_list = self.get_file_list()
         file_name = view.ask_user_input("Nom du fichier : ")
-        if file_name in self.get_file_list():
+        if file_name in file_list:
             loader = trdb.TournamentDB(file_name)
-            all_tournaments = loader.list_tournaments_in_db()
-            for one_tournament in all_tournaments:
-                view.show_key_val_data(one_tournament["tournament_data"]["tournament_info"])
+            for tournament_info in loader.iter_tournament_headers():
+                view.show_key_val_data(tournament_info)
         else:
             view.show_warning(self.error_messages["MISSING_FILE"])
 
+    def search_tournaments_in_db(self, unfinished=False):
+        """Send to view the unfinished tournaments of a database file, or the
+        tournaments started between two dates.
+        """
+        file_name = view.ask_user_input("Nom du fichier : ")
+        if file_name not in self.get_file_list(show=False):
+            view.show_warning(self.error_messages["MISSING_FILE"])
+            return
+
+        loader = trdb.TournamentDB(file_name)
+        if unfinished:
+            tournaments = loader.list_unfinished_tournaments()
+        else:
+            start = view.ask_user_input("Début de la période (JJ/MM/AAAA) : ")
+            end = view.ask_user_input("Fin de la période (JJ/MM/AAAA) : ")
+            try:
+                dt.strptime(start, "%d/%m/%Y")
+                dt.strptime(end, "%d/%m/%Y")
+            except ValueError:
+                view.show_warning(self.error_messages["INVALID_DATE"])
+                return
+            tournaments = loader.list_tournaments_between(start, end)
+
+        for tournament_info in tournaments:
+            view.show_key_val_data(tournament_info)
+
 
 if __name__ == '__main__':
     ct = Control()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import argparse
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote, urlsplit
+
+from controller.batch import Batch
+from model.interactDB import registry
+from model.tournamentdb import MissingTournament
+
+
+CREATE_FIELDS = {"name": str, "localization": str, "time_control": str, "beg_date": str, "description": str,
+                 "max_players": int, "max_rounds": int, "rated": bool}
+
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+def check_field(data, key, kind):
+    """Raise a Warning if data has a key whose value isn't of type kind.
+    Booleans aren't taken as integers."""
+    value = data[key]
+    if not isinstance(value, kind) or (kind is int and isinstance(value, bool)):
+        raise Warning(f"Champ {key} invalide : {kind.__name__} attendu.")
+
+
+class TournamentServer:
+    """Local HTTP/JSON service giving several arbiters access to the
+    tournaments of a database file at the same time :
+    - GET /tournaments : tournaments of the file ;
+    - POST /tournaments : create a tournament (see Batch.create) ;
+    - GET /tournaments/<name> : tournament's informations, rounds and
+    standings ;
+    - POST /tournaments/<name>/players : add {"players": [...]} ;
+    - GET /tournaments/<name>/rounds : rounds and pairings ;
+    - POST /tournaments/<name>/rounds : pair the next round ;
+    - POST /tournaments/<name>/results : enter {"results": {board: result}},
+    and end the round if "end" is true ;
+    - POST /tournaments/<name>/end : end the tournament on {"end_date":
+    "JJ/MM/AAAA"}, today by default (see Batch.end) ;
+    - GET /tournaments/<name>/standings : standings with tie-breaks.
+    Requests are handled by asyncio, without blocking. Every change goes
+    through a queue to a single writer task, which runs them one after the
+    other in a worker thread, then saves the changed tournaments once for
+    all the changes waiting in the queue. After each save, the writer
+    encodes the JSON answers of the changed tournaments : reads are served
+    from these snapshots, without touching the tournaments, so any number
+    of clients can read while changes are written.
+    Errors are answered as {"error": message} : 404 for an unknown
+    tournament, 400 for an invalid request, 500 for an unexpected error,
+    whose details aren't sent to the client.
+    """
+    MAX_BODY_SIZE = 10 * 1024 * 1024
+
+    def __init__(self, db_file_name, host="127.0.0.1", port=8080):
+        """Class constructor, takes the database file's name. The service
+        only listens on localhost by default."""
+        self.host = host
+        self.port = port
+        self.batch = Batch(db_file_name, autosave=False)
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.snapshots = {}
+        self.tournament_list = None
+        self.queue = None
+        self.server = None
+        self.writer_task = None
+
+    async def start(self):
+        """Start the writer task and listen for requests. Return the port,
+        chosen by the system if port is 0."""
+        self.queue = asyncio.Queue()
+        self.writer_task = asyncio.create_task(self.writer())
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def stop(self):
+        """Stop listening, let the writer finish the queued changes, then
+        close the database files."""
+        self.server.close()
+        await self.server.wait_closed()
+        await self.queue.put(None)
+        await self.writer_task
+        await asyncio.get_running_loop().run_in_executor(self.executor, registry.close_all)
+        self.executor.shutdown()
+
+    async def submit(self, operation, name=None, write=True):
+        """Queue an operation for the writer and wait for its result. name
+        is the tournament it reads or changes, if any."""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((operation, name, write, future))
+        return await future
+
+    async def writer(self):
+        """Single writer task : run the queued operations in the worker
+        thread, grouping those already waiting into one save."""
+        loop = asyncio.get_running_loop()
+        running = True
+        while running:
+            job = await self.queue.get()
+            if job is None:
+                break
+            jobs = [job]
+            while not self.queue.empty():
+                job = self.queue.get_nowait()
+                if job is None:
+                    running = False
+                    break
+                jobs.append(job)
+            results, snapshots, tournament_list = await loop.run_in_executor(self.executor, self.run_jobs, jobs)
+            self.snapshots.update(snapshots)
+            if tournament_list is not None:
+                self.tournament_list = tournament_list
+            for (operation, name, write, future), (done, value) in zip(jobs, results):
+                if future.cancelled():
+                    continue
+                if done:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+
+    def run_jobs(self, jobs):
+        """Run operations in the worker thread, the only one using the
+        tournaments and database files. Return their results, the new
+        snapshots of the tournaments they used and the new tournament list,
+        or None if no tournament was changed.
+        """
+        results = []
+        changed = set()
+        used = set()
+        for operation, name, write, future in jobs:
+            try:
+                results.append((True, operation()))
+            except Exception as err:
+                results.append((False, err))
+                continue
+            if name is not None:
+                used.add(name)
+                if write:
+                    changed.add(name)
+
+        for name in changed:
+            try:
+                self.batch.save(name)
+            except Exception as err:
+                results = [(False, err) if job[1] == name else result for job, result in zip(jobs, results)]
+        snapshots = {}
+        for name in used:
+            if name in changed or name not in self.snapshots:
+                snapshots[name] = self.make_snapshot(name)
+        tournament_list = self.encode(self.batch.list_tournaments()) if changed else None
+        return (results, snapshots, tournament_list)
+
+    def make_snapshot(self, name):
+        data = self.batch.describe_tournament(name)
+        return {"tournament": self.encode(data),
+                "rounds": self.encode(data["rounds"]),
+                "standings": self.encode(data["standings"])}
+
+    @staticmethod
+    def encode(data):
+        return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+    async def read_snapshot(self, name, part):
+        if name not in self.snapshots:
+            await self.submit(lambda: self.batch.get_tournament(name), name, write=False)
+        return self.snapshots[name][part]
+
+    async def dispatch(self, method, path, body):
+        """Return the status and the JSON encoded answer of a request."""
+        parts = [unquote(part) for part in path.strip("/").split("/")]
+        resources = (None, "players", "rounds", "results", "standings", "end")
+        if parts[0] != "tournaments" or len(parts) > 3 or (parts + [None, None])[2] not in resources:
+            return (404, self.encode({"error": "Ressource inexistante."}))
+        try:
+            data = json.loads(body) if body else {}
+            if not isinstance(data, dict):
+                raise ValueError
+        except ValueError:
+            return (400, self.encode({"error": "Corps de requête JSON invalide : objet attendu."}))
+
+        name = parts[1] if len(parts) > 1 else None
+        resource = parts[2] if len(parts) > 2 else None
+        batch = self.batch
+        try:
+            if method == "GET" and name is None:
+                if self.tournament_list is None:
+                    self.tournament_list = await self.submit(lambda: self.encode(batch.list_tournaments()),
+                                                             write=False)
+                return (200, self.tournament_list)
+            if method == "GET" and resource in (None, "rounds", "standings"):
+                return (200, await self.read_snapshot(name, resource or "tournament"))
+            if method == "POST" and name is None:
+                if not isinstance(data.get("name"), str) or not data["name"]:
+                    raise Warning("Nom du tournoi attendu.")
+                fields = {"localization": "", "time_control": "Blitz"}
+                for key, kind in CREATE_FIELDS.items():
+                    if data.get(key) is not None:
+                        check_field(data, key, kind)
+                        fields[key] = data[key]
+                result = await self.submit(lambda: batch.create(**fields), data["name"])
+                return (201, self.encode(result))
+            if method == "POST" and resource == "players":
+                if data.get("players") is not None:
+                    check_field(data, "players", list)
+                result = await self.submit(lambda: batch.add_players(name, players=data.get("players")), name)
+                return (200, self.encode(result))
+            if method == "POST" and resource == "rounds":
+                result = await self.submit(lambda: batch.pair(name), name)
+                return (201, self.encode(result))
+            if method == "POST" and resource == "results":
+                for key, kind in (("results", dict), ("end_date", str)):
+                    if data.get(key) is not None:
+                        check_field(data, key, kind)
+                result = await self.submit(lambda: batch.record(name, data.get("results"),
+                                                                end_date=data.get("end_date"),
+                                                                end=bool(data.get("end", False))), name)
+                return (200, self.encode(result))
+            if method == "POST" and resource == "end":
+                if data.get("end_date") is not None:
+                    check_field(data, "end_date", str)
+                result = await self.submit(lambda: batch.end(name, data.get("end_date")), name)
+                return (200, self.encode(result))
+        except MissingTournament as err:
+            return (404, self.encode({"error": str(err)}))
+        except Warning as err:
+            return (400, self.encode({"error": str(err)}))
+        except Exception:
+            return (500, self.encode({"error": "Erreur interne du serveur."}))
+        return (405, self.encode({"error": "Méthode non autorisée."}))
+
+    async def handle_client(self, reader, writer):
+        """Read HTTP/1.1 requests from a connection, kept alive unless the
+        client asks otherwise, and answer them."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if not line.strip():
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    await self.respond(writer, 400, self.encode({"error": "Requête invalide."}), False)
+                    break
+                if length > self.MAX_BODY_SIZE:
+                    await self.respond(writer, 413, self.encode({"error": "Requête trop volumineuse."}), False)
+                    break
+                body = await reader.readexactly(length) if length > 0 else b""
+
+                status, payload = await self.dispatch(method.upper(), urlsplit(target).path, body)
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                await self.respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def respond(writer, status, payload, keep_alive):
+        writer.write((f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                      "Content-Type: application/json; charset=utf-8\r\n"
+                      f"Content-Length: {len(payload)}\r\n"
+                      f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode("latin-1") + payload)
+        await writer.drain()
+
+
+async def serve(db_file_name, host, port):
+    server = TournamentServer(db_file_name, host, port)
+    port = await server.start()
+    print(f"Serveur à l'écoute sur http://{host}:{port}/tournaments (Ctrl+C pour arrêter).")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main(argv=None):
+    """Command : python -m controller.server [--db fichier.json] [--port 8080]"""
+    parser = argparse.ArgumentParser(prog="python -m controller.server",
+                                     description="Service HTTP/JSON local de gestion des tournois.")
+    parser.add_argument("--db", default="tournaments.json", help="fichier de la base de données")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.db, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import sqlite3
+
+from model.interactDB import registry
+from model.sqlitedb import SQLITE_EXTENSIONS
+from model.storage import iter_json_table, iter_json_values
+
+
+DB_EXTENSIONS = (".json",) + SQLITE_EXTENSIONS
+
+
+def is_db_file(file_name):
+    """Return True if the file is a database file : a file with one of the
+    database extensions, or a file without extension, as saved by the
+    first versions of the application."""
+    return file_name.endswith(DB_EXTENSIONS) or not os.path.splitext(file_name)[1]
+
+
+def with_db_extension(file_name, data_dir="data"):
+    """Return the name of a database file, with the .json extension added
+    if it has none of the database extensions, so that the file is listed
+    by the catalog. An existing file without extension keeps its name."""
+    if file_name.endswith(DB_EXTENSIONS):
+        return file_name
+    if is_db_file(file_name) and os.path.isfile(os.path.join(data_dir, file_name)):
+        return file_name
+    return file_name + ".json"
+
+
+class Catalog:
+    """Catalog of the database files of 'data' directory, saved in
+    'data/files.catalog'. For each file, it keeps its mtime, the names of
+    its tournaments and the ids of its players, so a tournament or a player
+    can be found without opening every file. refresh() only reads the
+    files added or modified since the last refresh.
+    """
+    FILE_NAME = "files.catalog"
+
+    def __init__(self, data_dir="data"):
+        """Class constructor, takes the data directory."""
+        self.data_dir = data_dir
+        self.path = os.path.join(data_dir, self.FILE_NAME)
+        self.__files = None
+        self.__tournaments = {}
+        self.__players = {}
+
+    def __load(self):
+        try:
+            with open(self.path, encoding="utf-8") as catalog_file:
+                self.__files = json.load(catalog_file)
+        except (FileNotFoundError, ValueError):
+            self.__files = {}
+
+    def __save(self):
+        with open(self.path, "w", encoding="utf-8") as catalog_file:
+            json.dump(self.__files, catalog_file)
+
+    def __make_lookups(self):
+        """Map each tournament and player to its file. If several files hold
+        the same tournament or player, the most recent file wins."""
+        self.__tournaments = {}
+        self.__players = {}
+        for file_name, entry in sorted(self.__files.items(), key=lambda item: item[1]["mtime"]):
+            for name in entry["tournaments"]:
+                self.__tournaments[name] = file_name
+            for id_player in entry["players"]:
+                self.__players[id_player] = file_name
+
+    def read_entry(self, file_name, mtime):
+        """Return the catalog entry of a file. The tournaments' names and
+        the players' ids are streamed from the file, which is neither
+        loaded nor kept in the handles registry. Raise a ValueError or a
+        sqlite3.Error if the file can't be read.
+        """
+        path = os.path.join(self.data_dir, file_name)
+        if file_name.endswith(SQLITE_EXTENSIONS):
+            connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+            try:
+                tournaments = [json.loads(data)["tournament_info"]["name"]
+                               for (data,) in connection.execute("SELECT data FROM tournaments")]
+                players = [id_player for (id_player,) in connection.execute("SELECT id_player FROM players")]
+            finally:
+                connection.close()
+        else:
+            tournaments = [info["name"] for info in iter_json_values(path, "tournament_info")]
+            players = [player["id_player"] for player in iter_json_table(path, "Players") if "id_player" in player]
+        return {"mtime": mtime, "tournaments": tournaments, "players": players}
+
+    def refresh(self):
+        """Scan 'data' directory once, read the new or modified files and
+        forget the deleted ones. Return the sorted list of database files.
+        """
+        if self.__files is None:
+            self.__load()
+        if not os.path.exists(self.data_dir):
+            os.mkdir(self.data_dir)
+        registry.flush_all()
+
+        modified = False
+        found = set()
+        with os.scandir(self.data_dir) as entries:
+            for entry in entries:
+                if not entry.is_file() or not is_db_file(entry.name):
+                    continue
+                mtime = entry.stat().st_mtime_ns
+                known = self.__files.get(entry.name)
+                if known is None or known["mtime"] != mtime:
+                    try:
+                        self.__files[entry.name] = self.read_entry(entry.name, mtime)
+                    except (OSError, ValueError, TypeError, KeyError, sqlite3.Error):
+                        # An unreadable file is left out of the listing,
+                        # it is read again on next refresh.
+                        if self.__files.pop(entry.name, None) is not None:
+                            modified = True
+                        continue
+                    modified = True
+                found.add(entry.name)
+
+        for file_name in set(self.__files) - found:
+            del self.__files[file_name]
+            modified = True
+
+        if modified or not self.__tournaments and not self.__players:
+            self.__make_lookups()
+        if modified:
+            self.__save()
+        return sorted(self.__files)
+
+    @property
+    def get_files_info(self):
+        """Return the number of tournaments and players of each file."""
+        return {file_name: {"tournaments": len(entry["tournaments"]), "players": len(entry["players"])}
+                for file_name, entry in self.__files.items()}
+
+    def find_tournament(self, tournament_name):
+        """Return the name of the file holding the tournament, or None."""
+        self.refresh()
+        return self.__tournaments.get(tournament_name)
+
+    def find_player(self, id_player):
+        """Return the name of the file holding the player, or None."""
+        self.refresh()
+        return self.__players.get(id_player)
+
+    def find_players(self, players_id):
+        """Return the name of the file holding each player, or None, keyed
+        on id_player. The directory is scanned once."""
+        self.refresh()
+        return {id_player: self.__players.get(id_player) for id_player in players_id}
+
+
+catalog = Catalog()
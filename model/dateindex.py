@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime as dt
+
+
+DATE_FORMATS = ("%d/%m/%Y %H:%M", "%d/%m/%Y")
+
+
+def date_key(date):
+    """Return a sortable key ('AAAA-MM-JJ HH:MM') of a date entered in the
+    application's formats ('JJ/MM/AAAA HH:MM' or 'JJ/MM/AAAA'), or None if
+    there is no date or its format is unknown.
+    """
+    if not date:
+        return None
+    for date_format in DATE_FORMATS:
+        try:
+            return dt.strptime(date, date_format).strftime("%Y-%m-%d %H:%M")
+        except ValueError:
+            pass
+    return None
+
+
+class TournamentDateIndex:
+    """In-memory indexes of the tournaments of a file on their beg_date
+    and end_date, kept as sorted lists of (date key, name), plus the set of
+    unfinished tournaments. Built on first use from the tournament_info
+    dicts given by headers_loader, kept in sync by update().
+    """
+    def __init__(self, headers_loader):
+        """Class constructor, takes a function returning the tournament_info
+        dict of every tournament of the file.
+        """
+        self.headers_loader = headers_loader
+        self.__keys = None
+        self.__beg_dates = []
+        self.__end_dates = []
+        self.__unfinished = set()
+
+    def __build(self):
+        if self.__keys is None:
+            self.__keys = {}
+            for tournament_info in self.headers_loader():
+                self.__add(tournament_info)
+
+    def __add(self, tournament_info):
+        name = tournament_info["name"]
+        keys = (date_key(tournament_info.get("beg_date")), date_key(tournament_info.get("end_date")))
+        self.__keys[name] = keys
+        if keys[0] is not None:
+            insort(self.__beg_dates, (keys[0], name))
+        if keys[1] is not None:
+            insort(self.__end_dates, (keys[1], name))
+        else:
+            self.__unfinished.add(name)
+
+    def __remove(self, name):
+        keys = self.__keys.pop(name)
+        if keys[0] is not None:
+            del self.__beg_dates[bisect_left(self.__beg_dates, (keys[0], name))]
+        if keys[1] is not None:
+            del self.__end_dates[bisect_left(self.__end_dates, (keys[1], name))]
+        self.__unfinished.discard(name)
+
+    def update(self, tournament_info):
+        """Add a tournament to the indexes, or move it if its dates changed."""
+        self.__build()
+        if tournament_info["name"] in self.__keys:
+            self.__remove(tournament_info["name"])
+        self.__add(tournament_info)
+
+    def between(self, start, end, field="beg_date"):
+        """Return the names of the tournaments whose beg_date (or end_date)
+        is between the start and end keys, both included."""
+        self.__build()
+        dates = self.__beg_dates if field == "beg_date" else self.__end_dates
+        first = bisect_left(dates, (start,))
+        last = bisect_right(dates, (end, chr(0x10FFFF)))
+        return [name for key, name in dates[first:last]]
+
+    def unfinished(self):
+        self.__build()
+        return sorted(self.__unfinished)
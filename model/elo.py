@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+
+DEFAULT_RATING = 1500
+K_FACTOR = 20
+
+
+def expected_scores(ratings, opponent_ratings):
+    """Return the expected score of each player against their opponent."""
+    return 1 / (1 + 10 ** ((opponent_ratings - ratings) / 400))
+
+
+def rating_deltas(ratings, opponents, points, k_factor=K_FACTOR):
+    """Return the rating change of every player for one round, computed
+    for all the games at once from the ratings before the round.
+    ratings is indexed by slot, opponents gives the opponent's slot of each
+    player (negative for a bye or no game) and points the points scored.
+    Players without an opponent keep their rating.
+
+    Complexity : O(n), vectorized.
+    """
+    ratings = np.asarray(ratings, dtype=float)
+    opponents = np.asarray(opponents)
+    played = opponents >= 0
+    opponent_ratings = ratings[np.where(played, opponents, 0)]
+    expected = expected_scores(ratings, opponent_ratings)
+    return np.where(played, k_factor * (np.asarray(points) - expected), 0)
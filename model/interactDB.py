@@ -1,29 +1,373 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import atexit
+import copy
 import os
 
 from tinydb import TinyDB, Query
+from tinydb.storages import JSONStorage
+
+from model.storage import BufferedStorage, iter_json_values
+from model.sqlitedb import SQLiteHandle, SQLITE_EXTENSIONS
+from model.dateindex import TournamentDateIndex
+
+
+def replace_document(doc, row):
+    """Replace the content of a stored document by row. Used as TinyDB
+    update function : updating with a dict keeps the fields missing from it.
+    """
+    doc.clear()
+    doc.update(row)
+
+
+class PlayerIndex:
+    """In-memory index of a players table keyed on id_player. The index
+    is built on first use and kept in sync by its insert, update and
+    remove methods, so lookups don't scan the whole table.
+    """
+    def __init__(self, table):
+        """Class constructor, takes the TinyDB players table."""
+        self.table = table
+        self.__doc_ids = None
+
+    @property
+    def get_doc_ids(self):
+        if self.__doc_ids is None:
+            self.__doc_ids = {doc["id_player"]: doc.doc_id
+                              for doc in self.table.all() if "id_player" in doc}
+        return self.__doc_ids
+
+    def __contains__(self, id_player):
+        return id_player in self.get_doc_ids
+
+    def __len__(self):
+        return len(self.get_doc_ids)
+
+    def all(self):
+        return self.table.search(Query()["last_name"].exists())
+
+    def ids(self):
+        return list(self.get_doc_ids)
+
+    def existing(self, players_id):
+        """Return the subset of players_id present in the table."""
+        return {id_player for id_player in players_id if id_player in self.get_doc_ids}
+
+    def get(self, id_player):
+        """Return the player's document, or None if id_player is unknown."""
+        doc_id = self.get_doc_ids.get(id_player)
+        if doc_id is None:
+            return None
+        return self.table.get(doc_id=doc_id)
+
+    def get_multiple(self, players_id):
+        """Return the documents of the known players_id, keyed on id_player.
+
+        Complexity : O(k), k being the number of given ids, once the index
+        is built.
+        """
+        return {id_player: self.table.get(doc_id=self.get_doc_ids[id_player])
+                for id_player in players_id if id_player in self.get_doc_ids}
+
+    def insert(self, player_data):
+        doc_id = self.table.insert(player_data)
+        self.get_doc_ids[player_data["id_player"]] = doc_id
+        return doc_id
+
+    def insert_multiple(self, players_data):
+        """Insert several players in a single write operation."""
+        doc_ids = self.table.insert_multiple(players_data)
+        for player_data, doc_id in zip(players_data, doc_ids):
+            self.get_doc_ids[player_data["id_player"]] = doc_id
+        return doc_ids
+
+    def update(self, id_player, fields):
+        doc_id = self.get_doc_ids[id_player]
+        self.table.update(fields, doc_ids=[doc_id])
+        if "id_player" in fields and fields["id_player"] != id_player:
+            del self.get_doc_ids[id_player]
+            self.get_doc_ids[fields["id_player"]] = doc_id
+
+    def update_multiple(self, updates):
+        """Update several players in a single write operation. updates maps
+        each id_player to the fields to update. The ids are not changed.
+        """
+        self.table.update(lambda doc: doc.update(updates[doc["id_player"]]),
+                          doc_ids=[self.get_doc_ids[id_player] for id_player in updates])
+
+    def remove(self, id_player):
+        doc_id = self.get_doc_ids.pop(id_player)
+        self.table.remove(doc_ids=[doc_id])
+
+    def clear(self):
+        """Forget the index, it will be built again on next use."""
+        self.__doc_ids = None
+
+
+class TournamentRowIndex:
+    """In-memory index of a table whose rows belong to a tournament. Rows
+    are indexed on their "tournament" field, then on their key fields
+    (round number, game number...). Built on first use and kept in sync by
+    its upsert and remove methods.
+    """
+    def __init__(self, table, key_fields=()):
+        """Class constructor, takes the TinyDB table and the names of the
+        fields identifying a row inside a tournament.
+        """
+        self.table = table
+        self.key_fields = key_fields
+        self.__doc_ids = None
+
+    @property
+    def get_doc_ids(self):
+        if self.__doc_ids is None:
+            self.__doc_ids = {}
+            for doc in self.table.all():
+                if "tournament" in doc:
+                    rows = self.__doc_ids.setdefault(doc["tournament"], {})
+                    rows[self.row_key(doc)] = doc.doc_id
+        return self.__doc_ids
+
+    def row_key(self, row):
+        return tuple(row[field] for field in self.key_fields)
+
+    def __contains__(self, tournament):
+        return tournament in self.get_doc_ids
+
+    def all(self):
+        return [doc for doc in self.table.all() if "tournament" in doc]
+
+    def keys(self, tournament):
+        return set(self.get_doc_ids.get(tournament, {}))
+
+    def get(self, tournament, key=()):
+        doc_id = self.get_doc_ids.get(tournament, {}).get(key)
+        if doc_id is None:
+            return None
+        return self.table.get(doc_id=doc_id)
+
+    def rows(self, tournament):
+        """Return the rows of a tournament, sorted by key.
+
+        Complexity : O(k log k), k being the number of rows of the
+        tournament.
+        """
+        rows = self.get_doc_ids.get(tournament, {})
+        return [self.table.get(doc_id=rows[key]) for key in sorted(rows)]
+
+    def upsert(self, row):
+        """Insert the row, or update the stored row if it differs. Return
+        True if something has been written.
+        """
+        # Stored rows must not share mutable values (scores...) with the
+        # tournament, otherwise changes would go unnoticed : the rows
+        # written are copied, the unchanged ones are only compared.
+        rows = self.get_doc_ids.setdefault(row["tournament"], {})
+        key = self.row_key(row)
+        doc_id = rows.get(key)
+        if doc_id is None:
+            rows[key] = self.table.insert(copy.deepcopy(row))
+            return True
+        if self.table.get(doc_id=doc_id) != row:
+            new_row = copy.deepcopy(row)
+            self.table.update(lambda doc: replace_document(doc, new_row), doc_ids=[doc_id])
+            return True
+        return False
+
+    def upsert_multiple(self, rows):
+        """Insert the new rows and update the stored rows which differ, with
+        one write operation for the inserts and one for the updates. Return
+        the number of rows written.
+
+        Complexity : O(k) to compare the k given rows with the stored ones.
+        Each TinyDB write operation copies the whole table, so k calls to
+        upsert() would be O(N * k), N being the number of rows of the table.
+        """
+        new_rows = []
+        changes = {}
+        for row in rows:
+            doc_id = self.get_doc_ids.get(row["tournament"], {}).get(self.row_key(row))
+            if doc_id is None:
+                new_rows.append(copy.deepcopy(row))
+            elif self.table.get(doc_id=doc_id) != row:
+                changes[doc_id] = copy.deepcopy(row)
+
+        if new_rows:
+            doc_ids = self.table.insert_multiple(new_rows)
+            for row, doc_id in zip(new_rows, doc_ids):
+                self.get_doc_ids.setdefault(row["tournament"], {})[self.row_key(row)] = doc_id
+        if changes:
+            # The update function gets the raw document, without its doc_id.
+            by_key = {(row["tournament"],) + self.row_key(row): row for row in changes.values()}
+            self.table.update(lambda doc: replace_document(doc, by_key[(doc["tournament"],) + self.row_key(doc)]),
+                              doc_ids=list(changes))
+        return len(new_rows) + len(changes)
+
+    def remove(self, tournament, keys=None):
+        """Remove the given rows of a tournament, or all of them."""
+        rows = self.get_doc_ids.get(tournament, {})
+        keys = list(rows) if keys is None else keys
+        doc_ids = [rows.pop(key) for key in keys]
+        if doc_ids:
+            self.table.remove(doc_ids=doc_ids)
+        if not rows:
+            self.get_doc_ids.pop(tournament, None)
+
+
+class DatabaseHandle:
+    """Database of one JSON data file, shared by every InteractDB instance
+    opened on this file. Holds the TinyDB instance and its indexes.
+    """
+    def __init__(self, db_dir_path):
+        """Class constructor, takes the path of the data file."""
+        self.db_dir_path = db_dir_path
+        self.database = TinyDB(db_dir_path, storage=BufferedStorage(JSONStorage))
+        self.player_index = PlayerIndex(self.database.table("Players"))
+        self.header_index = TournamentRowIndex(self.database.table("Tournaments"))
+        self.opponents_index = TournamentRowIndex(self.database.table("opponents"))
+        self.tie_break_index = TournamentRowIndex(self.database.table("tie_breaks"))
+        self.entrant_index = TournamentRowIndex(self.database.table("tournament_players"), ("slot",))
+        self.round_index = TournamentRowIndex(self.database.table("rounds"), ("round",))
+        self.match_index = TournamentRowIndex(self.database.table("match"), ("round", "game"))
+        self.date_index = TournamentDateIndex(self.list_tournament_infos)
+        self.__legacy_ids = None
+
+    def list_players(self):
+        return self.player_index.all()
+
+    def list_headers(self):
+        return self.header_index.all()
+
+    def iter_headers(self):
+        """Yield the tournament_info dict of every tournament, streamed from
+        the file without loading the players and rounds."""
+        self.flush()
+        yield from iter_json_values(self.db_dir_path, "tournament_info")
+
+    def list_tournament_infos(self):
+        infos = [header["tournament_info"] for header in self.list_headers()]
+        infos.extend(legacy["tournament_data"]["tournament_info"] for legacy in self.list_legacy_tournaments())
+        return infos
+
+    @property
+    def get_legacy_ids(self):
+        """Index of the tournaments saved as a whole, before tournaments
+        were stored in normalized form, keyed on their name."""
+        if self.__legacy_ids is None:
+            self.__legacy_ids = {legacy["tournament_data"]["tournament_info"]["name"]: legacy.doc_id
+                                 for legacy in self.list_legacy_tournaments()}
+        return self.__legacy_ids
+
+    def get_legacy_tournament(self, tournament_name):
+        """Return the document of a tournament saved in the old format."""
+        doc_id = self.get_legacy_ids.get(tournament_name)
+        if doc_id is None:
+            return None
+        return self.header_index.table.get(doc_id=doc_id)
+
+    def list_legacy_tournaments(self):
+        return self.header_index.table.search(Query()["tournament_data"].exists())
+
+    def remove_legacy_tournament(self, tournament_name):
+        doc_id = self.get_legacy_ids.pop(tournament_name, None)
+        if doc_id is not None:
+            self.header_index.table.remove(doc_ids=[doc_id])
+
+    def is_outdated(self):
+        """The handle is outdated if the file has been deleted, or modified
+        on disk by someone else while no write of ours is waiting to be
+        flushed.
+        """
+        if not os.path.exists(self.db_dir_path):
+            return True
+        storage = self.database.storage
+        return storage.pending_writes == 0 and storage.is_outdated()
+
+    def flush(self):
+        self.database.storage.flush()
+
+    def close(self):
+        self.database.close()
+
+
+class HandleRegistry:
+    """Process-wide registry handing out one shared handle per data file,
+    so each file is opened and parsed once. A handle is opened again when
+    its file has been modified or deleted on disk. Files with a SQLite extension
+    (.sqlite, .sqlite3, .db) get a SQLiteHandle, other files a TinyDB
+    DatabaseHandle.
+    """
+    def __init__(self, data_dir="data"):
+        self.data_dir = data_dir
+        self.__handles = {}
+
+    def get_handle(self, db_file_name):
+        db_dir_path = os.path.join(self.data_dir, db_file_name)
+        handle = self.__handles.get(db_dir_path)
+
+        if handle is not None and handle.is_outdated():
+            handle.close()
+            handle = None
+
+        if handle is None:
+            if not os.path.exists(self.data_dir):
+                os.mkdir(self.data_dir)
+            if db_file_name.endswith(SQLITE_EXTENSIONS):
+                handle = SQLiteHandle(db_dir_path)
+            else:
+                handle = DatabaseHandle(db_dir_path)
+            self.__handles[db_dir_path] = handle
+        return handle
+
+    def flush_all(self):
+        for handle in self.__handles.values():
+            handle.flush()
+
+    def close_all(self):
+        """Flush and close every handle. Called at exit."""
+        for handle in self.__handles.values():
+            handle.close()
+        self.__handles.clear()
+
+
+registry = HandleRegistry()
+atexit.register(registry.close_all)
 
 
 class InteractDB:
     """Parent class for players class to interact with players
-    database.
+    database. The database can be a TinyDB JSON file or a SQLite file,
+    subclasses only use the indexes of the file's handle.
     """
-    def __init__(self, db_file_name):
-        """Class constructor, takes players db file name
-        and set the db's directory path."""
+    def __init__(self, db_file_name, buffered=False):
+        """Class constructor, takes players db file name and get the
+        file's shared handle from the registry. If buffered is True,
+        writes are kept in memory and written to the file on flush(), when
+        enough writes are pending, after a delay or at exit. Otherwise,
+        every write operation of the subclasses is written to the file.
+        """
         self.db_file_name = db_file_name
+        self.buffered = buffered
+
+        self.handle = registry.get_handle(db_file_name)
+        self.db_dir_path = self.handle.db_dir_path
+        self.player_index = self.handle.player_index
+        self.header_index = self.handle.header_index
+        self.opponents_index = self.handle.opponents_index
+        self.tie_break_index = self.handle.tie_break_index
+        self.entrant_index = self.handle.entrant_index
+        self.round_index = self.handle.round_index
+        self.match_index = self.handle.match_index
+        self.date_index = self.handle.date_index
+
+    def flush(self):
+        """Write pending operations into the database file."""
+        self.handle.flush()
 
-        if os.path.exists("data"):
-            self.db_dir_path = os.path.join("data", db_file_name)
-        else:
-            os.mkdir("data")
-            self.db_dir_path = os.path.join("data", db_file_name)
-
-        self.database = TinyDB(self.db_dir_path)
-        self.players = self.database.table("Players")
-        self.tournaments = self.database.table("Tournaments")
-        self.rounds = self.database.table("rounds")
-        self.match = self.database.table("match")
-        self.info = Query()
+    def commit(self):
+        """Called by subclasses at the end of a write operation. Pending
+        operations are flushed unless the buffered mode is on.
+        """
+        if not self.buffered:
+            self.flush()
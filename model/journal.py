@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import hashlib
+import json
+import os
+import re
+
+
+def journal_list_from_dir(data_dir="data"):
+    """Return a (tournament name, database file name) tuple for each
+    pending journal of 'data' directory. The database file name is empty
+    for a tournament which has never been saved.
+    """
+    journals = []
+    if os.path.exists(data_dir):
+        for file_name in os.listdir(data_dir):
+            if file_name.endswith(ResultJournal.EXTENSION):
+                entries = ResultJournal.read_entries(os.path.join(data_dir, file_name))
+                if entries:
+                    journals.append((entries[0]["tournament"], entries[0].get("file", "")))
+    return journals
+
+
+class ResultJournal:
+    """Append-only journal of the changes made to a tournament since its
+    last save : players added, rank changes, rounds creation, results and
+    rounds end date. Each change is one small JSON line appended to a file
+    of 'data' directory, so it survives a crash. Replaying the journal on
+    top of the saved tournament restores the lost changes.
+    A journal belongs to a tournament of a database file : its file name
+    ends with a hash of both names, and its header line holds them.
+    """
+    EXTENSION = ".journal"
+
+    def __init__(self, tournament_name, db_file_name="", data_dir="data"):
+        """Class constructor, takes the name of the journaled tournament and
+        of its database file, empty if the tournament has never been saved.
+        """
+        self.tournament_name = tournament_name
+        self.data_dir = data_dir
+        self.__file = None
+        self.set_db_file(db_file_name)
+
+        if not os.path.exists(data_dir):
+            os.mkdir(data_dir)
+
+    def set_db_file(self, db_file_name):
+        self.db_file_name = db_file_name
+        key = hashlib.sha1(json.dumps([self.tournament_name, db_file_name]).encode("utf-8")).hexdigest()[:16]
+        prefix = re.sub(r"[^\w-]", "_", self.tournament_name)[:40]
+        self.path = os.path.join(self.data_dir, f"{prefix}-{key}{self.EXTENSION}")
+
+    @property
+    def get_header(self):
+        return {"tournament": self.tournament_name, "file": self.db_file_name}
+
+    @staticmethod
+    def read_entries(path):
+        """Return the entries of a journal file. A last line truncated by a
+        crash is ignored.
+        """
+        entries = []
+        try:
+            with open(path, encoding="utf-8") as journal:
+                for line in journal:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        break
+        except FileNotFoundError:
+            pass
+        return entries
+
+    @property
+    def is_pending(self):
+        """Return True if the journal file exists : changes made since the
+        last save haven't been saved yet."""
+        return os.path.exists(self.path)
+
+    @property
+    def get_entries(self):
+        """Return the journaled changes, without the header line."""
+        entries = self.read_entries(self.path)
+        if entries and self.is_own_header(entries[0]):
+            return entries[1:]
+        return []
+
+    def is_own_header(self, header):
+        return header.get("tournament") == self.tournament_name and header.get("file", "") == self.db_file_name
+
+    def append(self, entry):
+        """Append an entry and force it to disk. Raise a Warning if the
+        journal file belongs to another tournament."""
+        if self.__file is None:
+            entries = self.read_entries(self.path)
+            if entries and not self.is_own_header(entries[0]):
+                raise Warning(f"Le journal {self.path} appartient à un autre tournoi.")
+            new_file = not os.path.exists(self.path)
+            self.__file = open(self.path, "a", encoding="utf-8")
+            if new_file:
+                self.__file.write(json.dumps(self.get_header) + "\n")
+        self.__file.write(json.dumps(entry) + "\n")
+        self.__file.flush()
+        os.fsync(self.__file.fileno())
+
+    def close(self):
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+    def clear(self):
+        """Delete the journal, once its changes are part of a saved
+        tournament.
+        """
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def move_to(self, db_file_name):
+        """Clear the journal, once the tournament has been saved into a
+        database file, and journal the next changes for this file."""
+        self.clear()
+        self.set_db_file(db_file_name)
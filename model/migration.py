@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+
+import model.tournamentdb as trdb
+from model.interactDB import registry
+from model.catalog import is_db_file
+from model.sqlitedb import SQLITE_EXTENSIONS
+
+
+def migrate_json_files(sqlite_file_name="chess.sqlite3", data_dir="data"):
+    """Import the players and tournaments of every .json file of 'data'
+    directory, and of every file without extension saved by the first
+    versions of the application, into a SQLite file of the same directory. Players already
+    present in the SQLite file are skipped, tournaments are updated.
+    Return a tuple with the number of imported players and tournaments.
+    """
+    target = trdb.TournamentDB(sqlite_file_name, buffered=True)
+    nb_players = 0
+    nb_tournaments = 0
+
+    for file_name in sorted(os.listdir(data_dir)):
+        if file_name.endswith(SQLITE_EXTENSIONS) or not is_db_file(file_name):
+            continue
+        source = trdb.TournamentDB(file_name)
+
+        players_data = source.handle.list_players()
+        known_ids = target.player_index.existing(data["id_player"] for data in players_data)
+        new_players = {}
+        for data in players_data:
+            if data["id_player"] not in known_ids:
+                new_players[data["id_player"]] = dict(data)
+        target.player_index.insert_multiple(list(new_players.values()))
+        nb_players += len(new_players)
+
+        for tournament_info in source.list_tournaments_in_db():
+            trn_info, players_info, rounds_info, opponents = source.load_tournament_from_db(tournament_info["name"])
+            tournament_data = {"tournament_info": trn_info, "opponents": opponents}
+            if players_info:
+                tournament_data["players_list"] = players_info
+            if rounds_info:
+                tournament_data["rounds_list"] = rounds_info
+            target.save_tournament_in_db({"tournament_data": tournament_data}, update=True)
+            nb_tournaments += 1
+
+    target.flush()
+    return (nb_players, nb_tournaments)
+
+
+def main():
+    """Command : python -m model.migration [nom_du_fichier.sqlite3]"""
+    sqlite_file_name = sys.argv[1] if len(sys.argv) > 1 else "chess.sqlite3"
+    nb_players, nb_tournaments = migrate_json_files(sqlite_file_name)
+    registry.close_all()
+    print(f"{nb_players} joueur(s) et {nb_tournaments} tournoi(s) importé(s) dans {sqlite_file_name}.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import base64
+import zlib
+
+
+class OpponentMatrix:
+    """Opponents history of a tournament : a bit matrix indexed by the
+    players' slots (their index in the tournament's player list), whose bit
+    (i, j) is set once players i and j have met. Checking if two players
+    met is O(1) and the whole field takes n² / 8 bytes : one bytearray row
+    per player, whose length doubles when players are added.
+    """
+    def __init__(self, size=0):
+        """Class constructor, takes the number of players."""
+        self.size = 0
+        self.__row_length = 1
+        self.__rows = []
+        self.resize(size)
+
+    def resize(self, size):
+        """Make room for size players. Existing bits are kept."""
+        if size > self.__row_length * 8:
+            row_length = max((size + 7) // 8, 2 * self.__row_length)
+            for row in self.__rows:
+                row.extend(bytes(row_length - self.__row_length))
+            self.__row_length = row_length
+        while len(self.__rows) < size:
+            self.__rows.append(bytearray(self.__row_length))
+        self.size = max(self.size, size)
+
+    def have_met(self, i, j):
+        return bool(self.__rows[i][j >> 3] & (1 << (j & 7)))
+
+    def mark(self, i, j):
+        """Record that players i and j have met."""
+        self.__rows[i][j >> 3] |= 1 << (j & 7)
+        self.__rows[j][i >> 3] |= 1 << (i & 7)
+
+    def opponents(self, i):
+        return [j for j in range(self.size) if self.have_met(i, j)]
+
+    def serialize(self):
+        """Return a dict object with the matrix's size and its rows,
+        compressed and base64 encoded, to be saved with the tournament.
+        """
+        used_length = (self.size + 7) // 8
+        bits = b"".join(bytes(row[:used_length]) for row in self.__rows)
+        return {"size": self.size,
+                "bits": base64.b64encode(zlib.compress(bits)).decode("ascii")}
+
+    @classmethod
+    def deserialize(cls, data):
+        matrix = cls(data["size"])
+        used_length = (matrix.size + 7) // 8
+        bits = zlib.decompress(base64.b64decode(data["bits"]))
+        for i, row in enumerate(matrix.__rows):
+            row[:used_length] = bits[i * used_length:(i + 1) * used_length]
+        return matrix
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from collections import deque
+from itertools import chain, islice
+
+MAX_BYE_ATTEMPTS = 20
+
+
+def pair_players(nb_players, have_met, bye_candidates=None):
+    """Pair nb_players players, numbered from 0 (best placed) to
+    nb_players - 1, so that no pair has already met whenever such a
+    pairing exists. have_met(i, j) tells if players i and j already met.
+    If nb_players is odd, one player of bye_candidates (every player by
+    default) gets a bye. The MAX_BYE_ATTEMPTS lowest placed candidates are
+    tried first, from the lowest. If the others can't be paired without
+    rematch for any of them, the bye is given by the matching itself : a
+    dummy player, placed last, who has only met the players who aren't
+    candidates, is added to the field, and its opponent gets the bye.
+
+    The pairing is a maximum cardinality matching of the graph whose edges
+    link the players who haven't met. The edges aren't weighted by score,
+    the score groups are only favoured by the order of the greedy pass :
+    - a greedy pass pairs each player with the next best placed player not
+    met yet, which keeps most pairs inside the score groups ;
+    - the players left alone are then paired through augmenting paths,
+    found by Edmonds' blossom algorithm.
+    Players who can't be paired without rematch are paired together.
+    Return a tuple with the list of pairs (i, j), i < j, and the bye.
+
+    Complexity : O(n * r) for the greedy pass, r being the number of
+    rounds already played, plus O(n) per augmenting path in the usual
+    case, O(n²) in the worst case.
+    """
+    players = list(range(nb_players))
+    if nb_players % 2 == 0:
+        return (_pair(players, have_met), None)
+
+    candidates = list(bye_candidates) if bye_candidates else players
+    for bye in islice(sorted(candidates, reverse=True), MAX_BYE_ATTEMPTS):
+        pairs = _pair([player for player in players if player != bye], have_met)
+        if not any(have_met(i, j) for i, j in pairs):
+            return (pairs, bye)
+
+    dummy = nb_players
+    candidate_set = set(candidates)
+
+    def have_met_or_dummy(i, j):
+        if j == dummy:
+            return i not in candidate_set
+        if i == dummy:
+            return j not in candidate_set
+        return have_met(i, j)
+
+    pairs = _pair(players + [dummy], have_met_or_dummy)
+    if not any(have_met_or_dummy(i, j) for i, j in pairs):
+        bye = next(i for i, j in pairs if j == dummy)
+        return ([(i, j) for i, j in pairs if j != dummy], bye)
+    # No pairing without rematch exists : the lowest placed candidate gets
+    # the bye, the players who can't avoid a rematch are paired together.
+    bye = max(candidates)
+    return (_pair([player for player in players if player != bye], have_met), bye)
+
+
+def _pair(players, have_met):
+    """Return a perfect matching of an even list of sorted players."""
+    nb = len(players)
+    match = [-1] * nb
+
+    def allowed(i, j):
+        return not have_met(players[i], players[j])
+
+    # Greedy pass, the unmatched players are kept in a linked list so that
+    # matched players are never scanned again.
+    following = list(range(1, nb + 1))
+    head = 0
+    while head < nb:
+        i = head
+        head = following[i]
+        previous = None
+        j = head
+        while j < nb and not allowed(i, j):
+            previous = j
+            j = following[j]
+        if j < nb:
+            match[i] = j
+            match[j] = i
+            if previous is None:
+                head = following[j]
+            else:
+                following[previous] = following[j]
+
+    # Augmenting paths from the players left alone.
+    for root in range(nb):
+        if match[root] == -1:
+            end, parent = _find_augmenting_path(root, match, allowed)
+            while end != -1:
+                previous_match = match[parent[end]]
+                match[end] = parent[end]
+                match[parent[end]] = end
+                end = previous_match
+
+    # Players who can't be paired without rematch are paired together.
+    alone = [i for i in range(nb) if match[i] == -1]
+    for i, j in zip(alone[0::2], alone[1::2]):
+        match[i] = j
+        match[j] = i
+
+    return [(players[i], players[match[i]]) for i in range(nb) if i < match[i]]
+
+
+def _find_augmenting_path(root, match, allowed):
+    """Edmonds' blossom algorithm : search an augmenting path starting from
+    the free vertex root. Return the path's last vertex, or -1, and the
+    parent list through which the path is read backwards.
+    The neighbours of a vertex are every vertex allowed with it : the free
+    vertices are scanned first, since they end a path at once.
+    """
+    nb = len(match)
+    used = [False] * nb
+    parent = [-1] * nb
+    base = list(range(nb))
+    free = [i for i in range(nb) if match[i] == -1]
+
+    def lowest_common_ancestor(a, b):
+        seen = [False] * nb
+        while True:
+            a = base[a]
+            seen[a] = True
+            if match[a] == -1:
+                break
+            a = parent[match[a]]
+        while True:
+            b = base[b]
+            if seen[b]:
+                return b
+            b = parent[match[b]]
+
+    def mark_path(v, blossom_base, child, blossom):
+        while base[v] != blossom_base:
+            blossom[base[v]] = blossom[base[match[v]]] = True
+            parent[v] = child
+            child = match[v]
+            v = parent[match[v]]
+
+    used[root] = True
+    queue = deque([root])
+    while queue:
+        v = queue.popleft()
+        neighbours = chain(free, (i for i in range(nb) if match[i] != -1))
+        for to in neighbours:
+            if to == v or not allowed(v, to):
+                continue
+            if base[v] == base[to] or match[v] == to:
+                continue
+            if to == root or (match[to] != -1 and parent[match[to]] != -1):
+                blossom_base = lowest_common_ancestor(v, to)
+                blossom = [False] * nb
+                mark_path(v, blossom_base, to, blossom)
+                mark_path(to, blossom_base, v, blossom)
+                for i in range(nb):
+                    if blossom[base[i]]:
+                        base[i] = blossom_base
+                        if not used[i]:
+                            used[i] = True
+                            queue.append(i)
+            elif parent[to] == -1:
+                parent[to] = v
+                if match[to] == -1:
+                    return (to, parent)
+                used[match[to]] = True
+                queue.append(match[to])
+    return (-1, parent)
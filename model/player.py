@@ -1,6 +1,10 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+from model.playertable import PlayerTable
+from model.elo import DEFAULT_RATING
+
+
 class Player:
     """Class to make an instance of a chess player. Includes the following
     informations :
@@ -9,51 +13,87 @@ class Player:
     - Date of Birth
     - Gender
     - Rank
+    - Elo rating
+    A player is a light view onto a row of a PlayerTable, which holds its
+    informations and score. A tournament makes its players in its own
+    table. A player made without a table gets a table of its own, freed
+    with the player.
     """
-    def __init__(self, l_name, f_name, date_birth, gender, rank, score=0):
+    __slots__ = ("table", "row")
+
+    def __init__(self, l_name, f_name, date_birth, gender, rank, score=0, table=None, rating=DEFAULT_RATING):
         """Class constructor"""
-        self.last_name = l_name.capitalize()
-        self.first_name = f_name.capitalize()
-        self.date_birth = date_birth
-        self.gender = gender.upper()
-        self.rank = rank
-        self.id_player = self.date_birth.replace("/", "")[4:] + "_" \
-            + self.last_name[0:3].upper() \
-            + self.first_name[0:3].upper()
-        self.already_met = []
-        self.__score = score
-        self.__player_saved_info = {
+        self.table = table if table is not None else PlayerTable()
+        self.row = self.table.add_row(l_name.capitalize(), f_name.capitalize(),
+                                      date_birth, gender.upper(), rank, score, rating)
+
+    @property
+    def last_name(self):
+        return self.table.get_string(self.table.last_names[self.row])
+
+    @property
+    def first_name(self):
+        return self.table.get_string(self.table.first_names[self.row])
+
+    @property
+    def date_birth(self):
+        return self.table.get_string(self.table.birth_dates[self.row])
+
+    @property
+    def birth_year(self):
+        return self.table.birth_years[self.row]
+
+    @property
+    def gender(self):
+        return self.table.get_string(self.table.genders[self.row])
+
+    @property
+    def rank(self):
+        return self.table.ranks[self.row]
+
+    @rank.setter
+    def rank(self, rank):
+        self.table.ranks[self.row] = rank
+
+    @property
+    def rating(self):
+        return self.table.ratings[self.row]
+
+    @rating.setter
+    def rating(self, rating):
+        self.table.ratings[self.row] = rating
+
+    @property
+    def id_player(self):
+        return self.make_id(self.last_name, self.first_name, self.date_birth)
+
+    @staticmethod
+    def make_id(l_name, f_name, date_birth):
+        """Return the id of a player : birth year and the first letters of
+        their names, such as '1992_POIMAR'."""
+        return date_birth.replace("/", "")[4:] + "_" \
+            + l_name.capitalize()[0:3].upper() \
+            + f_name.capitalize()[0:3].upper()
+
+    @property
+    def get_player_saved_info(self):
+        return {
             "last_name": self.last_name,
             "first_name": self.first_name,
             "date_birth": self.date_birth,
             "gender": self.gender,
             "rank": self.rank,
+            "rating": self.rating,
             "id_player": self.id_player
         }
 
-    @property
-    def get_player_saved_info(self):
-        return self.__player_saved_info
-
-    @get_player_saved_info.setter
-    def set_player_saved_info(self, key, value):
-        self.__player_saved_info[key] = value
-
     @property
     def get_player_score(self):
-        return self.__score
-
-    @property
-    def get_already_met_list(self):
-        return self.already_met
-
-    @get_already_met_list.setter
-    def set_already_met(self, player):
-        self.already_met.append(player)
+        return self.table.scores[self.row]
 
     @get_player_score.setter
     def set_player_score(self, score):
-        self.__score = self.__score + score
+        self.table.scores[self.row] += score
 
     @property
     def get_player_rank(self):
@@ -84,7 +124,8 @@ class Player:
         Date de naissance : {self.date_birth}
         Sexe : {self.gender}
         Rang : {self.rank}
-        Score : {self.__score}\n"""
+        Classement Elo : {self.rating:.0f}
+        Score : {self.get_player_score:g}\n"""
 
 
 if __name__ == '__main__':
@@ -1,63 +1,123 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import os
-
 from model.player import Player
+from model.elo import DEFAULT_RATING
 from model.interactDB import InteractDB
+from model.catalog import catalog
 
 
 def file_list_from_dir():
-    """Return list of files from 'data' directory
+    """Return list of database files from 'data' directory
     """
-    return os.listdir("data")
+    return catalog.refresh()
 
 
 class SavePlayer(InteractDB):
     """Class to save a player into player's database and from
     existing players in a tournament.
     """
-    def __init__(self, db_file_name):
+    def __init__(self, db_file_name, buffered=False):
         "Class constructor, inherit from PlayerDB class constructor"
-        super(SavePlayer, self).__init__(db_file_name)
+        super(SavePlayer, self).__init__(db_file_name, buffered)
 
     def save_player_into_db(self, player):
         """Saves player's infos into DB.
         """
         player_data = player.get_player_saved_info
         id_player = player_data["id_player"]
-        id_from_db = self.players.get(self.info["id_player"] == id_player)
-        if not id_from_db:
-            self.players.insert(player_data)
+        if id_player not in self.player_index:
+            self.player_index.insert(player_data)
+            self.commit()
         else:
             raise Warning(f"Joueur ({id_player}) déjà présent dans la base de données.")
 
+    def save_players_into_db(self, players):
+        """Saves several players' infos into DB in a single write. Players
+        already present in the DB are skipped, their ids are returned.
+        """
+        players = list(players)
+        known_ids = self.player_index.existing(
+            player.get_player_saved_info["id_player"] for player in players)
+        players_data = []
+        failed_ids = []
+        for player in players:
+            player_data = player.get_player_saved_info
+            id_player = player_data["id_player"]
+            if id_player in known_ids:
+                failed_ids.append(id_player)
+            else:
+                known_ids.add(id_player)
+                players_data.append(player_data)
+
+        if players_data:
+            self.player_index.insert_multiple(players_data)
+            self.commit()
+        return failed_ids
+
+    def update_ratings_into_db(self, players):
+        """Write the Elo rating of several players into DB in a single
+        write. Return the ids of the players absent from the DB.
+        """
+        ratings = {player.id_player: player.rating for player in players}
+        known_ids = self.player_index.existing(ratings)
+        updates = {id_player: {"rating": rating} for id_player, rating in ratings.items() if id_player in known_ids}
+        if updates:
+            self.player_index.update_multiple(updates)
+            self.commit()
+        return [id_player for id_player in ratings if id_player not in known_ids]
+
 
 class LoadPlayer(InteractDB):
     """Class to load a player from player's database and
     send the data to the controller to make a Player instance.
     """
-    def __init__(self, db_file_name):
+    def __init__(self, db_file_name, buffered=False):
         """Class constructor, inherit from SavePlayer init method"""
-        super(LoadPlayer, self).__init__(db_file_name)
+        super(LoadPlayer, self).__init__(db_file_name, buffered)
 
     def list_player_from_db(self):
         "Print players data from the database."
-        players_info = self.players.search(self.info["last_name"].exists())
+        players_info = self.handle.list_players()
         return players_info
 
-    def load_player_from_db(self, player_id):
-        "Get a player's informations from db to return a Player instance"
-        player_exists = self.players.get(self.info["id_player"] == player_id)
+    def load_player_from_db(self, player_id, table=None):
+        """Get a player's informations from db to return a Player instance,
+        added to the given PlayerTable."""
+        player_exists = self.player_index.get(player_id)
         if player_exists:
             return Player(l_name=player_exists["last_name"],
                           f_name=player_exists["first_name"],
                           date_birth=player_exists["date_birth"],
                           gender=player_exists["gender"],
-                          rank=player_exists["rank"])
+                          rank=player_exists["rank"],
+                          table=table,
+                          rating=player_exists.get("rating", DEFAULT_RATING))
         else:
             raise Warning(f"Joueur ({player_id}) absent de la base de données. Rappel du format: '1000_ABCDEF'")
 
+    def load_players_from_db(self, players_id, table=None):
+        """Get several players' informations from db. Return a tuple with the
+        list of Player instances, added to the given PlayerTable, and the
+        list of ids absent from the db.
+        """
+        found = self.player_index.get_multiple(players_id)
+        players = []
+        missing_ids = []
+        for player_id in players_id:
+            player_data = found.get(player_id)
+            if player_data:
+                players.append(Player(l_name=player_data["last_name"],
+                                      f_name=player_data["first_name"],
+                                      date_birth=player_data["date_birth"],
+                                      gender=player_data["gender"],
+                                      rank=player_data["rank"],
+                                      table=table,
+                                      rating=player_data.get("rating", DEFAULT_RATING)))
+            else:
+                missing_ids.append(player_id)
+        return (players, missing_ids)
+
 
 if __name__ == '__main__':
 
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import csv
+import json
+import os
+from datetime import datetime as dt
+
+
+PLAYER_FIELDS = ("last_name", "first_name", "date_birth", "gender", "rank")
+
+
+def read_player_rows(path):
+    """Return the rows of a CSV or JSON players file, as a list of tuples
+    (location, {field: value}) whose values are not checked yet. A CSV file
+    starts with a header line naming its columns : last_name, first_name,
+    date_birth, gender, rank and optionally rating, separated by a comma or
+    a semicolon. A JSON file is a list of objects with the same keys, such
+    as the players saved in a database file. Raise a Warning if the file
+    can't be read.
+    """
+    try:
+        with open(path, encoding="utf-8-sig", newline="") as players_file:
+            if os.path.splitext(path)[1].lower() == ".json":
+                data = json.load(players_file)
+                if not isinstance(data, list):
+                    raise Warning("Fichier JSON invalide : liste attendue.")
+                return [(f"Élément {nb}", row if isinstance(row, dict) else {}) for nb, row in enumerate(data, 1)]
+
+            sample = players_file.read(4096)
+            players_file.seek(0)
+            try:
+                dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+            except csv.Error:
+                dialect = csv.excel
+            reader = csv.DictReader(players_file, dialect=dialect)
+            return [(f"Ligne {reader.line_num}", {key.strip(): value for key, value in row.items() if key})
+                    for row in reader if any((value or "").strip() for value in row.values() if value)]
+    except FileNotFoundError:
+        raise Warning(f"Fichier inexistant : {path}")
+    except (ValueError, UnicodeDecodeError) as err:
+        raise Warning(f"Fichier illisible : {err}")
+
+
+def check_player_rows(rows):
+    """Check every row of a players file. Return a tuple with the list of
+    the players' informations, ready for Tournament.add_saved_players, and
+    the list of errors, one message per faulty row."""
+    players_info = []
+    errors = []
+    for location, row in rows:
+        missing = [field for field in PLAYER_FIELDS if not str(row.get(field) or "").strip()]
+        if missing:
+            errors.append(f"{location} : champ(s) manquant(s) : {', '.join(missing)}.")
+            continue
+        info = {field: str(row[field]).strip() for field in PLAYER_FIELDS}
+        try:
+            dt.strptime(info["date_birth"], "%d/%m/%Y")
+        except ValueError:
+            errors.append(f"{location} : date de naissance invalide ({info['date_birth']}).")
+            continue
+        if info["gender"].upper() not in ("M", "F"):
+            errors.append(f"{location} : sexe invalide ({info['gender']}), attendu M ou F.")
+            continue
+        try:
+            info["rank"] = int(info["rank"])
+            if info["rank"] <= 0:
+                raise ValueError
+        except ValueError:
+            errors.append(f"{location} : rang invalide ({row['rank']}), entier strictement positif attendu.")
+            continue
+        if str(row.get("rating") or "").strip():
+            try:
+                info["rating"] = float(row["rating"])
+            except ValueError:
+                errors.append(f"{location} : classement Elo invalide ({row['rating']}).")
+                continue
+        players_info.append(info)
+    return (players_info, errors)
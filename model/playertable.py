@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from array import array
+
+from model.elo import DEFAULT_RATING
+
+
+class PlayerTable:
+    """Column-oriented table of chess players : one compact array per
+    field, one row per player. Names, birth dates and genders are interned,
+    their columns hold string ids. A row takes about 40 bytes, Player
+    instances are light views onto a row. The Elo rating is kept apart
+    from the rank, which is typed in by hand.
+    """
+    def __init__(self):
+        """Class constructor, makes an empty table."""
+        self.__strings = []
+        self.__string_ids = {}
+        self.last_names = array("I")
+        self.first_names = array("I")
+        self.birth_dates = array("I")
+        self.birth_years = array("H")
+        self.genders = array("I")
+        self.ranks = array("q")
+        self.scores = array("d")
+        self.ratings = array("d")
+
+    def __len__(self):
+        return len(self.ranks)
+
+    def intern(self, string):
+        """Return the id of a string, adding it to the table's strings."""
+        string_id = self.__string_ids.get(string)
+        if string_id is None:
+            string_id = len(self.__strings)
+            self.__strings.append(string)
+            self.__string_ids[string] = string_id
+        return string_id
+
+    def get_string(self, string_id):
+        return self.__strings[string_id]
+
+    @staticmethod
+    def birth_year(date_birth):
+        """Return the year of a 'JJ/MM/AAAA' date, or 0."""
+        year = date_birth[-4:]
+        return int(year) if year.isdigit() else 0
+
+    def add_row(self, l_name, f_name, date_birth, gender, rank, score=0, rating=DEFAULT_RATING):
+        """Add a player's row. Return the row's index."""
+        self.last_names.append(self.intern(l_name))
+        self.first_names.append(self.intern(f_name))
+        self.birth_dates.append(self.intern(date_birth))
+        self.birth_years.append(self.birth_year(date_birth))
+        self.genders.append(self.intern(gender))
+        self.ranks.append(rank)
+        self.scores.append(score)
+        self.ratings.append(rating)
+        return len(self.ranks) - 1
+
+    def set_ratings(self, ratings):
+        """Replace the ratings column by a NumPy array of floats."""
+        self.ratings = array("d", ratings.astype(float).tobytes())
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import csv
+import json
+import os
+
+
+RESULT_CODES = {
+    "j1": "J1", "1-0": "J1",
+    "j2": "J2", "0-1": "J2",
+    "nul": "nul", "1/2-1/2": "nul", "½-½": "nul", "0.5-0.5": "nul",
+}
+
+RESULT_SCORES = {"J1": [1, 0], "J2": [0, 1], "nul": [0.5, 0.5]}
+
+
+def read_result_rows(path):
+    """Return the rows of a CSV or JSON results file, as a list of tuples
+    (location, board, result) whose board and result are not checked yet.
+    A CSV file has one row per board, board number then result, separated
+    by a semicolon if the first line has one, by a comma otherwise, with an
+    optional header line. A JSON file is a list of {"board": ...,
+    "result": ...} objects or a {board: result} object. Raise a Warning if
+    the file can't be read.
+    """
+    try:
+        with open(path, encoding="utf-8-sig", newline="") as results_file:
+            if os.path.splitext(path)[1].lower() == ".json":
+                return json_rows(json.load(results_file))
+
+            delimiter = ","
+            for line in results_file:
+                if line.strip():
+                    delimiter = ";" if ";" in line else ","
+                    break
+            results_file.seek(0)
+            rows = []
+            reader = csv.reader(results_file, delimiter=delimiter)
+            for row in reader:
+                if not any(cell.strip() for cell in row):
+                    continue
+                # Trailing empty cells, such as in '1;J1;', are ignored.
+                while len(row) > 2 and not row[-1].strip():
+                    row.pop()
+                if len(row) == 2:
+                    rows.append((f"Ligne {reader.line_num}", row[0], row[1]))
+                else:
+                    rows.append((f"Ligne {reader.line_num}", None, None))
+            # Optional header line, such as 'échiquier;résultat'.
+            if rows and rows[0][1] is not None and not rows[0][1].strip().isdigit() \
+                    and rows[0][2].strip().lower() not in RESULT_CODES:
+                rows = rows[1:]
+            return rows
+    except FileNotFoundError:
+        raise Warning(f"Fichier inexistant : {path}")
+    except (ValueError, UnicodeDecodeError) as err:
+        raise Warning(f"Fichier illisible : {err}")
+
+
+def json_rows(data):
+    if isinstance(data, dict):
+        return [(f"Échiquier {board}", board, result) for board, result in data.items()]
+    if not isinstance(data, list):
+        raise Warning("Fichier JSON invalide : liste ou objet attendu.")
+    rows = []
+    for nb, row in enumerate(data, 1):
+        if isinstance(row, dict):
+            rows.append((f"Élément {nb}", row.get("board"), row.get("result")))
+        else:
+            rows.append((f"Élément {nb}", None, None))
+    return rows
+
+
+def check_result_rows(rows, match_list, complete=True):
+    """Check every row against the games of a round. Return a tuple with
+    the {game index: result} dict of the valid rows, without the results
+    already entered, and the list of errors, one message per faulty row.
+    If complete is True, every game must have a result, in the file or
+    already entered.
+    """
+    nb_boards = len(match_list)
+    results = {}
+    errors = []
+    for location, board, result in rows:
+        if board is None or result is None:
+            errors.append(f"{location} : numéro d'échiquier et résultat attendus.")
+            continue
+        try:
+            board_nb = int(str(board).strip())
+        except ValueError:
+            errors.append(f"{location} : numéro d'échiquier invalide ({board}).")
+            continue
+        result_code = RESULT_CODES.get(str(result).strip().lower())
+        if not 1 <= board_nb <= nb_boards:
+            errors.append(f"{location} : l'échiquier {board_nb} n'existe pas (1 à {nb_boards}).")
+        elif result_code is None:
+            errors.append(f"{location} : résultat invalide ({result}), attendu J1, J2 ou nul.")
+        elif board_nb - 1 in results:
+            errors.append(f"{location} : résultat de l'échiquier {board_nb} déjà donné.")
+        elif match_list[board_nb - 1][1] not in ([0, 0], RESULT_SCORES[result_code]):
+            errors.append(f"{location} : un autre résultat a déjà été saisi pour l'échiquier {board_nb}.")
+        else:
+            results[board_nb - 1] = result_code
+
+    missing = [str(nb + 1) for nb, game in enumerate(match_list) if nb not in results and game[1] == [0, 0]]
+    if missing and complete:
+        errors.append(f"Résultat manquant pour le(s) échiquier(s) : {', '.join(missing)}.")
+    results = {nb: result for nb, result in results.items() if match_list[nb][1] == [0, 0]}
+    return (results, errors)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+
+class ResultsMatrix:
+    """Results of a tournament held in two NumPy arrays, one row per
+    player slot and one column per round : the opponent's slot of each
+    game (NO_OPPONENT for a bye or a round not played) and the points
+    scored. Tie-breaks are computed from them in one vectorized pass,
+    O(n * r) for n players and r rounds. Both dimensions double their
+    capacity when they are full.
+    """
+    NO_OPPONENT = -1
+    TIE_BREAKS = ("buchholz", "sonneborn_berger", "progressive")
+
+    def __init__(self, nb_players=0):
+        """Class constructor, takes the number of players."""
+        self.nb_players = 0
+        self.nb_rounds = 0
+        self.__opponents = np.full((1, 1), self.NO_OPPONENT, dtype=np.int32)
+        self.__points = np.zeros((1, 1))
+        self.resize(nb_players)
+
+    def __grow(self, nb_players, nb_rounds):
+        rows, columns = self.__points.shape
+        if nb_players <= rows and nb_rounds <= columns:
+            return
+        shape = (rows if nb_players <= rows else max(nb_players, 2 * rows),
+                 columns if nb_rounds <= columns else max(nb_rounds, 2 * columns))
+        opponents = np.full(shape, self.NO_OPPONENT, dtype=np.int32)
+        opponents[:rows, :columns] = self.__opponents
+        points = np.zeros(shape)
+        points[:rows, :columns] = self.__points
+        self.__opponents = opponents
+        self.__points = points
+
+    def resize(self, nb_players):
+        """Make room for nb_players players."""
+        self.__grow(nb_players, self.nb_rounds)
+        self.nb_players = max(self.nb_players, nb_players)
+
+    def add_round(self, pairs, bye=None, bye_score=0):
+        """Add a round's column, from the (slot1, slot2) pairs of its games
+        and the slot of the player getting a bye, if any. Return the round's
+        number, from 0.
+        """
+        round_nb = self.nb_rounds
+        self.__grow(self.nb_players, round_nb + 1)
+        self.nb_rounds += 1
+        if pairs:
+            slots1, slots2 = np.array(pairs, dtype=np.int32).T
+            self.__opponents[slots1, round_nb] = slots2
+            self.__opponents[slots2, round_nb] = slots1
+        if bye is not None:
+            self.__points[bye, round_nb] = bye_score
+        return round_nb
+
+    def set_result(self, round_nb, slot1, slot2, score1, score2):
+        self.__points[slot1, round_nb] = score1
+        self.__points[slot2, round_nb] = score2
+
+    @property
+    def get_opponents(self):
+        return self.__opponents[:self.nb_players, :self.nb_rounds]
+
+    @property
+    def get_points(self):
+        return self.__points[:self.nb_players, :self.nb_rounds]
+
+    def tie_breaks(self):
+        """Return a dict of arrays, indexed by slot, of the players' :
+        - buchholz : sum of their opponents' scores ;
+        - sonneborn_berger : sum of the opponents' scores weighted by the
+        points scored against them ;
+        - progressive : sum of their score after each round.
+        A bye counts as a game against an opponent with no points.
+        """
+        opponents = self.get_opponents
+        points = self.get_points
+        totals = points.sum(axis=1)
+        played = opponents != self.NO_OPPONENT
+        opponent_totals = np.where(played, totals[np.where(played, opponents, 0)], 0)
+        return {"buchholz": opponent_totals.sum(axis=1),
+                "sonneborn_berger": (opponent_totals * np.where(played, points, 0)).sum(axis=1),
+                "progressive": points.cumsum(axis=1).sum(axis=1)}
+
+    def ranking(self, ranks):
+        """Return the slots sorted by score, then by tie-breaks, then by
+        the players' ranks given by slot."""
+        tie_breaks = self.tie_breaks()
+        keys = [np.asarray(ranks)]
+        keys.extend(-tie_breaks[name] for name in reversed(self.TIE_BREAKS))
+        keys.append(-self.get_points.sum(axis=1))
+        return np.lexsort(keys).tolist()
+
+    def serialize_tie_breaks(self):
+        """Return the tie-breaks as lists of floats, to be saved."""
+        return {name: values.tolist() for name, values in self.tie_breaks().items()}
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from model.tournament import Tournament
+from model.elo import expected_scores
+
+
+DRAW_RATE = 0.3
+
+
+def make_snapshot(tournament):
+    """Return a compact copy of a tournament's state : the players' ranks
+    and ratings, the results matrix, the byes of each round and whether the
+    last round is still being played. The live tournament is never used by
+    the simulations.
+    """
+    rounds = tournament.get_round_list
+    get_slot = tournament.standings.get_slot
+    return {"max_rounds": tournament.MAX_ROUND_LIST,
+            "ranks": np.array(tournament.player_table.ranks),
+            "ratings": np.array(tournament.player_table.ratings),
+            "opponents": tournament.results.get_opponents.copy(),
+            "points": tournament.results.get_points.copy(),
+            "byes": [None if rd.bye is None else get_slot(rd.bye) for rd in rounds],
+            "ongoing": bool(rounds) and rounds[-1].end_date is None}
+
+
+def replay(snapshot):
+    """Rebuild a tournament from a snapshot, without pairing the rounds
+    already made again."""
+    ranks = snapshot["ranks"]
+    tournament = Tournament("Simulation", "", "", "", "",
+                            max_players=len(ranks), max_rounds=snapshot["max_rounds"])
+    tournament.add_saved_players([{"last_name": "", "first_name": "", "date_birth": "", "gender": "",
+                                   "rank": rank, "rating": rating}
+                                  for rank, rating in zip(ranks.tolist(), snapshot["ratings"].tolist())])
+
+    slots = np.arange(len(ranks))
+    nb_rounds = len(snapshot["byes"])
+    for round_nb, bye in enumerate(snapshot["byes"]):
+        opponents = snapshot["opponents"][:, round_nb]
+        points = snapshot["points"][:, round_nb]
+        first = slots[opponents > slots]
+        second = opponents[first]
+        ongoing = snapshot["ongoing"] and round_nb == nb_rounds - 1
+        tournament.add_played_round(f"Round {round_nb + 1}",
+                                    zip(first.tolist(), second.tolist()),
+                                    zip(points[first].tolist(), points[second].tolist()),
+                                    bye,
+                                    None if ongoing else "Simulation")
+    return tournament
+
+
+def play_games(tournament, roundp, ratings, rng):
+    """Draw the results of the games of a round not played yet, then end
+    the round. A player's chances of winning, drawing and losing keep their
+    expected score given by the Elo formula, draws being more likely
+    between players of the same strength.
+    """
+    get_slot = tournament.standings.get_slot
+    pending = [(nb, game) for nb, game in enumerate(roundp.get_match_list) if game[1] == [0, 0]]
+    if pending:
+        slots1 = np.array([get_slot(game[0][0]) for nb, game in pending])
+        slots2 = np.array([get_slot(game[0][1]) for nb, game in pending])
+        expected = expected_scores(ratings[slots1], ratings[slots2])
+        half_draw = DRAW_RATE * np.minimum(expected, 1 - expected)
+        draws = rng.random(len(pending))
+        results = np.where(draws < expected - half_draw, "J1", np.where(draws < expected + half_draw, "nul", "J2"))
+        for (nb, game), result in zip(pending, results.tolist()):
+            tournament.play_round(roundp, game, result, nb)
+    tournament.end_round(roundp, "Simulation")
+
+
+def run_simulations(snapshot, nb_simulations, seed):
+    """Play the remaining rounds of the tournament nb_simulations times.
+    Return the number of wins and podiums of each player, and the number of
+    times each player ended on each score, counted in half points.
+    """
+    rng = np.random.default_rng(seed)
+    nb_players = len(snapshot["ranks"])
+    wins = np.zeros(nb_players, dtype=np.int64)
+    podiums = np.zeros(nb_players, dtype=np.int64)
+    scores = np.zeros((nb_players, 2 * snapshot["max_rounds"] + 1), dtype=np.int64)
+
+    for _ in range(nb_simulations):
+        tournament = replay(snapshot)
+        rounds = tournament.get_round_list
+        if rounds and rounds[-1].end_date is None:
+            play_games(tournament, rounds[-1], snapshot["ratings"], rng)
+        while len(rounds) < tournament.MAX_ROUND_LIST:
+            tournament.add_round_to_list(f"Round {len(rounds) + 1}")
+            play_games(tournament, rounds[-1], snapshot["ratings"], rng)
+
+        ranking = tournament.results.ranking(snapshot["ranks"])
+        wins[ranking[0]] += 1
+        podiums[ranking[:3]] += 1
+        half_points = np.minimum((np.array(tournament.player_table.scores) * 2).astype(int), scores.shape[1] - 1)
+        scores[np.arange(nb_players), half_points] += 1
+    return (wins, podiums, scores)
+
+
+def simulate(tournament, nb_simulations=1000, max_workers=None, seed=None):
+    """Simulate the end of a tournament nb_simulations times, split
+    between the processes of a ProcessPoolExecutor. Return, for every
+    player, the probabilities to win the tournament, to end on the podium
+    and to end on each score, sorted by chances of winning.
+    """
+    snapshot = make_snapshot(tournament)
+    nb_chunks = max(1, min(max_workers or os.cpu_count() or 1, nb_simulations))
+    sizes = [nb_simulations // nb_chunks + (chunk < nb_simulations % nb_chunks) for chunk in range(nb_chunks)]
+    seeds = np.random.SeedSequence(seed).spawn(nb_chunks)
+    with ProcessPoolExecutor(max_workers=nb_chunks) as executor:
+        counts = list(executor.map(run_simulations, [snapshot] * nb_chunks, sizes, seeds))
+
+    wins = sum(count[0] for count in counts) / nb_simulations
+    podiums = sum(count[1] for count in counts) / nb_simulations
+    scores = sum(count[2] for count in counts) / nb_simulations
+    report = []
+    for slot, player in enumerate(tournament.get_player_list):
+        report.append({"slot": slot,
+                       "id_player": player.id_player,
+                       "name": f"{player.first_name} {player.last_name}",
+                       "win": float(wins[slot]),
+                       "podium": float(podiums[slot]),
+                       "scores": {half_points / 2: float(probability)
+                                  for half_points, probability in enumerate(scores[slot]) if probability}})
+    return sorted(report, key=lambda line: (-line["win"], -line["podium"], line["slot"]))
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import sqlite3
+
+from model.dateindex import date_key
+
+
+SQLITE_EXTENSIONS = (".sqlite", ".sqlite3", ".db")
+
+
+class SQLitePlayerIndex:
+    """Players table of a SQLite database, with the same interface as
+    the TinyDB PlayerIndex. id_player is the table's primary key.
+    """
+    def __init__(self, connection):
+        """Class constructor, takes the sqlite3 connection."""
+        self.connection = connection
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS players (id_player TEXT PRIMARY KEY, last_name TEXT, data TEXT NOT NULL)")
+
+    def __contains__(self, id_player):
+        cursor = self.connection.execute("SELECT 1 FROM players WHERE id_player = ?", (id_player,))
+        return cursor.fetchone() is not None
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM players").fetchone()[0]
+
+    def all(self):
+        return [json.loads(data) for (data,) in
+                self.connection.execute("SELECT data FROM players ORDER BY rowid")]
+
+    def ids(self):
+        return [id_player for (id_player,) in self.connection.execute("SELECT id_player FROM players")]
+
+    def existing(self, players_id):
+        """Return the subset of players_id present in the table."""
+        players_id = list(players_id)
+        found = set()
+        # SQLite limits the number of variables of a query.
+        for start in range(0, len(players_id), 500):
+            chunk = players_id[start:start + 500]
+            marks = ", ".join("?" * len(chunk))
+            cursor = self.connection.execute(f"SELECT id_player FROM players WHERE id_player IN ({marks})", chunk)
+            found.update(id_player for (id_player,) in cursor)
+        return found
+
+    def get(self, id_player):
+        """Return the player's data, or None if id_player is unknown."""
+        cursor = self.connection.execute("SELECT data FROM players WHERE id_player = ?", (id_player,))
+        row = cursor.fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_multiple(self, players_id):
+        """Return the data of the known players_id, keyed on id_player."""
+        players = {}
+        for id_player in players_id:
+            player_data = self.get(id_player)
+            if player_data is not None:
+                players[id_player] = player_data
+        return players
+
+    def insert(self, player_data):
+        self.insert_multiple([player_data])
+
+    def insert_multiple(self, players_data):
+        self.connection.executemany(
+            "INSERT INTO players (id_player, last_name, data) VALUES (?, ?, ?)",
+            [(data["id_player"], data.get("last_name"), json.dumps(data)) for data in players_data])
+
+    def update(self, id_player, fields):
+        player_data = self.get(id_player)
+        if player_data is None:
+            raise KeyError(id_player)
+        player_data.update(fields)
+        self.connection.execute(
+            "UPDATE players SET id_player = ?, last_name = ?, data = ? WHERE id_player = ?",
+            (player_data["id_player"], player_data.get("last_name"), json.dumps(player_data), id_player))
+
+    def update_multiple(self, updates):
+        """Update several players in a single statement. updates maps each
+        id_player to the fields to update. The ids are not changed.
+        """
+        self.connection.executemany(
+            "UPDATE players SET data = json_patch(data, ?) WHERE id_player = ?",
+            [(json.dumps(fields), id_player) for id_player, fields in updates.items()])
+
+    def remove(self, id_player):
+        self.connection.execute("DELETE FROM players WHERE id_player = ?", (id_player,))
+
+
+class SQLiteRowIndex:
+    """Table of a SQLite database whose rows belong to a tournament, with
+    the same interface as the TinyDB TournamentRowIndex. The tournament
+    name and the key fields make the table's primary key.
+    """
+    def __init__(self, connection, table, key_fields=()):
+        """Class constructor, takes the sqlite3 connection, the table's name
+        and the names of the fields identifying a row inside a tournament.
+        """
+        self.connection = connection
+        self.table = table
+        self.key_fields = key_fields
+        columns = "".join(f"{field} INTEGER NOT NULL, " for field in key_fields)
+        primary_key = ", ".join(("tournament",) + key_fields)
+        self.connection.execute(f"CREATE TABLE IF NOT EXISTS {table} (tournament TEXT NOT NULL, {columns}"
+                                f"data TEXT NOT NULL, PRIMARY KEY ({primary_key}))")
+        self.__where = " AND ".join(f"{field} = ?" for field in ("tournament",) + key_fields)
+        self.__order = ", ".join(key_fields) or "tournament"
+
+    def row_key(self, row):
+        return tuple(row[field] for field in self.key_fields)
+
+    def __contains__(self, tournament):
+        cursor = self.connection.execute(f"SELECT 1 FROM {self.table} WHERE tournament = ? LIMIT 1", (tournament,))
+        return cursor.fetchone() is not None
+
+    def all(self):
+        return [json.loads(data) for (data,) in
+                self.connection.execute(f"SELECT data FROM {self.table} ORDER BY rowid")]
+
+    def keys(self, tournament):
+        fields = ", ".join(self.key_fields) or "NULL"
+        cursor = self.connection.execute(f"SELECT {fields} FROM {self.table} WHERE tournament = ?", (tournament,))
+        return {tuple(row) if self.key_fields else () for row in cursor}
+
+    def get(self, tournament, key=()):
+        cursor = self.connection.execute(f"SELECT data FROM {self.table} WHERE {self.__where}", (tournament,) + key)
+        row = cursor.fetchone()
+        return json.loads(row[0]) if row else None
+
+    def rows(self, tournament):
+        """Return the rows of a tournament, sorted by key."""
+        cursor = self.connection.execute(
+            f"SELECT data FROM {self.table} WHERE tournament = ? ORDER BY {self.__order}", (tournament,))
+        return [json.loads(data) for (data,) in cursor]
+
+    def upsert(self, row):
+        """Insert the row, or replace the stored row if it differs. Return
+        True if something has been written.
+        """
+        key = self.row_key(row)
+        if self.get(row["tournament"], key) == row:
+            return False
+        columns = ", ".join(("tournament",) + self.key_fields + ("data",))
+        marks = ", ".join("?" * (len(self.key_fields) + 2))
+        self.connection.execute(f"INSERT OR REPLACE INTO {self.table} ({columns}) VALUES ({marks})",
+                                (row["tournament"],) + key + (json.dumps(row),))
+        return True
+
+    def upsert_multiple(self, rows):
+        """Upsert several rows. Return the number of rows written."""
+        return sum(self.upsert(row) for row in rows)
+
+    def remove(self, tournament, keys=None):
+        """Remove the given rows of a tournament, or all of them."""
+        if keys is None:
+            self.connection.execute(f"DELETE FROM {self.table} WHERE tournament = ?", (tournament,))
+        else:
+            self.connection.executemany(f"DELETE FROM {self.table} WHERE {self.__where}",
+                                        [(tournament,) + tuple(key) for key in keys])
+
+
+class SQLiteDateIndex:
+    """Dates of the tournaments of a SQLite database, with the same
+    interface as TournamentDateIndex. beg_date and end_date are stored as
+    sortable keys in indexed columns.
+    """
+    def __init__(self, connection):
+        """Class constructor, takes the sqlite3 connection."""
+        self.connection = connection
+        self.connection.execute("CREATE TABLE IF NOT EXISTS tournament_dates "
+                                "(tournament TEXT PRIMARY KEY, beg_date TEXT, end_date TEXT)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS tournament_beg_date ON tournament_dates (beg_date)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS tournament_end_date ON tournament_dates (end_date)")
+
+    def update(self, tournament_info):
+        """Add a tournament to the index, or update its dates."""
+        self.connection.execute(
+            "INSERT OR REPLACE INTO tournament_dates (tournament, beg_date, end_date) VALUES (?, ?, ?)",
+            (tournament_info["name"],
+             date_key(tournament_info.get("beg_date")),
+             date_key(tournament_info.get("end_date"))))
+
+    def between(self, start, end, field="beg_date"):
+        """Return the names of the tournaments whose beg_date (or end_date)
+        is between the start and end keys, both included."""
+        column = "beg_date" if field == "beg_date" else "end_date"
+        cursor = self.connection.execute(
+            f"SELECT tournament FROM tournament_dates WHERE {column} BETWEEN ? AND ? ORDER BY {column}, tournament",
+            (start, end))
+        return [name for (name,) in cursor]
+
+    def unfinished(self):
+        cursor = self.connection.execute(
+            "SELECT tournament FROM tournament_dates WHERE end_date IS NULL ORDER BY tournament")
+        return [name for (name,) in cursor]
+
+
+class SQLiteHandle:
+    """Database of one SQLite data file, shared like the TinyDB
+    DatabaseHandle. Writes are grouped in a transaction committed by
+    flush().
+    """
+    def __init__(self, db_dir_path):
+        """Class constructor, takes the path of the data file."""
+        self.db_dir_path = db_dir_path
+        self.connection = sqlite3.connect(db_dir_path)
+        self.player_index = SQLitePlayerIndex(self.connection)
+        self.header_index = SQLiteRowIndex(self.connection, "tournaments")
+        self.opponents_index = SQLiteRowIndex(self.connection, "opponents")
+        self.tie_break_index = SQLiteRowIndex(self.connection, "tie_breaks")
+        self.entrant_index = SQLiteRowIndex(self.connection, "tournament_players", ("slot",))
+        self.round_index = SQLiteRowIndex(self.connection, "rounds", ("round",))
+        self.match_index = SQLiteRowIndex(self.connection, "match", ("round", "game"))
+        self.date_index = SQLiteDateIndex(self.connection)
+        if not self.connection.execute("SELECT 1 FROM tournament_dates LIMIT 1").fetchone():
+            for tournament_info in self.list_tournament_infos():
+                self.date_index.update(tournament_info)
+        self.connection.commit()
+
+    def list_players(self):
+        return self.player_index.all()
+
+    def list_headers(self):
+        return self.header_index.all()
+
+    def list_tournament_infos(self):
+        return [header["tournament_info"] for header in self.list_headers()]
+
+    def iter_headers(self):
+        """Yield the tournament_info dict of every tournament, one row at a
+        time."""
+        for (data,) in self.connection.execute("SELECT data FROM tournaments ORDER BY rowid"):
+            yield json.loads(data)["tournament_info"]
+
+    def get_legacy_tournament(self, tournament_name):
+        """SQLite files never hold tournaments in the old single-document
+        format."""
+        return None
+
+    def list_legacy_tournaments(self):
+        return []
+
+    def remove_legacy_tournament(self, tournament_name):
+        pass
+
+    def is_outdated(self):
+        """SQLite reads the file on every query : the handle only needs to
+        be opened again if the file has been deleted."""
+        return not os.path.exists(self.db_dir_path)
+
+    def flush(self):
+        self.connection.commit()
+
+    def close(self):
+        self.connection.commit()
+        self.connection.close()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from bisect import bisect_left, insort
+
+
+class SortedEntries:
+    """Sorted list of entries split into blocks of at most 2 * BLOCK_SIZE
+    entries, with the last entry of each block kept apart. An entry is
+    found by bisecting the blocks' last entries, then the block, so adding
+    or removing an entry is O(log n), plus the shifting of a bounded block.
+    """
+    BLOCK_SIZE = 256
+
+    def __init__(self, entries=()):
+        entries = sorted(entries)
+        self.__blocks = [entries[start:start + self.BLOCK_SIZE]
+                         for start in range(0, len(entries), self.BLOCK_SIZE)]
+        self.__maxes = [block[-1] for block in self.__blocks]
+        self.__len = len(entries)
+
+    def __len__(self):
+        return self.__len
+
+    def __iter__(self):
+        for block in self.__blocks:
+            yield from block
+
+    def add(self, entry):
+        if not self.__blocks:
+            self.__blocks.append([entry])
+            self.__maxes.append(entry)
+        else:
+            nb = min(bisect_left(self.__maxes, entry), len(self.__blocks) - 1)
+            block = self.__blocks[nb]
+            insort(block, entry)
+            self.__maxes[nb] = block[-1]
+            if len(block) > 2 * self.BLOCK_SIZE:
+                self.__blocks.insert(nb + 1, block[self.BLOCK_SIZE:])
+                del block[self.BLOCK_SIZE:]
+                self.__maxes.insert(nb, block[-1])
+        self.__len += 1
+
+    def remove(self, entry):
+        nb = bisect_left(self.__maxes, entry)
+        block = self.__blocks[nb]
+        del block[bisect_left(block, entry)]
+        if block:
+            self.__maxes[nb] = block[-1]
+        else:
+            del self.__blocks[nb]
+            del self.__maxes[nb]
+        self.__len -= 1
+
+    def index(self, entry):
+        nb = bisect_left(self.__maxes, entry)
+        return sum(len(block) for block in self.__blocks[:nb]) + bisect_left(self.__blocks[nb], entry)
+
+
+class Standings:
+    """Standings of a tournament's players, kept sorted by score (then
+    rank), by rank and by name. The orderings are updated when a player's
+    score or rank changes instead of sorting the whole list at each
+    display : update() is O(log n), reading an ordering is O(n).
+    Players are identified by their slot, their index in the tournament's
+    player list, which is shared with the tournament.
+    """
+    ORDERS = ("score", "rank", "name")
+
+    def __init__(self, player_list=()):
+        """Class constructor, takes the tournament's player list."""
+        self.player_list = player_list
+        self.__slots = {}
+        self.__entries = {order: SortedEntries() for order in self.ORDERS}
+        self.__keys = []
+        self.add_new_players()
+
+    @staticmethod
+    def make_keys(player, slot):
+        return {"score": (-player.get_player_score, player.rank, slot),
+                "rank": (player.rank, slot),
+                "name": (player.last_name, player.first_name, slot)}
+
+    def __len__(self):
+        return len(self.__keys)
+
+    def add_new_players(self):
+        """Add the players appended to the player list since last call."""
+        for slot in range(len(self.__keys), len(self.player_list)):
+            player = self.player_list[slot]
+            self.__slots[id(player)] = slot
+            keys = self.make_keys(player, slot)
+            self.__keys.append(keys)
+            for order, key in keys.items():
+                self.__entries[order].add(key)
+
+    def get_slot(self, player):
+        return self.__slots[id(player)]
+
+    def update(self, player):
+        """Move a player whose score or rank has changed."""
+        slot = self.get_slot(player)
+        keys = self.make_keys(player, slot)
+        for order, key in keys.items():
+            if key != self.__keys[slot][order]:
+                self.__entries[order].remove(self.__keys[slot][order])
+                self.__entries[order].add(key)
+        self.__keys[slot] = keys
+
+    def slots(self, order="score"):
+        """Return the players' slots, sorted by score, rank or name."""
+        return [key[-1] for key in self.__entries[order]]
+
+    def players(self, order="score"):
+        return [self.player_list[slot] for slot in self.slots(order)]
+
+    def position(self, player):
+        """Return the player's place in the standings, from 1."""
+        slot = self.get_slot(player)
+        return self.__entries["score"].index(self.__keys[slot]["score"]) + 1
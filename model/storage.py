@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import atexit
+import json
+import mmap
+import os
+import time
+
+from tinydb.middlewares import CachingMiddleware
+
+
+def decode_json_at(data, start):
+    """Decode the JSON value starting at offset start of a memory-mapped
+    file. Return the value and the offset following it. The value is
+    decoded from a window growing until it holds the whole value.
+    """
+    decoder = json.JSONDecoder()
+    window = 1024
+    while True:
+        chunk = data[start:start + window].decode("utf-8", errors="ignore")
+        stripped = chunk.lstrip()
+        try:
+            value, end = decoder.raw_decode(stripped)
+            break
+        except ValueError:
+            if start + window >= len(data):
+                raise
+            window *= 2
+    consumed = len(chunk) - len(stripped) + end
+    return value, start + len(chunk[:consumed].encode("utf-8"))
+
+
+def skip_blanks(data, position):
+    while position < len(data) and data[position:position + 1] in b" \t\r\n":
+        position += 1
+    return position
+
+
+def iter_json_values(path, key):
+    """Yield every value stored under key in a JSON file, without parsing
+    the rest of the document. The file is memory-mapped and each value is
+    decoded on its own, so the memory used doesn't depend on the file's
+    size.
+    """
+    pattern = json.dumps(key).encode() + b":"
+
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return
+    with open(path, "rb") as db_file, mmap.mmap(db_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        position = data.find(pattern)
+        while position != -1:
+            value, end = decode_json_at(data, position + len(pattern))
+            yield value
+            position = data.find(pattern, end)
+
+
+def iter_json_table(path, table):
+    """Yield the documents of a table of a TinyDB JSON file, one at a
+    time, without parsing the other tables. Raise a ValueError if the file
+    isn't a TinyDB database.
+    """
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return
+    with open(path, "rb") as db_file, mmap.mmap(db_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        start = skip_blanks(data, 0)
+        if data[start:start + 1] != b"{":
+            raise ValueError(f"{path} n'est pas une base de données TinyDB.")
+        pattern = json.dumps(table).encode() + b":"
+        position = data.find(pattern)
+        if position == -1:
+            return
+        position = skip_blanks(data, position + len(pattern))
+        if data[position:position + 1] != b"{":
+            raise ValueError(f"Table {table} invalide dans {path}.")
+        position += 1
+        while True:
+            position = skip_blanks(data, position)
+            if data[position:position + 1] == b"}":
+                return
+            doc_id, position = decode_json_at(data, position)
+            position = skip_blanks(data, position)
+            if not isinstance(doc_id, str) or data[position:position + 1] != b":":
+                raise ValueError(f"Table {table} invalide dans {path}.")
+            document, position = decode_json_at(data, position + 1)
+            yield document
+            position = skip_blanks(data, position)
+            if data[position:position + 1] == b",":
+                position += 1
+            elif data[position:position + 1] != b"}":
+                raise ValueError(f"Table {table} invalide dans {path}.")
+
+
+class BufferedStorage(CachingMiddleware):
+    """TinyDB middleware keeping the database content in memory and
+    writing it to the underlying storage only when :
+    - flush() is called explicitly ;
+    - max_writes write operations are pending ;
+    - a write arrives max_delay seconds or more after the oldest pending
+    write ;
+    - the application exits.
+    A burst of inserts therefore costs a single file write. There is no
+    timer : the delay is only checked when a write arrives, so the last
+    writes of a burst stay in memory until the next write, an explicit
+    flush (the registry flushes every handle when the catalog is
+    refreshed) or the exit.
+    """
+    def __init__(self, storage_cls, max_writes=100, max_delay=5.0):
+        """Class constructor, takes the storage class to wrap (JSONStorage),
+        the maximum number of pending writes and the maximum delay (in
+        seconds) a write can stay pending while other writes arrive. A
+        max_writes of 1 makes the storage write-through.
+        """
+        super(BufferedStorage, self).__init__(storage_cls)
+        self.WRITE_CACHE_SIZE = max_writes
+        self.max_delay = max_delay
+        self._first_pending = None
+        self.path = None
+        self.mtime = None
+
+    def __call__(self, path, *args, **kwargs):
+        storage = super(BufferedStorage, self).__call__(path, *args, **kwargs)
+        self.path = path
+        self.mtime = os.stat(path).st_mtime_ns
+        atexit.register(self.flush)
+        return storage
+
+    @property
+    def pending_writes(self):
+        return self._cache_modified_count
+
+    def is_outdated(self):
+        """Return True if the file has been modified by someone else since
+        it was last read or written by this storage, or deleted.
+        """
+        try:
+            return os.stat(self.path).st_mtime_ns != self.mtime
+        except FileNotFoundError:
+            return True
+
+    def read(self):
+        if self.cache is None:
+            self.mtime = os.stat(self.path).st_mtime_ns
+        return super(BufferedStorage, self).read()
+
+    def write(self, data):
+        self.cache = data
+        self._cache_modified_count += 1
+        now = time.monotonic()
+        if self._first_pending is None:
+            self._first_pending = now
+
+        too_many = self._cache_modified_count >= self.WRITE_CACHE_SIZE
+        too_old = now - self._first_pending >= self.max_delay
+        if too_many or too_old:
+            self.flush()
+
+    def flush(self):
+        """Write the pending data to the underlying storage."""
+        if self._cache_modified_count > 0:
+            super(BufferedStorage, self).flush()
+            try:
+                self.mtime = os.stat(self.path).st_mtime_ns
+            except FileNotFoundError:
+                # The file has been deleted : the handle is dropped by the
+                # registry and the file opened again.
+                self.mtime = None
+        self._first_pending = None
+
+    def close(self):
+        super(BufferedStorage, self).close()
+        atexit.unregister(self.flush)
@@ -1,85 +1,140 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from operator import attrgetter
 import datetime as dt
 
+from model.pairing import pair_players
+from model.opponents import OpponentMatrix
+from model.standings import Standings
+
 
 class Tour:
     """Class managiing the creation of the different rounds of a
     tournament. By default, the minimum number of tours is set to 4.
     Ideally, tour's name should be 'Round 1', 'Round 2', and so on.
+    The round keeps its last serialized form, and which of its games
+    changed since : serializing a round that didn't change costs nothing,
+    and a round whose results are entered only serializes these games.
     """
-    def __init__(self, name, player_list, not_first=False):
+    def __init__(self, name, player_list, not_first=False, opponents=None, standings=None):
         """Class constructor : ask for round name et player list from which
         the rounds are made. The not_first argument is needed for every rounds
-        but the first"""
+        but the first. opponents is the tournament's OpponentMatrix and
+        standings its Standings, both indexed by the players' index in
+        player_list."""
+        self.__serialized = None
+        self.__changed = True
+        self.__changed_games = set()
         self.name = name
         self.start_date = dt.datetime.today()
         self.player_list = player_list
         self.match_list = []
         self.end_date = None
         self.not_first = not_first
+        self.opponents = opponents if opponents is not None else OpponentMatrix(len(player_list))
+        self.standings = standings if standings is not None else Standings(player_list)
+        self.bye = None
+        self.BYE_SCORE = 1
+        self.ratings = None
+
+    @property
+    def start_date(self):
+        return self.__start_date
+
+    @start_date.setter
+    def start_date(self, start_date):
+        self.__start_date = start_date
+        self.__changed = True
+
+    @property
+    def end_date(self):
+        return self.__end_date
+
+    @end_date.setter
+    def end_date(self, end_date):
+        self.__end_date = end_date
+        self.__changed = True
+
+    @property
+    def ratings(self):
+        return self.__ratings
+
+    @ratings.setter
+    def ratings(self, ratings):
+        self.__ratings = ratings
+        self.__changed = True
+
+    def mark_changed(self, game_nb=None):
+        """Record that a game, given by its index, or the whole round when
+        game_nb is None, changed since the round was last serialized."""
+        if game_nb is None:
+            self.__serialized = None
+        else:
+            self.__changed_games.add(game_nb)
 
     def make_round(self, prev_round_list=None):
         """Make a round list out of the players list. The matchmaking relies
         on the swiss tournament system :
-        - On first round, players are sorted by their rank. The list is then
+        - On first round, players are taken by their rank. The list is then
         divided by half, with a superior list and an inferior list. Sup List's
         player meet Inf list's first player, and so on.
-        - On following rounds, players are sorted by score. 1st meets 2nd, 3rd
+        - On following rounds, players are taken by score. 1st meets 2nd, 3rd
         meets 4th, and so on. Unless a round already happened between the two
-        players.
+        players : pairs are then found by the pairing engine, which never
+        makes a rematch when a pairing without rematch exists.
+        With an odd number of players, the lowest placed player gets a bye,
+        unless they already got one in a previous round.
+        The players' order is read from the standings, which are kept
+        sorted : no sort is needed.
         """
         if not self.not_first:
-            sorted_player = sorted(self.player_list, key=attrgetter("rank"))
-            sorted_player_sup = sorted_player[0:int(len(sorted_player) / 2)]
-            sorted_player_inf = sorted_player[int(len(sorted_player) /
-                                                  2):len(sorted_player)]
-            for i in range(len(sorted_player_inf)):
-                J1 = sorted_player_sup[i]
-                J2 = sorted_player_inf[i]
-                versus = [J1, J2]
-                J1.set_already_met = J2
-                J2.set_already_met = J2
-                score = [0, 0]
-                match = (versus, score)
-                self.match_list.append(match)
+            sorted_slot = self.standings.slots("rank")
+            if len(sorted_slot) % 2:
+                self.set_bye(self.player_list[sorted_slot.pop()])
+            sorted_slot_sup = sorted_slot[0:int(len(sorted_slot) / 2)]
+            sorted_slot_inf = sorted_slot[int(len(sorted_slot) /
+                                              2):len(sorted_slot)]
+            for i in range(len(sorted_slot_inf)):
+                self.add_match(sorted_slot_sup[i], sorted_slot_inf[i])
         else:
-            import pdb; pdb.set_trace()
-            sorted_player = self.player_list[:]
-            sorted_player.sort(key=attrgetter("rank"))
-            sorted_player = sorted(sorted_player,
-                                   key=attrgetter("_Player__score"),
-                                   reverse=True)
-
-            for i in range(len(sorted_player)):
-                # loop until 'sorted_player' is empty
-                if sorted_player:
-                    count = 1
-                    versus = [sorted_player[0], sorted_player[count]]
-                    while sorted_player[count] in sorted_player[0].get_already_met_list:
-                        try:
-                            count += 1
-                            versus = [sorted_player[0], sorted_player[count]]
-                        except IndexError:
-                            count -= 1
-                            versus = [sorted_player[0], sorted_player[count]]
-                            break
-                    self.match_list.append((versus, [0, 0]))
-                    sorted_player[0].set_already_met = sorted_player[count]
-                    sorted_player[count].set_already_met = sorted_player[0]
-                    # Once paired, players are removed from the list.
-                    sorted_player.pop(0)
-                    sorted_player.pop(count - 1)
-                else:
-                    pass
+            sorted_slot = self.standings.slots("score")
+
+            previous_byes = {id(rd.bye) for rd in prev_round_list or [] if rd.bye is not None}
+            bye_candidates = [nb for nb, slot in enumerate(sorted_slot)
+                              if id(self.player_list[slot]) not in previous_byes]
+            pairs, bye = pair_players(len(sorted_slot),
+                                      lambda i, j: self.opponents.have_met(sorted_slot[i], sorted_slot[j]),
+                                      bye_candidates)
+
+            for i, j in pairs:
+                self.add_match(sorted_slot[i], sorted_slot[j])
+            if bye is not None:
+                self.set_bye(self.player_list[sorted_slot[bye]])
+
+    def add_match(self, slot1, slot2):
+        """Add a game between the players of slot1 (J1) and slot2 (J2) and
+        record that they met."""
+        versus = [self.player_list[slot1], self.player_list[slot2]]
+        score = [0, 0]
+        self.match_list.append((versus, score))
+        self.opponents.mark(slot1, slot2)
+        self.mark_changed()
+
+    def set_bye(self, player):
+        """The player left alone when the number of players is odd gets
+        BYE_SCORE points."""
+        self.bye = player
+        player.set_player_score = self.BYE_SCORE
+        self.standings.update(player)
+        self.__changed = True
 
     @property
     def get_match_list(self):
         return self.match_list
 
-    def play_round(self, game, result):
+    def play_round(self, game, result, game_nb=None):
+        """Enter the result of a game. game_nb is the game's index in the
+        round : without it, the whole round is serialized again."""
         P1 = game[0][0]
         P2 = game[0][1]
         if result == "J1":
@@ -97,15 +152,43 @@ class Tour:
             game[1][1] = 0.5
             P1.set_player_score = game[1][0]
             P2.set_player_score = game[1][1]
+        self.standings.update(P1)
+        self.standings.update(P2)
+        self.mark_changed(game_nb)
 
     def info_from_match(self):
         match_info = {}
         for e, info in enumerate(self.match_list):
             score = info[1]
-            match_info[f"game {e+1}"] = score
+            match_info[f"game {e+1}"] = list(score)
+        match_info["pairings"] = [[versus[0].id_player, versus[1].id_player] for versus, score in self.match_list]
         match_info["start_date"] = self.start_date.strftime("%d/%m/%Y %H:%M")
         match_info["end_date"] = self.end_date
+        if self.bye is not None:
+            match_info["bye"] = self.bye.id_player
+        if self.ratings is not None:
+            match_info["ratings"] = self.ratings
         return match_info
 
     def serialize_round(self):
-        return {f"{self.name}": self.info_from_match()}
+        """Return the round's serialized form. If nothing changed since the
+        last call, the same dict is returned, else a new dict where only the
+        changed games are serialized again. The returned dicts are shared
+        and must not be modified.
+        """
+        if self.__serialized is None:
+            self.__serialized = {f"{self.name}": self.info_from_match()}
+        elif self.__changed or self.__changed_games:
+            match_info = dict(self.__serialized[self.name])
+            for game_nb in self.__changed_games:
+                match_info[f"game {game_nb + 1}"] = list(self.match_list[game_nb][1])
+            match_info["start_date"] = self.start_date.strftime("%d/%m/%Y %H:%M")
+            match_info["end_date"] = self.end_date
+            if self.bye is not None:
+                match_info["bye"] = self.bye.id_player
+            if self.ratings is not None:
+                match_info["ratings"] = self.ratings
+            self.__serialized = {f"{self.name}": match_info}
+        self.__changed = False
+        self.__changed_games.clear()
+        return self.__serialized
@@ -2,56 +2,125 @@
 # -*- coding: utf-8 -*-
 
 import datetime as dt
+import functools
+
+import numpy as np
 
 from model.player import Player
+from model.playertable import PlayerTable
 from model.tour import Tour
+from model.opponents import OpponentMatrix
+from model.standings import Standings
+from model.results import ResultsMatrix
+from model.elo import DEFAULT_RATING, rating_deltas
 import model.playerdb as lpdb
 import model.tournamentdb as trdb
+import model.resultfile as rf
+import model.playerfile as pf
+from model.catalog import catalog
+
+
+def hydrated(method):
+    """Decorator for the Tournament methods using the players or rounds :
+    a lazily loaded tournament is hydrated first."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self.hydrate()
+        return method(self, *args, **kwargs)
+    return wrapper
 
 
 class Tournament:
-    """Tournament making class
+    """Tournament making class. The number of players and rounds are set
+    per tournament, and saved with the tournament's informations. The
+    players' data is held in the tournament's PlayerTable, whose rows are
+    the players' slots. In rated tournaments, the players' Elo ratings are
+    updated at the end of each round.
+    A tournament loaded lazily only holds its header : its players and
+    rounds are loaded the first time they are used.
+
+    Complexity, n being the number of players and r the number of rounds :
+    - adding a player : O(1) amortized ;
+    - making a round : O(n log n) for the first round, O(n log n + n * r)
+    for the following rounds in the usual case (see pairing.pair_players) ;
+    - entering a result : O(log n), to update the standings ;
+    - reading the standings : O(n) ;
+    - computing the tie-breaks : O(n * r), vectorized ;
+    - updating the ratings at the end of a round : O(n), vectorized ;
+    - serializing : O(n + r), plus the parts changed since the last
+    serialization, and O(n² / 8) for the opponents matrix after a new round.
     """
+    DEFAULT_MAX_PLAYERS = 8
+    DEFAULT_MAX_ROUNDS = 4
+
     def __init__(self,
                  name,
                  localization,
                  time_control,
                  description,
                  beg_date,
-                 end_date=None):
+                 end_date=None,
+                 max_players=DEFAULT_MAX_PLAYERS,
+                 max_rounds=DEFAULT_MAX_ROUNDS,
+                 rated=False):
         self.name = name
         self.localization = localization
         self.beg_date = beg_date
         self.end_date = end_date
         self.time_control = time_control
         self.description = description
+        self.player_table = PlayerTable()
         self.__player_list = []
         self.__round_list = []
-        self.MAX_PLAYER_LIMIT = 8
-        self.MAX_ROUND_LIST = 4
+        self.__slots_by_id = {}
+        self.opponents = OpponentMatrix()
+        self.standings = Standings(self.__player_list)
+        self.results = ResultsMatrix()
+        self.MAX_PLAYER_LIMIT = max_players
+        self.MAX_ROUND_LIST = max_rounds
+        self.rated = rated
+        self.journal = None
+        self.__loader = None
+        self.__serialized_players = []
+        self.__changed_slots = set()
+        self.__serialized_opponents = None
+        self.__serialized_tie_breaks = None
         self.saved_info = {
             "name": self.name,
             "localization": self.localization,
             "time_control": self.time_control,
             "description": self.description,
             "beg_date": self.beg_date,
-            "end_date": self.end_date
+            "end_date": self.end_date,
+            "max_players": self.MAX_PLAYER_LIMIT,
+            "max_rounds": self.MAX_ROUND_LIST,
+            "rated": self.rated
         }
 
+    @hydrated
     def serialize_tournament_info(self):
         """Return a dict object of tournament's serialized informations needed
         to save tournament's data into database.
+        Only the parts that changed since the last call are serialized
+        again : the players whose informations changed, the rounds with new
+        results (see Tour.serialize_round), the opponents history once a
+        round is added and the tie-breaks once a result is entered. The
+        other parts are the dicts returned by the previous call, which are
+        shared and must not be modified.
         """
         serial_info = {}
         player_info_list = []
         rounds_info_list = []
         serial_info["tournament_info"] = self.saved_info
 
-        if self.__player_list:
-            for nb, info in enumerate(self.__player_list):
-                player_info = {}
-                player_info[f"player{nb}"] = info.get_player_saved_info
-                player_info_list.append(player_info)
+        if self.__changed_slots:
+            player_info_list = list(self.__serialized_players)
+            player_info_list.extend([None] * (len(self.__player_list) - len(player_info_list)))
+            for nb in self.__changed_slots:
+                player_info_list[nb] = {f"player{nb}": self.__player_list[nb].get_player_saved_info}
+            self.__serialized_players = player_info_list
+            self.__changed_slots.clear()
+        player_info_list = self.__serialized_players
 
         if player_info_list:
             serial_info["players_list"] = player_info_list
@@ -64,12 +133,116 @@ class Tournament:
 
         if rounds_info_list:
             serial_info["rounds_list"] = rounds_info_list
+            if self.__serialized_opponents is None:
+                self.__serialized_opponents = self.opponents.serialize()
+            if self.__serialized_tie_breaks is None:
+                self.__serialized_tie_breaks = self.results.serialize_tie_breaks()
+            serial_info["opponents"] = self.__serialized_opponents
+            serial_info["tie_breaks"] = self.__serialized_tie_breaks
         else:
             pass
 
         return {"tournament_data": serial_info}
 
+    @classmethod
+    def from_tournament_info(cls, tournament_info):
+        """Return a Tournament instance, without players nor rounds, made
+        from its saved tournament_info dict."""
+        return cls(tournament_info["name"],
+                   tournament_info["localization"],
+                   tournament_info["time_control"],
+                   tournament_info["description"],
+                   tournament_info["beg_date"],
+                   tournament_info["end_date"],
+                   tournament_info.get("max_players", cls.DEFAULT_MAX_PLAYERS),
+                   tournament_info.get("max_rounds", cls.DEFAULT_MAX_ROUNDS),
+                   tournament_info.get("rated", False))
+
+    @classmethod
+    def from_saved_data(cls, tournament_info, players_info, rounds_info, opponents=None):
+        """Return a Tournament instance made from the saved data returned by
+        TournamentDB.load_tournament_from_db."""
+        tournament = cls.from_tournament_info(tournament_info)
+        tournament.load_saved_data(players_info, rounds_info, opponents)
+        return tournament
+
+    @classmethod
+    def load_tournament_from_db(cls, db_file_name, tournament_name, lazy=False):
+        """Load a saved tournament from a database file. Raise a Warning if
+        the tournament isn't in the file. If lazy is True, only the
+        tournament's header is read : its players and rounds are read from
+        the file the first time they are used.
+        """
+        loader = trdb.TournamentDB(db_file_name)
+        if not lazy:
+            return cls.from_saved_data(*loader.load_tournament_from_db(tournament_name))
+
+        tournament = cls.from_tournament_info(loader.load_tournament_info(tournament_name))
+
+        def load_players_and_rounds():
+            return (loader.load_players_info(tournament_name),) + loader.load_rounds_info(tournament_name)
+        tournament.set_loader(load_players_and_rounds)
+        return tournament
+
+    def set_loader(self, loader):
+        """Make the tournament lazy : loader is called, without argument,
+        the first time the players or rounds are used, and returns the
+        saved players list, rounds list and opponents history."""
+        self.__loader = loader
+
+    @property
+    def is_hydrated(self):
+        return self.__loader is None
+
+    def hydrate(self):
+        """Load the players and rounds of a lazily loaded tournament. Does
+        nothing if they are already loaded."""
+        if self.__loader is not None:
+            loader, self.__loader = self.__loader, None
+            self.load_saved_data(*loader())
+
+    def load_saved_data(self, players_info, rounds_info, opponents=None):
+        """Add the saved players and rounds to the tournament. Rounds saved
+        with their pairings are restored as they were, without pairing the
+        players again : loading is linear in the number of games.
+        Rounds saved without pairings, by older versions, are paired again
+        and only their scores are restored, if they have an end date.
+        """
+        self.add_saved_players([players[f"player{e}"] for e, players in enumerate(players_info or [])])
+
+        for e, rnd in enumerate(rounds_info or []):
+            ((round_name, match_info),) = rnd.items()
+            if "pairings" in match_info:
+                rd = self.add_saved_round(round_name, match_info)
+            elif match_info["end_date"] is not None:
+                self.add_round_to_list(round_name)
+                rd = self.__round_list[e]
+                for nb, game in enumerate(rd.get_match_list):
+                    score1, score2 = match_info[f"game {nb + 1}"]
+                    self.set_game_score(rd, game, score1, score2)
+                rd.end_date = match_info["end_date"]
+            else:
+                continue
+            rd.start_date = dt.datetime.strptime(match_info["start_date"], "%d/%m/%Y %H:%M")
+            rd.ratings = match_info.get("ratings")
+
+        # The saved opponents history is only valid if every saved
+        # round has been rebuilt.
+        if opponents and len(self.__round_list) == len(rounds_info or []):
+            self.restore_opponents(opponents)
+
+    @hydrated
+    def add_saved_round(self, round_name, match_info):
+        """Restore a round from its saved data, whose pairings give the ids
+        of the players of each game."""
+        slots = self.__slots_by_id
+        pairs = [(slots[id1], slots[id2]) for id1, id2 in match_info["pairings"]]
+        scores = [match_info[f"game {nb + 1}"] for nb in range(len(pairs))]
+        bye = slots.get(match_info.get("bye"))
+        return self.add_played_round(round_name, pairs, scores, bye, match_info["end_date"])
+
     @property
+    @hydrated
     def get_player_list(self):
         return self.__player_list
 
@@ -81,61 +254,423 @@ class Tournament:
             return False
 
     @property
+    @hydrated
     def get_round_list(self):
         return self.__round_list
 
-    def add_new_player(self, l_name, f_name, date_birth, gender, rank):
+    @hydrated
+    def get_player(self, id_player):
+        """Return the player of the tournament having this id, or None."""
+        slot = self.__slots_by_id.get(id_player)
+        return None if slot is None else self.__player_list[slot]
+
+    def __add_players(self, players):
+        """Add players made in the tournament's PlayerTable."""
+        for player in players:
+            self.__slots_by_id.setdefault(player.id_player, len(self.__player_list))
+            self.__changed_slots.add(len(self.__player_list))
+            self.__player_list.append(player)
+        self.opponents.resize(len(self.__player_list))
+        self.results.resize(len(self.__player_list))
+        self.standings.add_new_players()
+        self.__serialized_opponents = None
+        self.__serialized_tie_breaks = None
+
+    @hydrated
+    def add_new_player(self, l_name, f_name, date_birth, gender, rank, rating=DEFAULT_RATING):
         """Class to manually add a new player to the tournament. Can be done until
-        MAX_PLAYER_LIMIT is reached.
+        MAX_PLAYER_LIMIT is reached. A player is identified by their id_player :
+        the same player can't be added twice.
         """
-        player = Player(l_name, f_name, date_birth, gender, rank)
-        self.__player_list.append(player)
+        if len(self.__player_list) >= self.MAX_PLAYER_LIMIT:
+            raise Exception("Limite maximale de joueurs atteinte.")
+        id_player = Player.make_id(l_name, f_name, date_birth)
+        if id_player in self.__slots_by_id:
+            raise Warning(f"Joueur ({id_player}) déjà inscrit au tournoi.")
+        self.__add_players([Player(l_name, f_name, date_birth, gender, rank, table=self.player_table, rating=rating)])
+        self.__journal_new_players(1)
+
+    @hydrated
+    def add_saved_players(self, players_info):
+        """Add players from their saved informations, without any check."""
+        self.__add_players([Player(info["last_name"], info["first_name"], info["date_birth"], info["gender"],
+                                   info["rank"], table=self.player_table,
+                                   rating=info.get("rating", DEFAULT_RATING))
+                            for info in players_info])
 
     @staticmethod
     def save_player_into_db(db_file, player):
         save = lpdb.SavePlayer(db_file)
         save.save_player_into_db(player)
 
+    @staticmethod
+    def save_players_into_db(db_file, players):
+        """Save several players into a database file at once. Return the
+        ids of the players already present in the database.
+        """
+        save = lpdb.SavePlayer(db_file)
+        return save.save_players_into_db(players)
+
+    @staticmethod
+    def update_ratings_into_db(db_file, players):
+        """Write the Elo rating of several players into a database file in
+        a single write. Return the ids of the players absent from it.
+        """
+        save = lpdb.SavePlayer(db_file)
+        return save.update_ratings_into_db(players)
+
+    @hydrated
+    def save_ratings_into_db(self):
+        """Write the Elo rating of the players into the database files where
+        they are saved, found by the catalog, with one write per file.
+        Return the ids of the players saved in no file.
+        """
+        files = {}
+        for id_player, file_name in catalog.find_players(self.__slots_by_id).items():
+            files.setdefault(file_name, []).append(self.__player_list[self.__slots_by_id[id_player]])
+        missing_ids = [player.id_player for player in files.pop(None, [])]
+        for file_name, players in files.items():
+            missing_ids.extend(self.update_ratings_into_db(file_name, players))
+        return missing_ids
+
+    @hydrated
     def add_player_from_db(self, db_file, player_id):
         """Load serialized playters informations from database and
         make an instance of class Player.
         """
-        load = lpdb.LoadPlayer(db_file)
-        if len(self.__player_list) != self.MAX_PLAYER_LIMIT:
-            self.__player_list.append(load.load_player_from_db(player_id))
-        else:
+        missing_ids = self.add_players_from_db(db_file, [player_id])
+        if missing_ids:
+            raise Warning(f"Joueur ({player_id}) absent de la base de données. Rappel du format: '1000_ABCDEF'")
+
+    @hydrated
+    def add_players_from_db(self, db_file, players_id):
+        """Load several players from a database file, opened once, and add
+        them to the tournament. Return the ids absent from the database.
+        """
+        players_id = list(dict.fromkeys(players_id))
+        if len(self.__player_list) + len(players_id) > self.MAX_PLAYER_LIMIT:
             raise Exception("Limite maximale de joueurs atteinte.")
+        registered = [id_player for id_player in players_id if id_player in self.__slots_by_id]
+        if registered:
+            raise Warning(f"Joueur(s) déjà inscrit(s) au tournoi : {', '.join(registered)}.")
+        load = lpdb.LoadPlayer(db_file)
+        players, missing_ids = load.load_players_from_db(players_id, self.player_table)
+        self.__add_players(players)
+        self.__journal_new_players(len(players))
+        return missing_ids
+
+    @hydrated
+    def add_players_from_file(self, path):
+        """Add the players of a CSV or JSON file (see
+        playerfile.read_player_rows). Every row is checked first : if any row
+        is faulty, a player is already registered or the players limit would
+        be exceeded, no player is added and a Warning listing every error is
+        raised. Return the number of players added.
+        """
+        return self.add_player_rows(pf.read_player_rows(path))
+
+    @hydrated
+    def add_player_rows(self, rows):
+        """Add the players given as (location, {field: value}) rows, as
+        add_players_from_file does."""
+        players_info, errors = pf.check_player_rows(rows)
+        known_ids = set(self.__slots_by_id)
+        for info in players_info:
+            id_player = Player.make_id(info["last_name"], info["first_name"], info["date_birth"])
+            if id_player in known_ids:
+                errors.append(f"Joueur ({id_player}) déjà inscrit au tournoi.")
+            known_ids.add(id_player)
+        if len(self.__player_list) + len(players_info) > self.MAX_PLAYER_LIMIT:
+            errors.append("Limite maximale de joueurs atteinte.")
+        if errors:
+            raise Warning("\n".join(errors))
+        self.add_saved_players(players_info)
+        self.__journal_new_players(len(players_info))
+        return len(players_info)
+
+    def __journal_new_players(self, nb_players):
+        """Journal the last nb_players players added. Players added from
+        saved data aren't journaled."""
+        if self.journal is not None and nb_players:
+            self.journal.append({"event": "players",
+                                 "players": [player.get_player_saved_info
+                                             for player in self.__player_list[-nb_players:]]})
 
+    @hydrated
+    def set_player_rank(self, player, rank):
+        player.set_player_rank = rank
+        self.standings.update(player)
+        self.__changed_slots.add(self.standings.get_slot(player))
+
+        if self.journal is not None:
+            self.journal.append({"event": "rank", "player": player.id_player, "rank": rank})
+
+    @hydrated
+    def set_game_score(self, roundp, game, score1, score2):
+        """Set the score of a game, from saved data, and add it to the
+        players' score."""
+        P1, P2 = game[0]
+        game[1][0] = score1
+        game[1][1] = score2
+        P1.set_player_score = score1
+        P2.set_player_score = score2
+        self.standings.update(P1)
+        self.standings.update(P2)
+        roundp.mark_changed()
+        self.record_result(roundp, game)
+
+    def record_result(self, roundp, game):
+        """Copy a game's score into the results matrix."""
+        self.__serialized_tie_breaks = None
+        self.results.set_result(self.__round_list.index(roundp),
+                                self.standings.get_slot(game[0][0]),
+                                self.standings.get_slot(game[0][1]),
+                                game[1][0], game[1][1])
+
+    @hydrated
+    def standings_with_tie_breaks(self):
+        """Return the players sorted by score, then by tie-breaks (Buchholz,
+        Sonneborn-Berger, progressive score), then by rank, each with a
+        dict of their tie-breaks.
+        """
+        tie_breaks = self.results.tie_breaks()
+        ranks = [player.rank for player in self.__player_list]
+        return [(self.__player_list[slot], {name: float(values[slot]) for name, values in tie_breaks.items()})
+                for slot in self.results.ranking(ranks)]
+
+    @hydrated
     def save_tournament_in_db(self, db_file_name, update=False):
         """Write serialized tournaments information into a database
         file by calling TournamentDB method.
         """
         tourn_info = self.serialize_tournament_info()
         trdb.TournamentDB(db_file_name).save_tournament_in_db(tourn_info, update)
+        # The journaled changes are now part of the saved tournament, the
+        # next ones are journaled for this database file.
+        if self.journal is not None:
+            self.journal.move_to(db_file_name)
+
+    @hydrated
+    def restore_opponents(self, serialized_opponents):
+        """Replace the opponents history by a saved one."""
+        self.opponents = OpponentMatrix.deserialize(serialized_opponents)
+        self.opponents.resize(len(self.__player_list))
+        self.__serialized_opponents = None
+
+    def attach_journal(self, journal, replay=False):
+        """Record every player added, rank change, round creation, result
+        and round end date into the journal. If replay is True, the changes already in the journal are
+        applied first. Return the number of replayed changes.
+        """
+        replayed = 0
+        if replay:
+            for entry in journal.get_entries:
+                try:
+                    self.apply_journal_entry(entry)
+                    replayed += 1
+                except (IndexError, Warning):
+                    pass
+        self.journal = journal
+        return replayed
+
+    @hydrated
+    def apply_journal_entry(self, entry):
+        if entry["event"] == "players":
+            self.add_saved_players([info for info in entry["players"] if info["id_player"] not in self.__slots_by_id])
+        elif entry["event"] == "rank":
+            player = self.get_player(entry["player"])
+            if player is not None:
+                self.set_player_rank(player, entry["rank"])
+        elif entry["event"] == "round":
+            if entry["name"] not in [rd.name for rd in self.__round_list]:
+                self.add_round_to_list(entry["name"])
+        elif entry["event"] == "result":
+            roundp = self.__round_list[entry["round"]]
+            self.play_round(roundp, roundp.get_match_list[entry["game"]], entry["result"], entry["game"])
+        elif entry["event"] == "end_round":
+            self.end_round(self.__round_list[entry["round"]], entry["end_date"])
+        elif entry["event"] == "results":
+            self.play_round_results(self.__round_list[entry["round"]], dict(entry["results"]), entry["end_date"])
 
+    @hydrated
     def add_round_to_list(self, round_name):
         """Add a new Tour instance and create the round to be played. Since the first round
         making mechanism is different from the following round, the method check for the
         existence of a first round before making an instance.
         """
         if not self.__round_list:
-            rd = Tour(round_name, self.__player_list)
+            rd = Tour(round_name, self.__player_list, opponents=self.opponents, standings=self.standings)
             rd.make_round()
             self.__round_list.append(rd)
         else:
-            rd = Tour(round_name, self.__player_list, not_first=True)
+            rd = Tour(round_name, self.__player_list, not_first=True, opponents=self.opponents,
+                      standings=self.standings)
             rd.make_round(self.__round_list)
             self.__round_list.append(rd)
 
-    def play_round(self, roundp, game, result):
+        self.__add_round_results(rd)
+
+        if self.journal is not None:
+            self.journal.append({"event": "round", "name": round_name})
+
+    @hydrated
+    def add_played_round(self, round_name, pairs, scores, bye=None, end_date=None):
+        """Add a round whose games are already known, without pairing the
+        players : pairs gives the players' slots of each game, scores their
+        scores and bye the slot of the player getting a bye, if any. The
+        change isn't journaled.
+        """
+        rd = Tour(round_name, self.__player_list, not_first=bool(self.__round_list), opponents=self.opponents,
+                  standings=self.standings)
+        for slot1, slot2 in pairs:
+            rd.add_match(slot1, slot2)
+        if bye is not None:
+            rd.set_bye(self.__player_list[bye])
+        self.__round_list.append(rd)
+        self.__add_round_results(rd)
+
+        for game, (score1, score2) in zip(rd.get_match_list, scores):
+            self.set_game_score(rd, game, score1, score2)
+        rd.end_date = end_date
+        return rd
+
+    def __add_round_results(self, rd):
+        self.__serialized_opponents = None
+        self.__serialized_tie_breaks = None
+        get_slot = self.standings.get_slot
+        self.results.add_round([(get_slot(game[0][0]), get_slot(game[0][1])) for game in rd.get_match_list],
+                               None if rd.bye is None else get_slot(rd.bye), rd.BYE_SCORE)
+
+    @hydrated
+    def play_round(self, roundp, game, result, game_nb=None):
+        """Enter the result of a game. game_nb is the game's index in the
+        round, looked up in O(n) when not given.
+        """
         if roundp.end_date is None:
-            roundp.play_round(game, result)
+            roundp.play_round(game, result, game_nb)
+            self.record_result(roundp, game)
         else:
             raise Warning
 
+        if self.journal is not None:
+            if game_nb is None:
+                game_nb = next(nb for nb, match in enumerate(roundp.get_match_list) if match is game)
+            self.journal.append({"event": "result",
+                                 "round": self.__round_list.index(roundp),
+                                 "game": game_nb,
+                                 "result": result})
+
+    @hydrated
+    def import_round_results(self, roundp, path, end_date):
+        """Enter the results of a round from a CSV or JSON file, then end
+        the round. Every row is checked first : if any row is faulty, or a
+        game has no result, nothing is entered and a Warning listing every
+        error is raised. Return the number of results entered.
+        """
+        return self.enter_round_results(roundp, rf.read_result_rows(path), end_date)
+
+    @hydrated
+    def enter_game_results(self, roundp, rows):
+        """Enter the results of some games of a round, given as (location,
+        board, result) rows, without ending the round. Every row is checked
+        first : if any row is faulty, nothing is entered and a Warning
+        listing every error is raised. Return the number of results entered.
+        """
+        if roundp.end_date is not None:
+            raise Warning("La ronde est déjà terminée.")
+        results, errors = rf.check_result_rows(rows, roundp.get_match_list, complete=False)
+        if errors:
+            raise Warning("\n".join(errors))
+        for game_nb, result in sorted(results.items()):
+            self.play_round(roundp, roundp.get_match_list[game_nb], result, game_nb)
+        return len(results)
+
+    @hydrated
+    def enter_round_results(self, roundp, rows, end_date):
+        """Enter the results of a round given as (location, board, result)
+        rows, then end the round, as import_round_results does."""
+        if roundp.end_date is not None:
+            raise Warning("La ronde est déjà terminée.")
+        results, errors = rf.check_result_rows(rows, roundp.get_match_list)
+        try:
+            dt.datetime.strptime(end_date, "%d/%m/%Y %H:%M")
+        except ValueError:
+            errors.append(f"Date de fin invalide : {end_date}")
+        if errors:
+            raise Warning("\n".join(errors))
+        self.play_round_results(roundp, results, end_date)
+        return len(results)
+
+    @hydrated
+    def play_round_results(self, roundp, results, end_date):
+        """Enter the {game index: result} results of a round in one pass and
+        end the round. The change is journaled as a single entry, written
+        at once : it is replayed whole or not at all. Raise a Warning if the
+        round has already ended.
+        """
+        if roundp.end_date is not None:
+            raise Warning("La ronde est déjà terminée.")
+        for game_nb, result in sorted(results.items()):
+            game = roundp.get_match_list[game_nb]
+            roundp.play_round(game, result, game_nb)
+            self.record_result(roundp, game)
+        self.__set_round_end(roundp, end_date)
+
+        if self.journal is not None:
+            self.journal.append({"event": "results",
+                                 "round": self.__round_list.index(roundp),
+                                 "results": sorted(results.items()),
+                                 "end_date": end_date})
+
+    def __set_round_end(self, roundp, end_date):
+        roundp.end_date = end_date
+        if self.rated:
+            self.update_ratings(roundp)
+
+    @hydrated
+    def end_round(self, roundp, end_date):
+        """Set the round's end date, once every result has been entered. In
+        rated tournaments, the players' ratings are then updated. Raise a
+        Warning if the round has already ended, so that replaying a journal
+        never updates the ratings twice."""
+        if roundp.end_date is not None:
+            raise Warning("La ronde est déjà terminée.")
+        self.__set_round_end(roundp, end_date)
+
+        if self.journal is not None:
+            self.journal.append({"event": "end_round",
+                                 "round": self.__round_list.index(roundp),
+                                 "end_date": end_date})
+
+    @hydrated
+    def update_ratings(self, roundp):
+        """Update the Elo rating of every player from the round's results,
+        all games at once, and keep the new ratings in the round as the
+        ratings history."""
+        round_nb = self.__round_list.index(roundp)
+        ratings = np.array(self.player_table.ratings)
+        deltas = rating_deltas(ratings,
+                               self.results.get_opponents[:, round_nb],
+                               self.results.get_points[:, round_nb])
+        ratings += deltas
+        self.player_table.set_ratings(ratings)
+        self.__changed_slots.update(np.flatnonzero(deltas).tolist())
+        roundp.ratings = ratings.tolist()
+
+    @property
+    @hydrated
+    def get_rating_history(self):
+        """Return the ratings after each rated round, indexed by slot."""
+        return [rd.ratings for rd in self.__round_list if rd.ratings is not None]
+
+    @hydrated
+    @hydrated
     def end_tournament(self, end_date):
         """Class to set the tournament's end date. Only works if
         every rounds have been played (last round has an end date).
+        In a rated tournament, the final ratings are written into the
+        database files holding the players. Return the ids of the players
+        whose rating couldn't be saved.
         """
         every_round_exit = len(self.__round_list) == self.MAX_ROUND_LIST
         round_done = bool(self.__round_list[len(self.__round_list) -
@@ -144,10 +679,12 @@ class Tournament:
             try:
                 dt.datetime.strptime(end_date, "%d/%m/%Y")
                 self.end_date = end_date
+                self.saved_info["end_date"] = end_date
             except ValueError:
                 raise Warning
         else:
             raise Exception
+        return self.save_ratings_into_db() if self.rated else []
 
     def __str__(self):
         end_date_info = self.end_date if self.end_date else "En cours"
@@ -3,8 +3,12 @@
 
 
 from model.interactDB import InteractDB
+from model.dateindex import date_key
 from tinydb import TinyDB, Query
-from tinydb.operations import delete
+
+
+class MissingTournament(Warning):
+    """Raised when a tournament isn't in the database file."""
 
 
 class TournamentDB(InteractDB):
@@ -12,44 +16,177 @@ class TournamentDB(InteractDB):
     and read informations from tournament DB file to be sent to the
     controller.
     """
-    def __init__(self, db_file_name):
+    def __init__(self, db_file_name, buffered=False):
         """Class constructor, inherit from InteractDB."""
-        super(TournamentDB, self).__init__(db_file_name)
+        super(TournamentDB, self).__init__(db_file_name, buffered)
 
     def list_tournaments_in_db(self):
-        all_tournaments = self.tournaments.search(self.info["tournament_data"].exists())
-        return all_tournaments
+        """Return the tournament_info dict of every tournament saved in
+        the database file."""
+        return self.handle.list_tournament_infos()
+
+    def tournament_exists(self, tournament_name):
+        return tournament_name in self.header_index or bool(self.handle.get_legacy_tournament(tournament_name))
+
+    def get_tournament_info(self, tournament_name):
+        header = self.header_index.get(tournament_name)
+        if header:
+            return header["tournament_info"]
+        return self.handle.get_legacy_tournament(tournament_name)["tournament_data"]["tournament_info"]
+
+    def list_tournaments_between(self, start, end, field="beg_date"):
+        """Return the tournament_info dict of the tournaments whose beg_date
+        (or end_date) is between the start and end dates (JJ/MM/AAAA), both
+        included. Raise a ValueError if a date is missing or malformed."""
+        start_key = date_key(start)
+        end_key = date_key(end)
+        for date, key in ((start, start_key), (end, end_key)):
+            if key is None:
+                raise ValueError(f"Format ou date invalide : {date!r} (JJ/MM/AAAA attendu).")
+        end_key = end_key[:10] + " 23:59"
+        names = self.date_index.between(start_key, end_key, field)
+        return [self.get_tournament_info(name) for name in names]
+
+    def list_unfinished_tournaments(self):
+        return [self.get_tournament_info(name) for name in self.date_index.unfinished()]
+
+    def iter_tournament_headers(self):
+        """Yield the tournament_info dict of every tournament saved in the
+        database file, without loading the players and rounds. Memory used
+        doesn't depend on the number of saved tournaments."""
+        return self.handle.iter_headers()
 
     def save_tournament_in_db(self, serialized_info, update=False):
-        tournament_name = serialized_info["tournament_data"]["tournament_info"]["name"]
-        if self.tournaments.search(self.info["tournament_data"]["tournament_info"]["name"] == tournament_name):
-            if update is True:
-                self.tournaments.update(delete("tournament_data"),
-                                        self.info["tournament_data"]["tournament_info"]["name"] == tournament_name)
-                self.tournaments.insert(serialized_info)
-            else:
+        """Save a tournament in normalized form : a header row, plus player,
+        round and match rows keyed by tournament name. The opponents history
+        and the tie-breaks have their own rows, so that a change of the
+        header doesn't write them again. When updating, only the rows that
+        changed since the last save are written.
+
+        Complexity : O(N + n + m), N being the number of rows of the file,
+        n the number of players and m the number of games of the
+        tournament, with a constant number of write operations.
+        """
+        tournament_data = serialized_info["tournament_data"]
+        tournament_name = tournament_data["tournament_info"]["name"]
+        if self.tournament_exists(tournament_name):
+            if update is not True:
                 raise Warning("Tournoi déjà sauvegardé dans la base de données.")
-        else:
-            self.tournaments.insert(serialized_info)
+            self.handle.remove_legacy_tournament(tournament_name)
+
+        if self.header_index.upsert({"tournament": tournament_name,
+                                     "tournament_info": tournament_data["tournament_info"]}):
+            self.date_index.update(tournament_data["tournament_info"])
+        for index, field in ((self.opponents_index, "opponents"), (self.tie_break_index, "tie_breaks")):
+            if tournament_data.get(field) is None:
+                index.remove(tournament_name)
+            else:
+                index.upsert({"tournament": tournament_name, field: tournament_data[field]})
+
+        entrant_rows = [{"tournament": tournament_name,
+                         "slot": slot,
+                         "player": player_info[f"player{slot}"]}
+                        for slot, player_info in enumerate(tournament_data.get("players_list", []))]
+
+        round_rows = []
+        match_rows = []
+        for nb, round_info in enumerate(tournament_data.get("rounds_list", [])):
+            ((round_name, match_info),) = round_info.items()
+            round_rows.append({"tournament": tournament_name,
+                               "round": nb,
+                               "name": round_name,
+                               "start_date": match_info["start_date"],
+                               "end_date": match_info["end_date"],
+                               "bye": match_info.get("bye"),
+                               "ratings": match_info.get("ratings")})
+            pairings = match_info.get("pairings", [])
+            game = 1
+            while f"game {game}" in match_info:
+                match_rows.append({"tournament": tournament_name,
+                                   "round": nb,
+                                   "game": game,
+                                   "players": pairings[game - 1] if game <= len(pairings) else None,
+                                   "score": match_info[f"game {game}"]})
+                game += 1
+
+        self.entrant_index.upsert_multiple(entrant_rows)
+        self.round_index.upsert_multiple(round_rows)
+        self.match_index.upsert_multiple(match_rows)
+
+        entrant_keys = {(row["slot"],) for row in entrant_rows}
+        round_keys = {(row["round"],) for row in round_rows}
+        match_keys = {(row["round"], row["game"]) for row in match_rows}
+        self.entrant_index.remove(tournament_name, self.entrant_index.keys(tournament_name) - entrant_keys)
+        self.round_index.remove(tournament_name, self.round_index.keys(tournament_name) - round_keys)
+        self.match_index.remove(tournament_name, self.match_index.keys(tournament_name) - match_keys)
+        self.commit()
 
     def load_tournament_from_db(self, tournament_name):
         """Return a tuple of dict object with saved tournaments data. If there is no players list
-        and no rounds list, dict objects are empty dict."""
-        global_data = self.tournaments.get(self.info["tournament_data"]["tournament_info"]["name"] == tournament_name)
+        and no rounds list, dict objects are empty dict. The tuple's last item is the serialized
+        opponents history, or None.
+
+        Complexity : O(N + n + m log m), N being the number of rows of the
+        file, n the number of players and m the number of games.
+        """
+        trn_info = self.load_tournament_info(tournament_name)
+        players_info = self.load_players_info(tournament_name)
+        rounds_info, opponents = self.load_rounds_info(tournament_name)
+        return (trn_info, players_info, rounds_info, opponents)
+
+    def load_tournament_info(self, tournament_name):
+        """Return the tournament_info dict of a saved tournament, without
+        reading its players and rounds. Raise a Warning if the tournament
+        isn't in the database."""
+        header = self.header_index.get(tournament_name)
+        if header:
+            return header["tournament_info"]
+        global_data = self.handle.get_legacy_tournament(tournament_name)
+        if global_data:
+            return global_data["tournament_data"]["tournament_info"]
+        raise MissingTournament("Tournoi inexistant dans la base de données.")
+
+    def load_players_info(self, tournament_name):
+        """Return the saved players list of a tournament, or None."""
+        if tournament_name in self.header_index:
+            return [{f"player{row['slot']}": row["player"]}
+                    for row in self.entrant_index.rows(tournament_name)] or None
+        global_data = self.handle.get_legacy_tournament(tournament_name)
         if global_data:
-            trn_info = global_data["tournament_data"]["tournament_info"]
-            try:
-                players_info = global_data["tournament_data"]["players_list"]
-            except KeyError:
-                players_info = None
-            try:
-                rounds_info = global_data["tournament_data"]["rounds_list"]
-            except KeyError:
-                rounds_info = None
+            return global_data["tournament_data"].get("players_list")
+        raise MissingTournament("Tournoi inexistant dans la base de données.")
 
-            return (trn_info, players_info, rounds_info)
-        else:
-            raise Warning("Tournoi inexistant dans la base de données.")
+    def load_rounds_info(self, tournament_name):
+        """Return a tuple with the saved rounds list of a tournament, or
+        None, and its serialized opponents history, or None."""
+        header = self.header_index.get(tournament_name)
+        if header:
+            games = {}
+            pairings = {}
+            for row in self.match_index.rows(tournament_name):
+                games.setdefault(row["round"], {})[f"game {row['game']}"] = row["score"]
+                pairings.setdefault(row["round"], []).append(row.get("players"))
+            rounds_info = []
+            for row in self.round_index.rows(tournament_name):
+                match_info = games.get(row["round"], {})
+                match_info["start_date"] = row["start_date"]
+                match_info["end_date"] = row["end_date"]
+                if pairings.get(row["round"]) and None not in pairings[row["round"]]:
+                    match_info["pairings"] = pairings[row["round"]]
+                if row.get("bye"):
+                    match_info["bye"] = row["bye"]
+                if row.get("ratings"):
+                    match_info["ratings"] = row["ratings"]
+                rounds_info.append({row["name"]: match_info})
+            # Files saved before the opponents had their own table keep them
+            # in the header.
+            opponents = self.opponents_index.get(tournament_name)
+            return (rounds_info or None, opponents["opponents"] if opponents else header.get("opponents"))
+
+        global_data = self.handle.get_legacy_tournament(tournament_name)
+        if global_data:
+            return (global_data["tournament_data"].get("rounds_list"), global_data["tournament_data"].get("opponents"))
+        raise MissingTournament("Tournoi inexistant dans la base de données.")
 
 
 if __name__ == '__main__':
@@ -57,13 +194,11 @@ if __name__ == '__main__':
 
     tournaments = db.table("Tournaments")
 
-    for x in tournaments.search(Query()["tournament_data"].exists()):
-        print(x["tournament_data"]["tournament_info"])
+    for x in tournaments.all():
+        print(x["tournament_info"])
 
-    ft_inf = tournaments.get(Query()["tournament_data"]["tournament_info"]["name"] == "Tournoi")
-    ft_inf["tournament_data"]["tournament_info"]
-    ft_inf["tournament_data"]["players_list"]
-    ft_inf["tournament_data"]["rounds_list"]
+    ft_inf = tournaments.get(Query()["tournament"] == "Tournoi")
+    ft_inf["tournament_info"]
 
     test = TournamentDB("tournamentdb.json")
     info = test.load_tournament_from_db("Tournoi")
@@ -0,0 +1,16 @@
+import pytest
+
+from model.catalog import catalog
+from model.interactDB import registry
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Run the test in an empty directory : the data files are written in
+    its 'data' directory. The handles and the catalog of the previous test
+    are forgotten."""
+    registry.close_all()
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(catalog, "_Catalog__files", None)
+    yield tmp_path / "data"
+    registry.close_all()
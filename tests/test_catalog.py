@@ -0,0 +1,58 @@
+import json
+
+import model.migration as migration
+import model.playerdb as lpdb
+import model.tournament as trn
+from model.catalog import catalog, with_db_extension
+from model.player import Player
+
+
+def write_legacy_file(data_dir):
+    """Write a data file without extension, as saved by the first versions
+    of the application."""
+    data_dir.mkdir(exist_ok=True)
+    player = Player("Poirier", "Marine", "14/05/1992", "F", 1).get_player_saved_info
+    info = {"name": "Ancien", "localization": "Caen", "time_control": "Blitz", "description": "",
+            "beg_date": "25/03/2021 17:00", "end_date": None}
+    data = {"Players": {"1": player},
+            "Tournaments": {"1": {"tournament_data": {"tournament_info": info,
+                                                      "players_list": [{"player0": player}]}}}}
+    (data_dir / "ancien").write_text(json.dumps(data), encoding="utf-8")
+
+
+def test_files_without_extension_are_listed(data_dir):
+    write_legacy_file(data_dir)
+    assert catalog.refresh() == ["ancien"]
+    assert catalog.find_tournament("Ancien") == "ancien"
+    assert catalog.find_player("1992_POIMAR") == "ancien"
+    assert with_db_extension("ancien") == "ancien"
+    assert with_db_extension("nouveau") == "nouveau.json"
+
+
+def test_unreadable_files_are_skipped(data_dir):
+    data_dir.mkdir()
+    (data_dir / "liste.json").write_text("[1, 2]", encoding="utf-8")
+    (data_dir / "tronque.json").write_text('{"Players": {"1": {"id_', encoding="utf-8")
+    (data_dir / "notes.txt").write_text("", encoding="utf-8")
+    lpdb.SavePlayer("bon.json").save_player_into_db(Player("Villey", "Chloé", "14/08/1989", "F", 2))
+
+    assert catalog.refresh() == ["bon.json"]
+    assert catalog.get_files_info == {"bon.json": {"tournaments": 0, "players": 1}}
+
+
+def test_players_of_tournaments_are_not_listed_as_saved_players(data_dir):
+    write_legacy_file(data_dir)
+    data = json.loads((data_dir / "ancien").read_text(encoding="utf-8"))
+    del data["Players"]
+    (data_dir / "ancien").write_text(json.dumps(data), encoding="utf-8")
+
+    catalog.refresh()
+    assert catalog.find_tournament("Ancien") == "ancien"
+    assert catalog.find_player("1992_POIMAR") is None
+
+
+def test_migration_imports_files_without_extension(data_dir):
+    write_legacy_file(data_dir)
+    assert migration.migrate_json_files("chess.sqlite3") == (1, 1)
+    tournament = trn.Tournament.load_tournament_from_db("chess.sqlite3", "Ancien")
+    assert [player.id_player for player in tournament.get_player_list] == ["1992_POIMAR"]
@@ -0,0 +1,56 @@
+import controller.control as ctl
+import model.journal as jrn
+import model.tournament as trn
+import model.tournamentdb as trdb
+import view.view as view
+from tests.test_large_tournament import make_players
+
+
+def make_control(monkeypatch, answers):
+    answers = iter(answers)
+    monkeypatch.setattr(view, "ask_user_input", lambda message: next(answers))
+    control = ctl.Control()
+    tournament = trn.Tournament("Open", "Caen", "Blitz", "", "01/06/2021 10:00", max_players=4, max_rounds=2)
+    tournament.add_saved_players(make_players(4))
+    tournament.attach_journal(jrn.ResultJournal("Open"))
+    tournament.add_round_to_list("Round 1")
+    control.current_tournament = tournament
+    return control
+
+
+def test_imported_results_are_journaled_then_saved(data_dir, tmp_path, monkeypatch):
+    (tmp_path / "results.csv").write_text("1;J1\n2;nul\n", encoding="utf-8")
+    control = make_control(monkeypatch, [str(tmp_path / "results.csv"), "01/06/2021 18:00"])
+    tournament = control.current_tournament
+    tournament.save_tournament_in_db("open.json")
+
+    control.import_round_results()
+
+    assert not tournament.journal.is_pending
+    (rounds_info, opponents) = trdb.TournamentDB("open.json").load_rounds_info("Open")
+    assert rounds_info[0]["Round 1"]["end_date"] == "01/06/2021 18:00"
+    assert rounds_info[0]["Round 1"]["game 1"] == tournament.serialize_tournament_info()[
+        "tournament_data"]["rounds_list"][0]["Round 1"]["game 1"]
+
+
+def test_imported_results_of_an_unsaved_tournament_stay_in_the_journal(data_dir, tmp_path, monkeypatch):
+    (tmp_path / "results.csv").write_text("1;J1\n2;nul\n", encoding="utf-8")
+    control = make_control(monkeypatch, [str(tmp_path / "results.csv"), "01/06/2021 18:00"])
+
+    control.import_round_results()
+
+    entries = control.current_tournament.journal.get_entries
+    assert entries[-1] == {"event": "results", "round": 0, "results": [[0, "J1"], [1, "nul"]],
+                           "end_date": "01/06/2021 18:00"}
+    assert not (data_dir / "open.json").exists()
+
+
+def test_typed_results_are_saved_the_same_way(data_dir, monkeypatch):
+    control = make_control(monkeypatch, ["J1", "nul", "01/06/2021 18:00"])
+    control.current_tournament.save_tournament_in_db("open.json")
+
+    control.play_round()
+
+    assert not control.current_tournament.journal.is_pending
+    (rounds_info, opponents) = trdb.TournamentDB("open.json").load_rounds_info("Open")
+    assert rounds_info[0]["Round 1"]["end_date"] == "01/06/2021 18:00"
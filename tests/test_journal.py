@@ -0,0 +1,94 @@
+import model.journal as jrn
+import model.tournament as trn
+from tests.test_large_tournament import make_players
+
+
+def saved_tournament(nb_players=6):
+    tournament = trn.Tournament("Open", "Caen", "Blitz", "", "01/06/2021 10:00", max_players=10, rated=True)
+    tournament.add_saved_players(make_players(nb_players))
+    tournament.save_tournament_in_db("open.json")
+    return tournament
+
+
+def reload():
+    tournament = trn.Tournament.load_tournament_from_db("open.json", "Open", lazy=True)
+    replayed = tournament.attach_journal(jrn.ResultJournal("Open", "open.json"), replay=True)
+    return tournament, replayed
+
+
+def test_players_and_ranks_are_replayed_before_the_rounds(data_dir):
+    tournament = saved_tournament()
+    tournament.attach_journal(jrn.ResultJournal("Open", "open.json"))
+    tournament.add_new_player("Nouveau", "Joueur", "01/01/2000", "M", 7)
+    tournament.add_player_rows([("Ligne 2", {"last_name": "Autre", "first_name": "Joueur",
+                                             "date_birth": "01/01/2001", "gender": "F", "rank": "8"})])
+    tournament.set_player_rank(tournament.get_player_list[0], 20)
+    tournament.add_round_to_list("Round 1")
+    roundp = tournament.get_round_list[0]
+    tournament.play_round_results(roundp, {nb: "J1" for nb in range(len(roundp.get_match_list))},
+                                  "01/06/2021 12:00")
+
+    loaded, replayed = reload()
+    assert replayed == 5
+    assert [player.id_player for player in loaded.get_player_list] == \
+        [player.id_player for player in tournament.get_player_list]
+    assert loaded.get_player_list[0].rank == 20
+    games = [[player.id_player for player in game[0]] + game[1] for game in loaded.get_round_list[0].get_match_list]
+    assert games == [[player.id_player for player in game[0]] + game[1] for game in roundp.get_match_list]
+    assert [player.rating for player in loaded.get_player_list] == \
+        [player.rating for player in tournament.get_player_list]
+
+
+def test_ended_round_is_not_replayed_twice(data_dir):
+    tournament = saved_tournament()
+    tournament.attach_journal(jrn.ResultJournal("Open", "open.json"))
+    tournament.add_round_to_list("Round 1")
+    roundp = tournament.get_round_list[0]
+    tournament.play_round_results(roundp, {nb: "J2" for nb in range(len(roundp.get_match_list))},
+                                  "01/06/2021 12:00")
+    ratings = [player.rating for player in tournament.get_player_list]
+
+    loaded, _ = reload()
+    loaded.attach_journal(jrn.ResultJournal("Open", "open.json"), replay=True)
+    assert [player.rating for player in loaded.get_player_list] == ratings
+
+
+def test_journals_of_similar_names_do_not_collide(data_dir):
+    first = jrn.ResultJournal("Open 2021", "open.json")
+    second = jrn.ResultJournal("Open_2021", "open.json")
+    other_file = jrn.ResultJournal("Open 2021", "autre.json")
+    assert len({first.path, second.path, other_file.path}) == 3
+
+    first.append({"event": "round", "name": "Round 1"})
+    assert second.get_entries == [] and other_file.get_entries == []
+    assert jrn.journal_list_from_dir() == [("Open 2021", "open.json")]
+
+
+def test_journal_of_another_tournament_is_not_appended(data_dir):
+    journal = jrn.ResultJournal("Open", "open.json")
+    journal.append({"event": "round", "name": "Round 1"})
+    journal.close()
+    impostor = jrn.ResultJournal("Autre", "open.json")
+    impostor.path = journal.path
+    try:
+        impostor.append({"event": "round", "name": "Round 1"})
+        assert False, "appended to another tournament's journal"
+    except Warning:
+        pass
+    assert len(journal.get_entries) == 1
+
+
+def test_journal_follows_the_database_file_on_save(data_dir):
+    tournament = trn.Tournament("Open", "Caen", "Blitz", "", "01/06/2021 10:00")
+    tournament.attach_journal(jrn.ResultJournal("Open"))
+    tournament.add_new_player("Nouveau", "Joueur", "01/01/2000", "M", 1)
+    assert jrn.journal_list_from_dir() == [("Open", "")]
+
+    tournament.save_tournament_in_db("open.json")
+    assert jrn.journal_list_from_dir() == []
+    tournament.add_new_player("Autre", "Joueur", "01/01/2001", "M", 2)
+    assert jrn.journal_list_from_dir() == [("Open", "open.json")]
+
+    loaded, replayed = reload()
+    assert replayed == 1
+    assert len(loaded.get_player_list) == 2
@@ -0,0 +1,70 @@
+import random
+import string
+
+import model.tournament as trn
+
+
+NB_PLAYERS = 5000
+NB_ROUNDS = 9
+
+
+def make_players(nb_players):
+    """Return the saved informations of nb_players players with distinct
+    ids : their last names are made of three distinct letters codes."""
+    letters = string.ascii_uppercase
+    players = []
+    for nb in range(nb_players):
+        code = letters[nb // 676 % 26] + letters[nb // 26 % 26] + letters[nb % 26]
+        players.append({"last_name": code, "first_name": "Joueur", "date_birth": "01/01/1990",
+                        "gender": "M", "rank": nb + 1})
+    return players
+
+
+def play_round(tournament, rng):
+    roundp = tournament.get_round_list[-1]
+    results = {nb: rng.choice(("J1", "J2", "nul")) for nb in range(len(roundp.get_match_list))}
+    tournament.play_round_results(roundp, results, "01/06/2021 18:00")
+
+
+def test_5000_players_pairing_standings_save_and_load(data_dir):
+    rng = random.Random(1)
+    tournament = trn.Tournament("Open", "Caen", "Blitz", "", "01/06/2021 10:00",
+                                max_players=NB_PLAYERS, max_rounds=NB_ROUNDS)
+    tournament.add_saved_players(make_players(NB_PLAYERS))
+    assert len(tournament.get_player_list) == NB_PLAYERS
+
+    for nb in range(NB_ROUNDS):
+        tournament.add_round_to_list(f"Round {nb + 1}")
+        roundp = tournament.get_round_list[-1]
+        paired = [player.id_player for game in roundp.get_match_list for player in game[0]]
+        assert len(paired) == NB_PLAYERS == len(set(paired))
+        play_round(tournament, rng)
+
+    # No pair of players meets twice.
+    games = {frozenset((game[0][0].id_player, game[0][1].id_player))
+             for roundp in tournament.get_round_list for game in roundp.get_match_list}
+    assert len(games) == NB_ROUNDS * NB_PLAYERS // 2
+
+    standings = tournament.standings.players()
+    scores = [player.get_player_score for player in standings]
+    assert scores == sorted(scores, reverse=True)
+    assert sum(scores) == NB_ROUNDS * NB_PLAYERS // 2
+    assert len(tournament.standings_with_tie_breaks()) == NB_PLAYERS
+
+    tournament.save_tournament_in_db("open.json")
+    # Saving again writes only what changed : nothing here.
+    tournament.save_tournament_in_db("open.json", update=True)
+    assert (data_dir / "open.json").exists()
+
+    loaded = trn.Tournament.load_tournament_from_db("open.json", "Open")
+    assert loaded.MAX_PLAYER_LIMIT == NB_PLAYERS
+    assert len(loaded.get_round_list) == NB_ROUNDS
+    assert [player.id_player for player in loaded.standings.players()] == \
+        [player.id_player for player in standings]
+    assert [player.get_player_score for player in loaded.standings.players()] == scores
+    assert loaded.serialize_tournament_info() == tournament.serialize_tournament_info()
+
+    # A round paired after loading continues the tournament.
+    loaded.MAX_ROUND_LIST += 1
+    loaded.add_round_to_list(f"Round {NB_ROUNDS + 1}")
+    assert len(loaded.get_round_list[-1].get_match_list) == NB_PLAYERS // 2
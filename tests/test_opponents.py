@@ -0,0 +1,46 @@
+import random
+
+from model.opponents import OpponentMatrix
+
+
+def test_mark_is_symmetric_and_kept_when_resized():
+    matrix = OpponentMatrix(5)
+    matrix.mark(0, 4)
+    matrix.mark(3, 1)
+    # 5 players fit in one byte : growing to 40 players doubles the rows
+    # more than once.
+    matrix.resize(40)
+    matrix.mark(39, 0)
+
+    assert matrix.size == 40
+    assert matrix.have_met(4, 0) and matrix.have_met(0, 4)
+    assert matrix.have_met(1, 3) and matrix.have_met(0, 39)
+    assert not matrix.have_met(0, 1)
+    assert matrix.opponents(0) == [4, 39]
+    assert matrix.opponents(20) == []
+
+
+def test_resize_never_shrinks():
+    matrix = OpponentMatrix(10)
+    matrix.mark(2, 9)
+    matrix.resize(4)
+    assert matrix.size == 10 and matrix.have_met(9, 2)
+
+
+def test_serialize_round_trip():
+    rng = random.Random(12)
+    matrix = OpponentMatrix(101)
+    pairs = {tuple(sorted(rng.sample(range(101), 2))) for _ in range(300)}
+    for i, j in pairs:
+        matrix.mark(i, j)
+
+    data = matrix.serialize()
+    assert set(data) == {"size", "bits"}
+    loaded = OpponentMatrix.deserialize(data)
+    assert loaded.size == 101
+    assert all(loaded.opponents(i) == matrix.opponents(i) for i in range(101))
+
+    # A deserialized matrix still grows with the tournament.
+    loaded.resize(200)
+    loaded.mark(150, 0)
+    assert loaded.have_met(0, 150) and loaded.opponents(1) == matrix.opponents(1)
@@ -0,0 +1,74 @@
+import random
+import time
+
+import pytest
+
+import model.pairing as pairing
+import model.tournament as trn
+from tests.test_large_tournament import make_players
+
+
+def valid_pairing_exists(players, met, candidates):
+    """Brute force : tell if the players can be paired without rematch, one
+    of the candidates getting a bye if their number is odd."""
+    if len(players) % 2:
+        return any(valid_pairing_exists([p for p in players if p != bye], met, None)
+                   for bye in players if bye in candidates)
+    if not players:
+        return True
+    first, others = players[0], players[1:]
+    return any(valid_pairing_exists([p for p in others if p != other], met, None)
+               for other in others if frozenset((first, other)) not in met)
+
+
+def random_history(rng, nb_players, density):
+    return {frozenset((i, j)) for i in range(nb_players) for j in range(i + 1, nb_players) if rng.random() < density}
+
+
+@pytest.mark.parametrize("nb_players", [6, 7, 8, 9])
+def test_no_rematch_when_a_valid_pairing_exists(monkeypatch, nb_players):
+    # With one bye attempt, the bye often has to come from the matching.
+    monkeypatch.setattr(pairing, "MAX_BYE_ATTEMPTS", 1)
+    rng = random.Random(nb_players)
+    for _ in range(300):
+        met = random_history(rng, nb_players, rng.choice((0.3, 0.5, 0.7)))
+        candidates = sorted(rng.sample(range(nb_players), rng.randint(1, nb_players)))
+        pairs, bye = pairing.pair_players(nb_players, lambda i, j: frozenset((i, j)) in met, candidates)
+
+        paired = [player for pair in pairs for player in pair] + ([bye] if bye is not None else [])
+        assert sorted(paired) == list(range(nb_players))
+        if valid_pairing_exists(list(range(nb_players)), met, candidates):
+            assert not any(frozenset(pair) in met for pair in pairs)
+            assert bye is None or bye in candidates
+
+
+def test_bye_beyond_the_attempts_limit():
+    # The best placed player has met everybody : only their bye avoids a
+    # rematch, and they come after the MAX_BYE_ATTEMPTS lowest placed.
+    nb_players = 2 * pairing.MAX_BYE_ATTEMPTS + 5
+    pairs, bye = pairing.pair_players(nb_players, lambda i, j: i == 0 or j == 0)
+    assert bye == 0
+    assert sorted(player for pair in pairs for player in pair) == list(range(1, nb_players))
+
+
+def test_2000_players_are_paired_without_rematch_in_well_under_a_second():
+    nb_players = 2001
+    tournament = trn.Tournament("Open", "Caen", "Blitz", "", "01/06/2021 10:00", max_players=nb_players, max_rounds=9)
+    tournament.add_saved_players(make_players(nb_players))
+    rng = random.Random(2)
+    games = set()
+    byes = set()
+    for nb in range(9):
+        start = time.perf_counter()
+        tournament.add_round_to_list(f"Round {nb + 1}")
+        assert time.perf_counter() - start < 1.0
+        roundp = tournament.get_round_list[-1]
+        for game in roundp.get_match_list:
+            pair = frozenset(player.id_player for player in game[0])
+            assert pair not in games
+            games.add(pair)
+        assert roundp.bye.id_player not in byes
+        byes.add(roundp.bye.id_player)
+        tournament.play_round_results(roundp, {nb: rng.choice(("J1", "J2", "nul"))
+                                               for nb in range(len(roundp.get_match_list))},
+                                      "01/06/2021 18:00")
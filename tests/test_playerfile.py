@@ -0,0 +1,26 @@
+import json
+
+import model.playerfile as pf
+from controller.batch import Batch
+
+
+def test_excel_byte_order_mark(tmp_path):
+    path = tmp_path / "players.csv"
+    path.write_text("last_name;first_name;date_birth;gender;rank\nPoirier;Marine;14/05/1992;F;1\n",
+                    encoding="utf-8-sig")
+    players_info, errors = pf.check_player_rows(pf.read_player_rows(path))
+    assert errors == []
+    assert [info["last_name"] for info in players_info] == ["Poirier"]
+
+
+def test_export_is_read_back(data_dir):
+    batch = Batch("open.json")
+    batch.create("Open", "Caen", "Blitz", "01/06/2021 10:00")
+    batch.add_players("Open", players=[{"last_name": "Poirier", "first_name": "Marine", "date_birth": "14/05/1992",
+                                        "gender": "F", "rank": 1}])
+    path = data_dir / "export.json"
+    batch.export("Open", str(path))
+    with open(path, encoding="utf-8-sig") as export_file:
+        data = json.load(export_file)
+    assert data["tournament_info"]["name"] == "Open"
+    assert [player["id_player"] for player in data["standings"]] == ["1992_POIMAR"]
@@ -0,0 +1,61 @@
+import asyncio
+
+import model.playerdb as lpdb
+from controller.batch import Batch
+from controller.server import TournamentServer
+from model.player import Player
+from tests.test_large_tournament import make_players
+
+
+NB_PLAYERS = 4
+
+
+def save_players(file_name):
+    """Save the players into a players file, all but the last one."""
+    players = [Player(row["last_name"], row["first_name"], row["date_birth"], row["gender"], row["rank"])
+               for row in make_players(NB_PLAYERS - 1)]
+    lpdb.SavePlayer(file_name).save_players_into_db(players)
+
+
+def saved_ratings(file_name):
+    return {player["id_player"]: player["rating"] for player in lpdb.LoadPlayer(file_name).list_player_from_db()}
+
+
+def play_rated_tournament(batch):
+    batch.create("Open", "Caen", "Blitz", "01/06/2021 10:00", max_players=NB_PLAYERS, max_rounds=1, rated=True)
+    batch.add_players("Open", players=make_players(NB_PLAYERS))
+    batch.pair("Open")
+    batch.record("Open", {1: "J1", 2: "J1"}, end_date="01/06/2021 18:00")
+
+
+def test_batch_end_writes_the_ratings_back(data_dir):
+    save_players("players.json")
+    batch = Batch("tournaments.json")
+    play_rated_tournament(batch)
+    assert set(saved_ratings("players.json").values()) == {1500}
+
+    result = batch.end("Open", "01/06/2021")
+
+    ratings = {player.id_player: player.rating for player in batch.get_tournament("Open").get_player_list}
+    assert result == {"end_date": "01/06/2021", "unsaved_ratings": [list(ratings)[-1]]}
+    assert saved_ratings("players.json") == {id_player: rating for id_player, rating in ratings.items()
+                                             if id_player in saved_ratings("players.json")}
+    assert set(saved_ratings("players.json").values()) != {1500}
+
+
+def test_server_end_writes_the_ratings_back(data_dir):
+    save_players("players.json")
+
+    async def run():
+        server = TournamentServer("tournaments.json")
+        server.queue = asyncio.Queue()
+        server.writer_task = asyncio.create_task(server.writer())
+        await server.submit(lambda: play_rated_tournament(server.batch), "Open")
+        status, answer = await server.dispatch("POST", "/tournaments/Open/end", b'{"end_date": "01/06/2021"}')
+        await server.queue.put(None)
+        await server.writer_task
+        return status
+
+    assert asyncio.run(run()) == 200
+    assert set(saved_ratings("players.json").values()) != {1500}
+    assert Batch("tournaments.json").get_tournament("Open").end_date == "01/06/2021"
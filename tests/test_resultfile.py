@@ -0,0 +1,66 @@
+import model.resultfile as rf
+import model.tournament as trn
+from tests.test_large_tournament import make_players
+
+
+def make_round(nb_players=8):
+    tournament = trn.Tournament("Open", "Caen", "Blitz", "", "01/06/2021 10:00", max_players=nb_players)
+    tournament.add_saved_players(make_players(nb_players))
+    tournament.add_round_to_list("Round 1")
+    return tournament, tournament.get_round_list[-1]
+
+
+def test_semicolon_file_with_header(tmp_path):
+    path = tmp_path / "results.csv"
+    path.write_text("échiquier;résultat\n1;J1\n2;1-0\n\n3;nul;\n", encoding="utf-8")
+    assert rf.read_result_rows(path) == [("Ligne 2", "1", "J1"), ("Ligne 3", "2", "1-0"), ("Ligne 5", "3", "nul")]
+
+
+def test_only_malformed_rows_are_reported(tmp_path):
+    path = tmp_path / "results.csv"
+    path.write_text("1;J1\n2;J2;extra\n", encoding="utf-8")
+    _, round_1 = make_round(4)
+    results, errors = rf.check_result_rows(rf.read_result_rows(path), round_1.get_match_list, complete=False)
+    assert results == {0: "J1"}
+    assert errors == ["Ligne 2 : numéro d'échiquier et résultat attendus."]
+
+
+def test_excel_byte_order_mark(tmp_path):
+    path = tmp_path / "results.csv"
+    path.write_text("1,J1\n2,J2\n", encoding="utf-8-sig")
+    assert rf.read_result_rows(path) == [("Ligne 1", "1", "J1"), ("Ligne 2", "2", "J2")]
+
+
+def test_json_object(tmp_path):
+    path = tmp_path / "results.json"
+    path.write_text('{"1": "J1", "2": "0.5-0.5"}', encoding="utf-8")
+    assert rf.read_result_rows(path) == [("Échiquier 1", "1", "J1"), ("Échiquier 2", "2", "0.5-0.5")]
+
+
+def test_check_result_rows_errors():
+    _, round_1 = make_round(8)
+    rows = [("L1", "1", "J1"), ("L2", "1", "J2"), ("L3", "9", "J1"), ("L4", "x", "J1"), ("L5", "2", "gagné")]
+    results, errors = rf.check_result_rows(rows, round_1.get_match_list)
+    assert results == {0: "J1"}
+    assert errors == ["L2 : résultat de l'échiquier 1 déjà donné.",
+                      "L3 : l'échiquier 9 n'existe pas (1 à 4).",
+                      "L4 : numéro d'échiquier invalide (x).",
+                      "L5 : résultat invalide (gagné), attendu J1, J2 ou nul.",
+                      "Résultat manquant pour le(s) échiquier(s) : 2, 3, 4."]
+
+
+def test_import_is_all_or_nothing(tmp_path):
+    tournament, round_1 = make_round(8)
+    path = tmp_path / "results.csv"
+    path.write_text("1;J1\n2;J2\n3;nul\n", encoding="utf-8")
+    try:
+        tournament.import_round_results(round_1, path, "01/06/2021 12:00")
+        assert False, "missing result accepted"
+    except Warning as err:
+        assert "échiquier(s) : 4" in str(err)
+    assert all(game[1] == [0, 0] for game in round_1.get_match_list)
+
+    path.write_text("1;J1\n2;J2\n3;nul\n4;1-0\n", encoding="utf-8")
+    assert tournament.import_round_results(round_1, path, "01/06/2021 12:00") == 4
+    assert [game[1] for game in round_1.get_match_list] == [[1, 0], [0, 1], [0.5, 0.5], [1, 0]]
+    assert round_1.end_date == "01/06/2021 12:00"
@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+import model.tour as tour
+import model.tournament as trn
+from tests.test_large_tournament import make_players, play_round
+
+
+def pairings(tournament):
+    """Return the ids of the players and the score of every game, round by
+    round."""
+    return [[([player.id_player for player in game[0]], list(game[1])) for game in roundp.get_match_list]
+            for roundp in tournament.get_round_list]
+
+
+def test_saved_rounds_are_restored_without_pairing_again(data_dir, monkeypatch):
+    # The players are saved in a shuffled order : slots, ranks and ids differ.
+    players_info = make_players(11)
+    random.Random(20).shuffle(players_info)
+    tournament = trn.Tournament("Open", "Caen", "Blitz", "", "01/06/2021 10:00", max_players=11, max_rounds=4)
+    tournament.add_saved_players(players_info)
+    rng = random.Random(20)
+    for nb in range(2):
+        tournament.add_round_to_list(f"Round {nb + 1}")
+        play_round(tournament, rng)
+    # The third round is still being played : one result is entered.
+    tournament.add_round_to_list("Round 3")
+    ongoing = tournament.get_round_list[-1]
+    tournament.play_round(ongoing, ongoing.get_match_list[0], "J1", 0)
+    tournament.save_tournament_in_db("open.json")
+
+    def no_pairing(*args, **kwargs):
+        raise AssertionError("pairing run while loading")
+    monkeypatch.setattr(tour, "pair_players", no_pairing)
+    loaded = trn.Tournament.load_tournament_from_db("open.json", "Open")
+
+    assert pairings(loaded) == pairings(tournament)
+    assert [None if roundp.bye is None else roundp.bye.id_player for roundp in loaded.get_round_list] == \
+        [None if roundp.bye is None else roundp.bye.id_player for roundp in tournament.get_round_list]
+    assert [roundp.end_date for roundp in loaded.get_round_list] == \
+        [roundp.end_date for roundp in tournament.get_round_list]
+    assert [player.get_player_score for player in loaded.get_player_list] == \
+        [player.get_player_score for player in tournament.get_player_list]
+
+    # The ongoing round goes on after loading.
+    monkeypatch.undo()
+    roundp = loaded.get_round_list[-1]
+    loaded.play_round_results(roundp, {nb: "nul" for nb in range(1, len(roundp.get_match_list))},
+                              "01/06/2021 20:00")
+    loaded.add_round_to_list("Round 4")
+    met = {frozenset(game[0]) for rounds in pairings(loaded)[:3] for game, score in rounds}
+    assert not any(frozenset(game) in met for game, score in pairings(loaded)[3])
+
+
+def test_a_player_id_is_registered_once():
+    tournament = trn.Tournament("Open", "Caen", "Blitz", "", "01/06/2021 10:00")
+    tournament.add_new_player("Poirier", "Marine", "14/05/1992", "F", 1)
+    with pytest.raises(Warning, match="1992_POIMAR"):
+        tournament.add_new_player("poirier", "marine", "14/05/1992", "F", 2)
+    assert len(tournament.get_player_list) == 1
@@ -0,0 +1,73 @@
+import asyncio
+import json
+
+from controller.server import TournamentServer
+
+
+def run_requests(requests, prepare=None):
+    """Dispatch the (method, path, body) requests to a server on the
+    tournaments.json file, its writer running. Return the status and the
+    decoded answer of each request."""
+    async def run():
+        server = TournamentServer("tournaments.json")
+        if prepare is not None:
+            prepare(server)
+        server.queue = asyncio.Queue()
+        server.writer_task = asyncio.create_task(server.writer())
+        answers = []
+        for method, path, body in requests:
+            status, answer = await server.dispatch(method, path, body)
+            answers.append((status, json.loads(answer)))
+        await server.queue.put(None)
+        await server.writer_task
+        server.executor.shutdown()
+        return answers
+
+    return asyncio.run(run())
+
+
+CREATE = ("POST", "/tournaments", json.dumps({"name": "Open", "localization": "Caen",
+                                              "beg_date": "01/06/2021 10:00"}).encode())
+
+
+def test_unknown_tournament_or_resource_is_404(data_dir):
+    answers = run_requests([CREATE,
+                            ("GET", "/tournaments/Absent", b""),
+                            ("GET", "/tournaments/Absent/standings", b""),
+                            ("POST", "/tournaments/Absent/rounds", b""),
+                            ("GET", "/tournaments/Open/unknown", b""),
+                            ("GET", "/players", b"")])
+    assert answers[0][0] == 201
+    assert [status for status, answer in answers[1:]] == [404] * 5
+    assert answers[1][1] == {"error": "Tournoi inexistant dans la base de données."}
+
+
+def test_invalid_requests_are_400(data_dir):
+    answers = run_requests([CREATE,
+                            ("POST", "/tournaments", b"{not json"),
+                            ("POST", "/tournaments", b"[1, 2]"),
+                            ("POST", "/tournaments", b'{"localization": "Caen"}'),
+                            ("POST", "/tournaments", b'{"name": "Rapide", "max_rounds": true}'),
+                            ("POST", "/tournaments", b'{"name": "Rapide", "time_control": "Marathon"}'),
+                            ("POST", "/tournaments/Open/players", b'{"players": {"last_name": "Poirier"}}'),
+                            ("POST", "/tournaments/Open/results", b'{"results": [1, 2]}'),
+                            ("POST", "/tournaments/Open/rounds", b"")])
+    assert [status for status, answer in answers[1:]] == [400] * 8
+    assert all(set(answer) == {"error"} for status, answer in answers[1:])
+    assert answers[4][1] == {"error": "Champ max_rounds invalide : int attendu."}
+    assert answers[8][1] == {"error": "Action impossible : veuillez ajouter suffisamment de joueurs au tournoi"}
+
+
+def test_unexpected_error_is_500_without_details(data_dir):
+    def prepare(server):
+        def broken_pair(name):
+            raise RuntimeError("secret details")
+        server.batch.pair = broken_pair
+
+    answers = run_requests([CREATE, ("POST", "/tournaments/Open/rounds", b"")], prepare)
+    assert answers[1] == (500, {"error": "Erreur interne du serveur."})
+
+
+def test_unknown_method_is_405(data_dir):
+    answers = run_requests([CREATE, ("DELETE", "/tournaments/Open", b"")])
+    assert answers[1][0] == 405
@@ -0,0 +1,54 @@
+import random
+
+from model.player import Player
+from model.standings import SortedEntries, Standings
+
+
+def test_sorted_entries_match_sorted(monkeypatch):
+    # Small blocks so that they are split and emptied often.
+    monkeypatch.setattr(SortedEntries, "BLOCK_SIZE", 4)
+    rng = random.Random(14)
+    entries = SortedEntries(rng.sample(range(1000), 30))
+    expected = sorted(entries)
+    for _ in range(2000):
+        if expected and rng.random() < 0.45:
+            entry = rng.choice(expected)
+            entries.remove(entry)
+            expected.remove(entry)
+        else:
+            entry = rng.randrange(1000)
+            entries.add(entry)
+            expected.append(entry)
+            expected.sort()
+        assert len(entries) == len(expected)
+    assert list(entries) == expected
+    assert all(entries.index(entry) == expected.index(entry) for entry in set(expected))
+
+
+def test_standings_follow_score_and_rank_changes():
+    rng = random.Random(14)
+    players = [Player(f"Nom{nb % 7}", f"Prénom{nb}", "01/01/1990", "M", nb + 1) for nb in range(50)]
+    standings = Standings(players)
+    for _ in range(500):
+        player = rng.choice(players)
+        if rng.random() < 0.8:
+            player.set_player_score = rng.choice((0.5, 1))
+        else:
+            player.rank = rng.randint(1, 100)
+        standings.update(player)
+
+    by_score = sorted(range(50), key=lambda slot: (-players[slot].get_player_score, players[slot].rank, slot))
+    assert standings.slots() == by_score
+    assert standings.slots("rank") == sorted(range(50), key=lambda slot: (players[slot].rank, slot))
+    by_name = sorted(players, key=lambda player: (player.last_name, player.first_name))
+    assert [player.id_player for player in standings.players("name")] == [player.id_player for player in by_name]
+    assert [standings.position(players[slot]) for slot in by_score] == list(range(1, 51))
+
+
+def test_new_players_are_added_to_the_standings():
+    players = [Player("Poirier", "Marine", "14/05/1992", "F", 2)]
+    standings = Standings(players)
+    players.append(Player("Villey", "Chloé", "14/08/1989", "F", 1))
+    standings.add_new_players()
+    assert len(standings) == 2
+    assert [player.last_name for player in standings.players()] == ["Villey", "Poirier"]
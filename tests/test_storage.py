@@ -0,0 +1,22 @@
+import model.playerdb as lpdb
+from model.interactDB import registry
+from model.player import Player
+
+
+def test_deleted_file_is_opened_again(data_dir):
+    lpdb.SavePlayer("a.json").save_player_into_db(Player("Poirier", "Marine", "14/05/1992", "F", 1))
+    handle = registry.get_handle("a.json")
+    (data_dir / "a.json").unlink()
+
+    assert lpdb.LoadPlayer("a.json").list_player_from_db() == []
+    assert registry.get_handle("a.json") is not handle
+    lpdb.SavePlayer("a.json").save_player_into_db(Player("Villey", "Chloé", "14/08/1989", "F", 2))
+    assert [player["id_player"] for player in lpdb.LoadPlayer("a.json").list_player_from_db()] == ["1989_VILCHL"]
+
+
+def test_deleted_sqlite_file_is_opened_again(data_dir):
+    lpdb.SavePlayer("a.db").save_player_into_db(Player("Poirier", "Marine", "14/05/1992", "F", 1))
+    registry.flush_all()
+    (data_dir / "a.db").unlink()
+
+    assert lpdb.LoadPlayer("a.db").list_player_from_db() == []
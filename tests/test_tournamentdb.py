@@ -0,0 +1,78 @@
+import json
+import random
+
+import pytest
+
+import model.tournament as trn
+import model.tournamentdb as trdb
+from model.interactDB import registry
+from tests.test_large_tournament import make_players, play_round
+
+
+def played_tournament(nb_players=8, nb_rounds=2):
+    tournament = trn.Tournament("Open", "Caen", "Blitz", "", "01/06/2021 10:00",
+                                max_players=nb_players, max_rounds=nb_rounds)
+    tournament.add_saved_players(make_players(nb_players))
+    rng = random.Random(3)
+    for nb in range(nb_rounds):
+        tournament.add_round_to_list(f"Round {nb + 1}")
+        play_round(tournament, rng)
+    return tournament
+
+
+def count_updates(monkeypatch, index):
+    calls = []
+    update = index.table.update
+    monkeypatch.setattr(index.table, "update", lambda *args, **kwargs: calls.append(1) or update(*args, **kwargs))
+    return calls
+
+
+@pytest.mark.parametrize("file_name", ["open.json", "open.db"])
+def test_header_change_does_not_write_opponents_and_tie_breaks(data_dir, monkeypatch, file_name):
+    tournament = played_tournament()
+    tournament.save_tournament_in_db(file_name)
+    handle = registry.get_handle(file_name)
+    if file_name.endswith(".json"):
+        header_updates = count_updates(monkeypatch, handle.header_index)
+        blob_updates = count_updates(monkeypatch, handle.opponents_index) + count_updates(
+            monkeypatch, handle.tie_break_index)
+
+    tournament.end_tournament("02/06/2021")
+    tournament.save_tournament_in_db(file_name, update=True)
+
+    if file_name.endswith(".json"):
+        assert header_updates and not blob_updates
+    assert "opponents" not in handle.header_index.get("Open")
+    loaded = trn.Tournament.load_tournament_from_db(file_name, "Open")
+    assert loaded.serialize_tournament_info() == tournament.serialize_tournament_info()
+
+
+def test_header_with_opponents_is_still_loaded_and_rewritten(data_dir):
+    tournament = played_tournament()
+    tournament.save_tournament_in_db("open.json")
+    registry.close_all()
+    # Tournament saved with the opponents history and tie-breaks in its header.
+    path = data_dir / "open.json"
+    data = json.loads(path.read_text(encoding="utf-8"))
+    ((doc_id, header),) = data["Tournaments"].items()
+    header["opponents"] = data.pop("opponents")["1"]["opponents"]
+    header["tie_breaks"] = data.pop("tie_breaks")["1"]["tie_breaks"]
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+    loaded = trn.Tournament.load_tournament_from_db("open.json", "Open")
+    assert loaded.serialize_tournament_info() == tournament.serialize_tournament_info()
+
+    loaded.save_tournament_in_db("open.json", update=True)
+    assert set(registry.get_handle("open.json").header_index.get("Open")) == {"tournament", "tournament_info"}
+
+
+@pytest.mark.parametrize("file_name", ["open.json", "open.db"])
+def test_list_tournaments_between(data_dir, file_name):
+    played_tournament().save_tournament_in_db(file_name)
+    db = trdb.TournamentDB(file_name)
+
+    assert [info["name"] for info in db.list_tournaments_between("01/06/2021", "01/06/2021")] == ["Open"]
+    assert db.list_tournaments_between("02/06/2021", "30/06/2021") == []
+    for start, end in (("01/06/2021", "31/06/2021"), ("2021-06-01", "30/06/2021"), ("01/06/2021", None)):
+        with pytest.raises(ValueError, match="Format ou date invalide"):
+            db.list_tournaments_between(start, end)
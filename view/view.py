@@ -61,7 +61,7 @@ def show_tournament_menu(name, localization, start_date):
     print("Revenir au menu principal (q)\n")
 
 
-def show_rounds_report(name, match_list, start_date, end_date):
+def show_rounds_report(name, match_list, start_date, end_date, bye=None):
     print(f"{name}")
     print(f"Début de la ronde : {start_date}\n")
     for e, i in enumerate(match_list):
@@ -70,6 +70,8 @@ def show_rounds_report(name, match_list, start_date, end_date):
         score = i[1]
         print(f"Match n°{e+1} :")
         print(f"(J1) {play1} vs {play2} (J2) -- Score : {score}\n")
+    if bye:
+        print(f"Exempt : {bye.first_name} {bye.last_name}\n")
     if end_date:
         print(f"Fin du round : {end_date}\n")
         print("==============================\n")
@@ -83,7 +85,18 @@ def show_players_report():
     print("Par ordre alphabatique (1)")
     print("Par ordre de classement (2)")
     print("Afficher un joueur spécifique (3)")
-    print("Modifier le rang d'un joueur (4)\n")
+    print("Modifier le rang d'un joueur (4)")
+    print("Classement du tournoi (5)\n")
+
+
+def show_standings(standings):
+    print("------------------------------")
+    for place, (player, tie_breaks) in enumerate(standings, 1):
+        print(f"{place}. {player.last_name} {player.first_name} - {player.get_player_score:g} pt(s) "
+              f"(Buchholz : {tie_breaks['buchholz']:g}, "
+              f"Sonneborn-Berger : {tie_breaks['sonneborn_berger']:g}, "
+              f"Progressif : {tie_breaks['progressive']:g})")
+    print("------------------------------\n")
 
 
 def show_load_tournament_menu():
@@ -93,6 +106,8 @@ def show_load_tournament_menu():
     print("Afficher la liste des fichers de la base de données. (1)")
     print("Affiche les tournois sauvegardés dans un fichier spécifique. (2)")
     print("Charger un tournoi à partir d'un fichier. (3)")
+    print("Afficher les tournois non terminés d'un fichier. (4)")
+    print("Afficher les tournois commencés entre deux dates. (5)")
     print("Retour au menu principal. (q)\n")
 
 
@@ -103,9 +118,21 @@ def show_rounds_menu():
     print("Afficher une ronde spécifique. (1)")
     print("Afficher l'ensemble des rondes du tournoi (2)")
     print("Entrer les résultats de la ronde en cours (3)")
+    print("Simuler les rondes restantes (4)")
+    print("Importer les résultats de la ronde en cours d'un fichier CSV ou JSON (5)")
     print("Retour au menu du tournoi. (q)\n")
 
 
+def show_simulation_report(report, nb_simulations):
+    print(f"Résultats de {nb_simulations} simulations :")
+    print("------------------------------")
+    for line in report:
+        scores = ", ".join(f"{score:g} pt(s) : {probability:.1%}" for score, probability in line["scores"].items())
+        print(f"{line['name']} - victoire : {line['win']:.1%}, podium : {line['podium']:.1%}")
+        print(f"    Scores finaux : {scores}")
+    print("------------------------------\n")
+
+
 def show_play_menu(round_name):
     print(f"\nRésultat pour le {round_name}.\n")
     print("Entrer 'J1' si J1 gagnant.")